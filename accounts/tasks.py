@@ -0,0 +1,15 @@
+"""Задачі черги для облікових записів."""
+
+from django.core.mail import send_mail
+
+from house.services.tasks import task
+
+
+@task("accounts.send_mail")
+def send_email(subject, message, from_email, recipient_list):
+    send_mail(
+        subject=subject,
+        message=message,
+        from_email=from_email,
+        recipient_list=recipient_list,
+    )
@@ -8,7 +8,6 @@ from django.contrib.auth.password_validation import validate_password
 from django.contrib.auth.tokens import default_token_generator
 from django.contrib.sites.shortcuts import get_current_site
 from django.core.exceptions import ValidationError
-from django.core.mail import send_mail
 from django.db.models import Q
 from django.http import JsonResponse
 from django.shortcuts import get_object_or_404, redirect, render
@@ -18,6 +17,8 @@ from django.utils.encoding import force_bytes, force_str
 from django.utils.http import urlsafe_base64_decode, urlsafe_base64_encode
 from django.views.decorators.http import require_GET, require_POST
 
+from house.services.tasks import enqueue
+
 from .models import CustomUser, TelegramVerification
 
 User = get_user_model()
@@ -97,11 +98,14 @@ def register_email(request):
         "partials/auth/verify_email.html", {"user": user, "link": link}
     )
 
-    send_mail(
-        subject="Підтвердження пошти",
-        message=message,
-        from_email="Dominium <dominium.realty.agency@gmail.com>",
-        recipient_list=[email],
+    enqueue(
+        "accounts.send_mail",
+        {
+            "subject": "Підтвердження пошти",
+            "message": message,
+            "from_email": "Dominium <dominium.realty.agency@gmail.com>",
+            "recipient_list": [email],
+        },
     )
 
     request.session.pop("register_prefill", None)
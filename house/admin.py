@@ -1,12 +1,13 @@
-import os
-
 from django import forms
-from django.contrib import admin, messages
-from django.shortcuts import render
-from django.urls import path
-from django.utils.html import format_html
+from django.contrib import admin
+from django.core.exceptions import PermissionDenied
+from django.shortcuts import get_object_or_404, redirect, render
+from django.urls import path, reverse
+from django.utils.html import format_html, format_html_join
+from django.utils.safestring import mark_safe
 
 from .models import (
+    BackgroundJob,
     DealType,
     Feature,
     HomepageHighlightSettings,
@@ -14,7 +15,9 @@ from .models import (
     PropertyImage,
     PropertyType,
 )
-from .utils.html_parser import parse_property_from_html  # 💡 не забудь __init__.py
+from .services import duplicates
+from .services.jobs import serialize_job
+from .services.zip_import import start_zip_import_job
 
 
 # === Додаткові моделі ===
@@ -47,9 +50,12 @@ class PropertyImageInline(admin.TabularInline):
         return "-"
 
 
-# === Форма для імпорту HTML ===
-class ImportHTMLForm(forms.Form):
-    html_file = forms.FileField()
+# === Форма для імпорту ZIP ===
+class ImportArchiveForm(forms.Form):
+    archive = forms.FileField(
+        label="ZIP-архів",
+        help_text="HTML-сторінки презентацій разом із фото, на які вони посилаються.",
+    )
 
 
 # === PropertyAdmin ===
@@ -61,46 +67,78 @@ class PropertyAdmin(admin.ModelAdmin):
     exclude = ["latitude", "longitude"]
     filter_horizontal = ["features"]
     list_filter = ["featured_homepage", "property_type", "deal_type"]
-
-    # change_list_template = "admin/property_changelist.html"
+    readonly_fields = ["possible_duplicates"]
+
+    change_list_template = "admin/house/property/change_list.html"
+
+    @admin.display(description="Можливі дублікати")
+    def possible_duplicates(self, obj):
+        if obj is None or obj.pk is None:
+            return "-"
+        matches = duplicates.possible_duplicates(obj)
+        if not matches:
+            return "Не знайдено"
+        properties = Property.objects.in_bulk([m.property_id for m in matches])
+        return format_html_join(
+            mark_safe("<br>"),
+            '<a href="{}">#{} {}</a> ({})',
+            (
+                (
+                    reverse("admin:house_property_change", args=[m.property_id]),
+                    m.property_id,
+                    properties[m.property_id].title,
+                    f"{m.similarity:.0%}",
+                )
+                for m in matches
+                if m.property_id in properties
+            ),
+        )
 
     def get_urls(self):
         urls = super().get_urls()
         custom_urls = [
-            path("import-html/", self.admin_site.admin_view(self.import_html))
+            path(
+                "import-zip/",
+                self.admin_site.admin_view(self.import_zip),
+                name="house_property_import_zip",
+            ),
+            path(
+                "import-zip/<int:job_id>/",
+                self.admin_site.admin_view(self.import_zip_job),
+                name="house_property_import_zip_job",
+            ),
         ]
         return custom_urls + urls
 
-    def import_html(self, request):
-        if request.method == "POST":
-            form = ImportHTMLForm(request.POST, request.FILES)
-            if form.is_valid():
-                html_file = form.cleaned_data["html_file"]
-                temp_path = f"/tmp/{html_file.name}"
-                with open(temp_path, "wb+") as f:
-                    for chunk in html_file.chunks():
-                        f.write(chunk)
-
-                data = parse_property_from_html(temp_path)
-                os.remove(temp_path)
-
-                property = Property.objects.create(
-                    title=data["title"],
-                    address=data["address"],
-                    price=data["price"],
-                    description=data["description"],
-                    image=data["main_image"],  # якщо в тебе це ImageField або URLField
-                )
-
-                messages.success(request, f"Успішно створено об'єкт: {property.title}")
-                return render(
-                    request, "admin/import_html.html", {"form": ImportHTMLForm()}
-                )
-
-        else:
-            form = ImportHTMLForm()
-
-        return render(request, "admin/import_html.html", {"form": form})
+    def import_zip(self, request):
+        if not self.has_add_permission(request):
+            raise PermissionDenied
+        form = ImportArchiveForm(request.POST or None, request.FILES or None)
+        if request.method == "POST" and form.is_valid():
+            try:
+                job = start_zip_import_job(form.cleaned_data["archive"])
+            except ValueError as exc:
+                form.add_error("archive", str(exc))
+            else:
+                return redirect("admin:house_property_import_zip_job", job_id=job.pk)
+        context = {
+            **self.admin_site.each_context(request),
+            "opts": self.model._meta,
+            "title": "Імпорт з ZIP-архіву",
+            "form": form,
+        }
+        return render(request, "admin/house/property/import_zip.html", context)
+
+    def import_zip_job(self, request, job_id):
+        job = get_object_or_404(BackgroundJob, pk=job_id, kind="zip_import")
+        context = {
+            **self.admin_site.each_context(request),
+            "opts": self.model._meta,
+            "title": f"Імпорт «{job.payload.get('name', '')}»",
+            "job": serialize_job(job),
+            "is_finished": job.is_finished,
+        }
+        return render(request, "admin/house/property/import_zip_job.html", context)
 
 
 @admin.register(HomepageHighlightSettings)
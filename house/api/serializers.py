@@ -3,6 +3,10 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import Any
 
+from django.core.files.storage import default_storage
+
+from house.services.images import srcset, variant_url
+
 
 def _absolute_url(request, relative_url: str | None) -> str | None:
     if not relative_url or not request:
@@ -58,6 +62,12 @@ def serialize_image(image_obj, request=None) -> dict:
         "id": image_obj.id,
         "url": _absolute_url(request, image_obj.image.url),
         "is_main": image_obj.is_main,
+        "placeholder": image_obj.placeholder or None,
+        "dominant_color": image_obj.dominant_color or None,
+        "variants": {
+            label: _absolute_url(request, variant_url(image_obj.variants, label))
+            for label in image_obj.variants or {}
+        },
     }
 
 
@@ -104,3 +114,33 @@ def serialize_property(property_obj, request=None) -> dict:
             else None
         ),
     }
+
+
+def serialize_property_card(property_obj, *, liked_ids=frozenset()) -> dict:
+    """Компактне представлення картки для асинхронного пошуку."""
+    cover = getattr(property_obj, "cover_image", None)
+    variants = getattr(property_obj, "cover_variants", None)
+    if cover:
+        cover = variant_url(variants, "card") or default_storage.url(cover)
+    return {
+        "id": property_obj.id,
+        "slug": property_obj.slug,
+        "title": property_obj.title,
+        "address": property_obj.address,
+        "url": property_obj.get_absolute_url(),
+        "cover": cover or None,
+        "cover_srcset": srcset(variants) if cover else "",
+        "cover_placeholder": getattr(property_obj, "cover_placeholder", None) or None,
+        "cover_color": getattr(property_obj, "cover_color", None) or None,
+        "prices": {
+            "USD": getattr(property_obj, "price_usd_display", None),
+            "EUR": getattr(property_obj, "price_eur", None),
+            "UAH": getattr(property_obj, "price_uah", None),
+        },
+        "rooms": property_obj.rooms,
+        "area": property_obj.area,
+        "property_type": getattr(property_obj.property_type, "name", None),
+        "deal_type": getattr(property_obj.deal_type, "name", None),
+        "featured": property_obj.featured_homepage,
+        "liked": property_obj.id in liked_ids,
+    }
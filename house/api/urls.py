@@ -7,11 +7,17 @@ app_name = "house_api"
 urlpatterns = [
     path("properties/", views.property_collection, name="property_list"),
     path("properties/<int:property_id>/", views.property_item, name="property_detail"),
+    path("properties/batch/", views.property_batch, name="property_batch"),
     path(
         "properties/bulk-action/",
         views.property_bulk_action,
         name="property_bulk_action",
     ),
+    path(
+        "properties/bulk-update/",
+        views.property_bulk_update,
+        name="property_bulk_update",
+    ),
     path(
         "properties/<int:property_id>/images/",
         views.property_image_list,
@@ -27,6 +33,12 @@ urlpatterns = [
         views.property_images_reorder,
         name="property_images_reorder",
     ),
+    path(
+        "properties/<int:property_id>/duplicates/",
+        views.property_duplicates,
+        name="property_duplicates",
+    ),
+    path("jobs/<int:job_id>/", views.job_detail, name="job_detail"),
     path("property-types/", views.property_type_collection, name="property_type_list"),
     path("deal-types/", views.deal_type_collection, name="deal_type_list"),
     path("features/", views.feature_collection, name="feature_list"),
@@ -44,4 +56,9 @@ urlpatterns = [
         views.property_import_link,
         name="property_import_link",
     ),
+    path(
+        "properties/import-links/",
+        views.property_import_links,
+        name="property_import_links",
+    ),
 ]
@@ -1,25 +1,24 @@
 import json
 import logging
-import os
 from decimal import Decimal, InvalidOperation
-from urllib.parse import urlparse
 
 import requests
 from django.conf import settings
 from django.contrib.auth.decorators import user_passes_test
 from django.core.cache import cache
-from django.core.files.base import ContentFile
 from django.core.paginator import EmptyPage, Paginator
 from django.db import transaction
 from django.db.models import Q
 from django.http import HttpResponseNotAllowed, JsonResponse
 from django.shortcuts import get_object_or_404
+from django.urls import reverse
 from django.utils.html import strip_tags
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
 
 from house.api.serializers import serialize_image, serialize_property
 from house.models import (
+    BackgroundJob,
     DealType,
     Feature,
     HomepageHighlightSettings,
@@ -27,6 +26,33 @@ from house.models import (
     PropertyImage,
     PropertyType,
 )
+from house.services.bulk_actions import BULK_ACTIONS, apply_bulk_action
+from house.services.bulk_import import (
+    ImportEntry,
+    bulk_import_properties,
+    images_payload,
+    iter_ndjson,
+    schedule_followup,
+)
+from house.services.duplicates import parsed_duplicate_warnings, possible_duplicates
+from house.services.html_import import (
+    parse_files,
+    save_parsed,
+    start_html_import_job,
+)
+from house.services.images import ingest_images, release_image_files
+from house.services.importer import (
+    import_images,
+    import_parsed_property,
+    parsed_fingerprint,
+)
+from house.services.jobs import serialize_job, start_job
+from house.services.link_import import (
+    clean_urls,
+    import_links,
+    start_link_import_job,
+)
+from house.services.tasks import enqueue, queue_enabled
 from house.utils.currency import get_exchange_rates
 from house.utils.html_parser import parse_property_html
 from landing_doominium_real_state.views.common import get_client_ip
@@ -90,7 +116,27 @@ def _properties_queryset():
     ).prefetch_related("features", "images")
 
 
-def _create_property_from_parsed(data: dict):
+def _get_list_param(params, name, limit=None):
+    """
+    Підтримує як ?ids=1,2,3, так і ?ids=1&ids=2; зберігає порядок без дублів.
+
+    З ``limit`` розбір зупиняється на limit + 1 значенні - досить, щоб
+    побачити перевищення ліміту, не обробляючи весь запит.
+    """
+    values, seen = [], set()
+    for raw in params.getlist(name):
+        for token in raw.split(","):
+            token = token.strip()
+            if not token or token in seen:
+                continue
+            seen.add(token)
+            values.append(token)
+            if limit is not None and len(values) > limit:
+                return values
+    return values
+
+
+def _create_property_from_parsed(data: dict, *, source_url: str = ""):
     warnings: list[str] = []
     payload = {
         "title": data.get("title"),
@@ -122,60 +168,31 @@ def _create_property_from_parsed(data: dict):
         property_obj.property_type = property_type
     if deal_type:
         property_obj.deal_type = deal_type
+    if source_url:
+        property_obj.source_url = source_url
+        property_obj.source_fingerprint = parsed_fingerprint(data)
+    warnings.extend(parsed_duplicate_warnings(data))
 
     try:
         property_obj.save()
     except Exception as exc:
         return None, {"save": str(exc)}, warnings
 
-    warnings.extend(_import_images(property_obj, data))
-
-    return property_obj, None, warnings
-
-
-def _import_images(property_obj: Property, data: dict) -> list[str]:
-    warnings: list[str] = []
-    image_pairs: list[tuple[str, bool]] = []
-    main_image = data.get("main_image")
-    if main_image:
-        image_pairs.append((main_image, True))
-    for url in data.get("gallery") or []:
-        image_pairs.append((url, False))
-
-    seen = set()
-    has_main = property_obj.images.filter(is_main=True).exists()
-    timeout = getattr(settings, "REQUESTS_TIMEOUT", 10)
-
-    for index, (url, wants_main) in enumerate(image_pairs, start=1):
-        if not url or url in seen:
-            continue
-        seen.add(url)
-        try:
-            response = requests.get(url, timeout=timeout)
-            response.raise_for_status()
-        except requests.RequestException as exc:
-            warnings.append(f"{url}: {exc}")
-            continue
-
-        filename = (
-            os.path.basename(urlparse(url).path)
-            or f"import-{property_obj.pk}-{index}.jpg"
-        )
-        if not os.path.splitext(filename)[1]:
-            filename += ".jpg"
-
-        try:
-            content = ContentFile(response.content, name=filename)
-            property_obj.images.create(
-                image=content,
-                is_main=wants_main and not has_main,
+    if queue_enabled():
+        images = {"main_image": data.get("main_image"), "gallery": data.get("gallery")}
+        if images["main_image"] or images["gallery"]:
+            enqueue(
+                "property.import_images",
+                {"property_id": property_obj.pk, "data": images},
             )
-            if wants_main and not has_main:
-                has_main = True
-        except Exception as exc:
-            warnings.append(f"{url}: {exc}")
+    else:
+        warnings.extend(
+            import_images(
+                property_obj, data, timeout=getattr(settings, "REQUESTS_TIMEOUT", 10)
+            )
+        )
 
-    return warnings
+    return property_obj, None, warnings
 
 
 def _resolve_property_type_by_name(name: str | None):
@@ -509,6 +526,69 @@ def property_item(request, property_id):
     return HttpResponseNotAllowed(["GET", "PATCH", "PUT", "DELETE"])
 
 
+@require_http_methods(["GET"])
+def property_batch(request):
+    limit = getattr(settings, "PROPERTY_BATCH_MAX_ITEMS", 300)
+    raw_ids = _get_list_param(request.GET, "ids", limit)
+    slugs = _get_list_param(request.GET, "slugs", max(limit - len(raw_ids), 0))
+
+    if not raw_ids and not slugs:
+        return JsonResponse(
+            {"error": "Передайте параметр 'ids' або 'slugs'."}, status=400
+        )
+
+    if len(raw_ids) + len(slugs) > limit:
+        return JsonResponse(
+            {"error": f"Можна запитати не більше {limit} об'єктів за раз."},
+            status=400,
+        )
+
+    ids = []
+    invalid_ids = []
+    for value in raw_ids:
+        parsed = _try_parse_int(value)
+        if parsed is None:
+            invalid_ids.append(value)
+        else:
+            ids.append(parsed)
+    ids = list(dict.fromkeys(ids))  # "01" і "1" - той самий ID
+    if invalid_ids:
+        return JsonResponse(
+            {"error": f"Некоректні ID: {', '.join(invalid_ids)}."}, status=400
+        )
+
+    lookup = Q()
+    if ids:
+        lookup |= Q(id__in=ids)
+    if slugs:
+        lookup |= Q(slug__in=slugs)
+
+    found = list(_properties_queryset().filter(lookup))
+    by_id = {property_obj.id: property_obj for property_obj in found}
+    by_slug = {property_obj.slug: property_obj for property_obj in found}
+
+    ordered = []
+    seen = set()
+    for property_obj in [by_id.get(pk) for pk in ids] + [
+        by_slug.get(slug) for slug in slugs
+    ]:
+        if property_obj is not None and property_obj.id not in seen:
+            seen.add(property_obj.id)
+            ordered.append(property_obj)
+
+    payload = {
+        "results": [
+            serialize_property(property_obj, request) for property_obj in ordered
+        ],
+        "count": len(ordered),
+        "missing": {
+            "ids": [pk for pk in ids if pk not in by_id],
+            "slugs": [slug for slug in slugs if slug not in by_slug],
+        },
+    }
+    return JsonResponse(payload, status=200)
+
+
 @require_http_methods(["GET"])
 def property_type_collection(request):
     items = PropertyType.objects.all().order_by("name")
@@ -662,6 +742,156 @@ def _ensure_staff(request):
     return None
 
 
+def _prepare_import_entries(items, position_key):
+    """
+    Валідує елементи пакетного імпорту; повертає (entries, errors).
+
+    ``items`` - пари (позиція, dict); помилки містять позицію під ключем
+    ``position_key`` ("index" для JSON, "line" для NDJSON).
+    """
+    entries = []
+    errors = []
+    items = [(idx, item, {}) for idx, item in items]
+
+    # Довідники вибираються один раз на весь пакет, а не на кожен рядок.
+    type_ids, deal_ids, feature_ids = set(), set(), set()
+    for _, item, item_errors in items:
+        for key, bucket in (
+            ("property_type_id", type_ids),
+            ("deal_type_id", deal_ids),
+        ):
+            value = item.get(key)
+            if value is not None:
+                parsed = _try_parse_int(value)
+                if parsed is None:
+                    item_errors[key] = "Повинно бути ціле число."
+                else:
+                    bucket.add(parsed)
+        parsed_features = _parse_id_list(
+            item.get("feature_ids"), "feature_ids", item_errors
+        )
+        if parsed_features:
+            feature_ids.update(parsed_features)
+
+    property_types = PropertyType.objects.in_bulk(type_ids) if type_ids else {}
+    deal_types = DealType.objects.in_bulk(deal_ids) if deal_ids else {}
+    known_features = (
+        set(Feature.objects.filter(id__in=feature_ids).values_list("id", flat=True))
+        if feature_ids
+        else set()
+    )
+
+    for idx, item, item_errors in items:
+        property_obj = Property()
+        _update_fields(property_obj, item, item_errors)
+
+        type_id = _try_parse_int(item.get("property_type_id"))
+        if type_id is not None:
+            if type_id in property_types:
+                property_obj.property_type = property_types[type_id]
+            else:
+                item_errors["property_type_id"] = "Вказаний тип нерухомості не існує."
+        deal_id = _try_parse_int(item.get("deal_type_id"))
+        if deal_id is not None:
+            if deal_id in deal_types:
+                property_obj.deal_type = deal_types[deal_id]
+            else:
+                item_errors["deal_type_id"] = "Вказаний тип угоди не існує."
+
+        item_features = _parse_id_list(item.get("feature_ids"), "feature_ids", {})
+        missing = (item_features or set()) - known_features
+        if missing:
+            item_errors["feature_ids"] = (
+                f"Відсутні ID характеристик: {', '.join(map(str, sorted(missing)))}."
+            )
+
+        # Поля без значень за замовчуванням: інакше bulk_create впаде на всьому пакеті.
+        for field_name in ("price", "area", "rooms"):
+            if item_errors.get(field_name) is None and item.get(field_name) in (
+                None,
+                "",
+            ):
+                item_errors[field_name] = "Поле обов'язкове."
+
+        if item_errors:
+            errors.append({position_key: idx, "errors": item_errors})
+            continue
+
+        entries.append(
+            ImportEntry(
+                instance=property_obj,
+                feature_ids=item_features or set(),
+                images=images_payload(item),
+            )
+        )
+    return entries, errors
+
+
+NDJSON_CONTENT_TYPES = {
+    "application/x-ndjson",
+    "application/ndjson",
+    "application/jsonl",
+    "application/x-jsonlines",
+}
+
+
+def _import_ndjson_stream(request):
+    """
+    Імпорт NDJSON: тіло читається порціями просто з потоку запиту.
+
+    Кожна порція валідується та пишеться окремо (bulk_import_properties), тож
+    пам'ять не залежить від кількості рядків. Помилки - з номером рядка; у
+    відповіді не більше PROPERTY_IMPORT_MAX_ERRORS перших помилок.
+    """
+    max_errors = getattr(settings, "PROPERTY_IMPORT_MAX_ERRORS", 1000)
+    lines = created = failed = 0
+    errors = []
+    truncated = False
+
+    def add_errors(new_errors, rows=None):
+        nonlocal failed, truncated
+        failed += len(new_errors) if rows is None else rows
+        room = max(max_errors - len(errors), 0)
+        truncated = truncated or len(new_errors) > room
+        errors.extend(new_errors[:room])
+
+    for chunk in iter_ndjson(request):
+        lines = chunk[-1].line
+        add_errors(
+            [{"line": row.line, "error": row.error} for row in chunk if row.error]
+        )
+        entries, item_errors = _prepare_import_entries(
+            [(row.line, row.item) for row in chunk if row.item is not None], "line"
+        )
+        add_errors(item_errors)
+        try:
+            created += len(bulk_import_properties(entries))
+        except Exception as exc:
+            logger.exception("Порцію NDJSON-імпорту не збережено: %s", exc)
+            add_errors(
+                [
+                    {
+                        "line": chunk[0].line,
+                        "error": f"Рядки {chunk[0].line}-{lines} не збережено: {exc}",
+                    }
+                ],
+                rows=len(entries),
+            )
+
+    if not lines:
+        return JsonResponse({"error": "Порожній NDJSON."}, status=400)
+    return JsonResponse(
+        {
+            "lines": lines,
+            "created": created,
+            "failed": failed,
+            "errors": errors,
+            "errors_truncated": truncated,
+        },
+        status=201 if created and not failed else 207,
+    )
+
+
 @csrf_exempt
 @require_http_methods(["POST"])
 def property_import(request):
@@ -669,6 +899,12 @@ def property_import(request):
     if guard_response:
         return guard_response
 
+    if (
+        request.content_type in NDJSON_CONTENT_TYPES
+        or request.GET.get("format") == "ndjson"
+    ):
+        return _import_ndjson_stream(request)
+
     payload = _parse_json(request)
     if payload is None:
         return JsonResponse({"error": "Некоректний JSON."}, status=400)
@@ -683,38 +919,30 @@ def property_import(request):
             {"error": "Очікується список об'єктів у полі 'items'."}, status=400
         )
 
-    created = []
+    items = []
     errors = []
-
     for idx, item in enumerate(chunk, start=1):
         if not isinstance(item, dict):
             errors.append({"index": idx, "error": "Елемент має бути JSON-об'єктом."})
             continue
+        items.append((idx, item))
 
-        validation_errors = {}
-        property_obj = Property()
-        _update_fields(property_obj, item, validation_errors)
-        _apply_relation(property_obj, item, validation_errors, update_features=False)
-
-        if validation_errors:
-            errors.append({"index": idx, "errors": validation_errors})
-            continue
-
-        property_obj.save()
+    entries, item_errors = _prepare_import_entries(items, "index")
+    errors.extend(item_errors)
 
-        feature_ids = item.get("feature_ids")
-        if isinstance(feature_ids, list):
-            _apply_relation(
-                property_obj,
-                {"feature_ids": feature_ids},
-                validation_errors,
-                update_features=True,
-            )
-
-        created.append(property_obj.id)
+    try:
+        created = bulk_import_properties(entries)
+    except Exception as exc:
+        logger.exception("Пакетний імпорт завершився помилкою: %s", exc)
+        return JsonResponse(
+            {"created": [], "errors": errors + [{"error": str(exc)}]}, status=400
+        )
 
     status_code = 201 if created and not errors else 207
-    return JsonResponse({"created": created, "errors": errors}, status=status_code)
+    return JsonResponse(
+        {"created": [property_obj.id for property_obj in created], "errors": errors},
+        status=status_code,
+    )
 
 
 @csrf_exempt
@@ -728,41 +956,29 @@ def property_import_html(request):
     if not files:
         return JsonResponse({"error": "Не передано файлів для імпорту."}, status=400)
 
-    geocode = request.POST.get("geocode") in {"1", "true", "on"}
-    rates = get_exchange_rates()
-    created = []
-    errors = []
-
-    for uploaded in files:
-        name = getattr(uploaded, "name", "unnamed.html")
-        try:
-            content = uploaded.read().decode("utf-8")
-        except UnicodeDecodeError:
-            errors.append(
-                {"file": name, "error": "Не вдалося прочитати файл у кодуванні UTF-8."}
-            )
-            continue
-
-        try:
-            parsed = parse_property_html(
-                content,
-                source=name,
-                rates=rates,
-                geocode_missing=geocode,
-            )
-            data = parsed.as_dict()
-        except Exception as exc:
-            logger.exception("Помилка парсингу файлу %s: %s", name, exc)
-            errors.append({"file": name, "error": f"Не вдалося розібрати HTML: {exc}"})
-            continue
+    payload = [
+        (getattr(uploaded, "name", "unnamed.html"), uploaded.read())
+        for uploaded in files
+    ]
 
-        property_obj, validation_errors, warnings = _create_property_from_parsed(data)
-        if validation_errors:
-            errors.append({"file": name, "errors": validation_errors})
-            continue
+    # Великі пакети - у фоні: запит не тримає воркер на час розбору.
+    if len(payload) > getattr(settings, "HTML_IMPORT_ASYNC_THRESHOLD", 20):
+        job = start_html_import_job(payload)
+        return JsonResponse(
+            {
+                "status": "accepted",
+                "job_id": job.id,
+                "progress_url": reverse("house_api:job_detail", args=[job.id]),
+            },
+            status=202,
+        )
 
-        created.append(
-            {"id": property_obj.id, "title": property_obj.title, "warnings": warnings}
+    try:
+        created, errors = save_parsed(parse_files(payload))
+    except Exception as exc:
+        logger.exception("Імпорт HTML-файлів завершився помилкою: %s", exc)
+        return JsonResponse(
+            {"created": [], "errors": [{"error": str(exc)}]}, status=400
         )
 
     status_code = 201 if created and not errors else 207
@@ -805,8 +1021,27 @@ def property_import_link(request):
         logger.exception("Помилка парсингу URL %s: %s", url, exc)
         return JsonResponse({"error": f"Не вдалося розібрати HTML: {exc}"}, status=400)
 
+    data = parsed.as_dict()
+    # Повторний імпорт посилання оновлює наявний об'єкт замість дубліката.
+    if Property.objects.filter(source_url=url).exists():
+        result = import_parsed_property(
+            data, source_url=url, timeout=getattr(settings, "REQUESTS_TIMEOUT", 10)
+        )
+        return JsonResponse(
+            {
+                "updated": {
+                    "id": result.property.id,
+                    "title": result.property.title,
+                    "status": result.status,
+                    "changed": result.changed,
+                    "warnings": result.warnings,
+                }
+            },
+            status=200,
+        )
+
     property_obj, validation_errors, warnings = _create_property_from_parsed(
-        parsed.as_dict()
+        data, source_url=url
     )
     if validation_errors:
         return JsonResponse({"errors": validation_errors}, status=400)
@@ -823,16 +1058,61 @@ def property_import_link(request):
     )
 
 
-def _is_staff(user):
-    return user.is_authenticated and user.is_staff
+@csrf_exempt
+@require_http_methods(["POST"])
+def property_import_links(request):
+    guard_response = _ensure_staff(request)
+    if guard_response:
+        return guard_response
 
+    payload = _parse_json(request)
+    if payload is None:
+        return JsonResponse({"error": "Некоректний JSON."}, status=400)
 
-def serialize_image(image_obj, request=None):
-    return {
-        "id": image_obj.id,
-        "url": _absolute_url(request, image_obj.image.url),
-        "is_main": image_obj.is_main,
-    }
+    raw_urls = payload.get("urls")
+    if not isinstance(raw_urls, list) or not raw_urls:
+        return JsonResponse(
+            {"error": "Поле 'urls' має бути непорожнім списком."}, status=400
+        )
+
+    max_urls = getattr(settings, "LINK_IMPORT_MAX_URLS", 100)
+    if len(raw_urls) > max_urls:
+        return JsonResponse(
+            {"error": f"Забагато посилань в одному запиті (максимум {max_urls})."},
+            status=400,
+        )
+
+    urls, invalid = clean_urls(raw_urls)
+    if not urls:
+        return JsonResponse({"results": invalid}, status=400)
+
+    # Великі пакети - у фоні; статус кожного посилання видно в progress_url.
+    if len(urls) > getattr(settings, "LINK_IMPORT_ASYNC_THRESHOLD", 5):
+        job = start_link_import_job(urls)
+        return JsonResponse(
+            {
+                "status": "accepted",
+                "job_id": job.id,
+                "progress_url": reverse("house_api:job_detail", args=[job.id]),
+                "results": invalid,
+            },
+            status=202,
+        )
+
+    try:
+        results = import_links(urls)
+    except Exception as exc:
+        logger.exception("Імпорт посилань завершився помилкою: %s", exc)
+        return JsonResponse({"results": invalid, "error": str(exc)}, status=400)
+
+    results = invalid + results
+    failed = [item for item in results if item["status"] == "error"]
+    status_code = 207 if failed else 201
+    return JsonResponse({"results": results}, status=status_code)
+
+
+def _is_staff(user):
+    return user.is_authenticated and user.is_staff
 
 
 @csrf_exempt
@@ -853,32 +1133,325 @@ def property_bulk_action(request):
             {"status": "error", "message": "Не вибрано жодного об'єкта."}, status=400
         )
 
-    valid_actions = {"archive", "restore", "delete"}
-    if action not in valid_actions:
+    if action not in BULK_ACTIONS:
         return JsonResponse(
             {"status": "error", "message": "Непідтримувана дія."}, status=400
         )
 
-    queryset = Property.objects.filter(id__in=ids)
-    affected = queryset.count()
+    try:
+        ids = list(dict.fromkeys(int(pk) for pk in ids))
+    except (TypeError, ValueError):
+        return JsonResponse(
+            {"status": "error", "message": "Список має містити ідентифікатори."},
+            status=400,
+        )
 
-    if affected == 0:
+    existing_ids = list(
+        Property.objects.filter(id__in=ids).order_by("id").values_list("id", flat=True)
+    )
+    if not existing_ids:
         return JsonResponse(
             {"status": "error", "message": "Обрані об'єкти не існують."}, status=404
         )
 
-    if action == "archive":
-        queryset.update(is_archived=True)
-    elif action == "restore":
-        queryset.update(is_archived=False)
-    else:
-        queryset.delete()
+    threshold = getattr(settings, "BULK_ACTION_ASYNC_THRESHOLD", 200)
+    if len(existing_ids) > threshold:
+        job = start_job(
+            "bulk_action",
+            {"ids": existing_ids, "action": action},
+            total=len(existing_ids),
+        )
+        return JsonResponse(
+            {
+                "status": "accepted",
+                "action": action,
+                "job_id": job.id,
+                "progress_url": reverse("house_api:job_detail", args=[job.id]),
+            },
+            status=202,
+        )
 
+    affected = apply_bulk_action(existing_ids, action)
     return JsonResponse(
         {"status": "ok", "processed": affected, "action": action}, status=200
     )
 
 
+@require_http_methods(["GET"])
+@user_passes_test(_is_staff)
+def property_duplicates(request, property_id):
+    """Можливі дублікати об'єкта за схожістю адреси й опису (MinHash/LSH)."""
+    property_obj = get_object_or_404(Property, pk=property_id)
+    matches = possible_duplicates(property_obj)
+    titles = Property.objects.in_bulk([match.property_id for match in matches])
+    return JsonResponse(
+        {
+            "results": [
+                {
+                    "id": match.property_id,
+                    "title": titles[match.property_id].title,
+                    "address": titles[match.property_id].address,
+                    "similarity": round(match.similarity, 2),
+                }
+                for match in matches
+                if match.property_id in titles
+            ]
+        },
+        status=200,
+    )
+
+
+@require_http_methods(["GET"])
+@user_passes_test(_is_staff)
+def job_detail(request, job_id):
+    job = get_object_or_404(BackgroundJob, pk=job_id)
+    return JsonResponse({"result": serialize_job(job)}, status=200)
+
+
+BULK_UPDATE_FIELDS = (
+    "title",
+    "description",
+    "address",
+    "price",
+    "area",
+    "rooms",
+    "latitude",
+    "longitude",
+    "featured_homepage",
+    "is_archived",
+    "property_type",
+    "deal_type",
+)
+
+
+def _parse_id_list(value, field_name, errors):
+    if value is None:
+        return None
+    if not isinstance(value, list):
+        errors[field_name] = "Очікується список ідентифікаторів."
+        return None
+    try:
+        return {int(pk) for pk in value}
+    except (TypeError, ValueError):
+        errors[field_name] = "Список має містити ідентифікатори."
+        return None
+
+
+def _field_snapshot(instance):
+    return {
+        field: getattr(instance, f"{field}_id" if field.endswith("_type") else field)
+        for field in BULK_UPDATE_FIELDS
+    }
+
+
+@csrf_exempt
+@require_http_methods(["POST", "PATCH"])
+@user_passes_test(_is_staff)
+def property_bulk_update(request):
+    payload = _parse_json(request)
+    if payload is None:
+        return JsonResponse({"error": "Некоректний JSON."}, status=400)
+
+    items = payload if isinstance(payload, list) else payload.get("items")
+    if not isinstance(items, list) or not items:
+        return JsonResponse(
+            {"error": "Очікується непорожній список змін у полі 'items'."}, status=400
+        )
+
+    limit = getattr(settings, "PROPERTY_BATCH_MAX_ITEMS", 300)
+    if len(items) > limit:
+        return JsonResponse(
+            {"error": f"Можна оновити не більше {limit} об'єктів за раз."},
+            status=400,
+        )
+
+    results = [None] * len(items)
+    updates = []  # (index, property_id, item, errors)
+    seen_ids = set()
+    for index, item in enumerate(items):
+        property_id = _try_parse_int(item.get("id")) if isinstance(item, dict) else None
+        if property_id is None:
+            results[index] = {
+                "index": index,
+                "status": "error",
+                "errors": {"id": "Кожен елемент має містити числовий 'id'."},
+            }
+            continue
+        if property_id in seen_ids:
+            results[index] = {
+                "index": index,
+                "id": property_id,
+                "status": "error",
+                "errors": {"id": "Об'єкт повторюється у запиті."},
+            }
+            continue
+        seen_ids.add(property_id)
+        updates.append((index, property_id, item, {}))
+
+    # Одна вибірка на кожну таблицю, на яку посилаються зміни.
+    properties = Property.objects.in_bulk([pk for _, pk, _, _ in updates])
+    type_ids, deal_ids, feature_ids = set(), set(), set()
+    for _, _, item, errors in updates:
+        for key, bucket in (
+            ("property_type_id", type_ids),
+            ("deal_type_id", deal_ids),
+        ):
+            value = item.get(key)
+            if value is not None:
+                parsed = _try_parse_int(value)
+                if parsed is None:
+                    errors[key] = "Повинно бути ціле число."
+                else:
+                    bucket.add(parsed)
+        for key in ("feature_ids", "add_feature_ids", "remove_feature_ids"):
+            parsed = _parse_id_list(item.get(key), key, errors)
+            if parsed:
+                feature_ids.update(parsed)
+
+    property_types = PropertyType.objects.in_bulk(type_ids) if type_ids else {}
+    deal_types = DealType.objects.in_bulk(deal_ids) if deal_ids else {}
+    known_features = (
+        set(Feature.objects.filter(id__in=feature_ids).values_list("id", flat=True))
+        if feature_ids
+        else set()
+    )
+
+    changed = []
+    address_changed = []
+    feature_changes = {}  # property_id -> (replace, add, remove)
+    for index, property_id, item, errors in updates:
+        property_obj = properties.get(property_id)
+        if property_obj is None:
+            results[index] = {
+                "index": index,
+                "id": property_id,
+                "status": "error",
+                "errors": {"id": "Об'єкт не знайдено."},
+            }
+            continue
+
+        before = _field_snapshot(property_obj)
+        _update_fields(property_obj, item, errors)
+
+        type_id = _try_parse_int(item.get("property_type_id"))
+        if type_id is not None:
+            if type_id in property_types:
+                property_obj.property_type = property_types[type_id]
+            else:
+                errors["property_type_id"] = "Вказаний тип нерухомості не існує."
+        deal_id = _try_parse_int(item.get("deal_type_id"))
+        if deal_id is not None:
+            if deal_id in deal_types:
+                property_obj.deal_type = deal_types[deal_id]
+            else:
+                errors["deal_type_id"] = "Вказаний тип угоди не існує."
+
+        feature_sets = []
+        for key in ("feature_ids", "add_feature_ids", "remove_feature_ids"):
+            parsed = _parse_id_list(item.get(key), key, {})
+            if parsed and parsed - known_features:
+                errors[key] = (
+                    "Відсутні ID характеристик: "
+                    f"{', '.join(map(str, sorted(parsed - known_features)))}."
+                )
+            feature_sets.append(parsed)
+
+        if errors:
+            results[index] = {
+                "index": index,
+                "id": property_id,
+                "status": "error",
+                "errors": errors,
+            }
+            continue
+
+        after = _field_snapshot(property_obj)
+        changed_fields = {field for field in after if after[field] != before[field]}
+        if "address" in changed_fields and not ({"latitude", "longitude"} & set(item)):
+            property_obj.latitude = None
+            property_obj.longitude = None
+            changed_fields.update({"latitude", "longitude"})
+            address_changed.append(property_obj)
+        if changed_fields:
+            changed.append((property_obj, changed_fields))
+        if any(value is not None for value in feature_sets):
+            feature_changes[property_id] = feature_sets
+        results[index] = {
+            "index": index,
+            "id": property_id,
+            "status": "updated" if changed_fields else "unchanged",
+            "fields": sorted(changed_fields),
+        }
+
+    with transaction.atomic():
+        if changed:
+            fields = sorted(set().union(*(fields for _, fields in changed)))
+            Property.objects.bulk_update(
+                [property_obj for property_obj, _ in changed], fields, batch_size=200
+            )
+        if feature_changes:
+            changed_feature_ids = _apply_feature_changes(feature_changes)
+            for result in results:
+                if result["status"] != "error" and result["id"] in changed_feature_ids:
+                    result["status"] = "updated"
+                    result["fields"] = sorted({*result["fields"], "features"})
+        if address_changed:
+            # Геокодування - у фоновій задачі, не в запиті (до ~1 запиту/с на адресу).
+            transaction.on_commit(
+                lambda: schedule_followup(
+                    [
+                        ImportEntry(instance=property_obj)
+                        for property_obj in address_changed
+                    ]
+                )
+            )
+
+    failed = sum(1 for result in results if result["status"] == "error")
+    return JsonResponse(
+        {
+            "results": results,
+            "updated": sum(1 for result in results if result["status"] == "updated"),
+            "failed": failed,
+        },
+        status=207 if failed else 200,
+    )
+
+
+def _apply_feature_changes(feature_changes):
+    """Set-based зміна M2M: один SELECT, один DELETE і один INSERT на весь пакет."""
+    through = Property.features.through
+    current = {}
+    for property_id, feature_id in through.objects.filter(
+        property_id__in=feature_changes
+    ).values_list("property_id", "feature_id"):
+        current.setdefault(property_id, set()).add(feature_id)
+
+    to_remove = Q()
+    to_add = []
+    touched = set()
+    for property_id, (replace, add, remove) in feature_changes.items():
+        existing = current.get(property_id, set())
+        desired = set(replace) if replace is not None else set(existing)
+        desired |= add or set()
+        desired -= remove or set()
+        removed = existing - desired
+        added = desired - existing
+        if removed:
+            to_remove |= Q(property_id=property_id, feature_id__in=removed)
+        to_add.extend(
+            through(property_id=property_id, feature_id=feature_id)
+            for feature_id in added
+        )
+        if removed or added:
+            touched.add(property_id)
+
+    if to_remove.children:
+        through.objects.filter(to_remove).delete()
+    if to_add:
+        through.objects.bulk_create(to_add, batch_size=500)
+    return touched
+
+
 @csrf_exempt
 @require_http_methods(["GET", "POST"])
 @user_passes_test(_is_staff)
@@ -901,19 +1474,18 @@ def property_image_list(request, property_id):
             {"error": "Потрібно надіслати хоча б одне фото."}, status=400
         )
 
-    created = []
-    errors = []
-    for index, upload in enumerate(images, start=1):
-        is_main = bool(request.POST.get("is_main")) and index == len(images)
-        image_obj = PropertyImage(property=property_obj, image=upload, is_main=is_main)
-        try:
-            image_obj.save()
-            created.append(serialize_image(image_obj, request))
-        except Exception as exc:
-            errors.append({"file": getattr(upload, "name", "файл"), "error": str(exc)})
+    # Головним стає останнє фото пакета, якщо передано is_main.
+    main_index = len(images) - 1 if request.POST.get("is_main") else None
+    created, errors = ingest_images(property_obj, images, main_index=main_index)
 
     status_code = 201 if created else 400
-    return JsonResponse({"created": created, "errors": errors}, status=status_code)
+    return JsonResponse(
+        {
+            "created": [serialize_image(image, request) for image in created],
+            "errors": errors,
+        },
+        status=status_code,
+    )
 
 
 @csrf_exempt
@@ -935,8 +1507,9 @@ def property_image_detail(request, image_id):
         return JsonResponse({"result": serialize_image(image_obj, request)}, status=200)
 
     # DELETE
-    image_obj.image.delete(save=False)
+    entry = (image_obj.image.name, image_obj.variants)
     image_obj.delete()
+    release_image_files([entry], image_obj.image.storage)
     return JsonResponse({"status": "deleted"}, status=200)
 
 
@@ -951,11 +1524,14 @@ def property_images_reorder(request, property_id):
     order = payload.get("order") or []
     if not isinstance(order, list):
         return JsonResponse({"error": "Очікується список id."}, status=400)
-    images = list(property_obj.images.all().filter(id__in=order).select_related())
-    id_map = {image.id: image for image in images}
+    positions = {}
     for idx, image_id in enumerate(order, start=1):
-        image = id_map.get(image_id)
-        if image:
-            image.sort_order = idx
-            image.save()
-    return JsonResponse({"status": "ok"}, status=200)
+        image_id = _try_parse_int(image_id)
+        if image_id is not None:
+            positions.setdefault(image_id, idx)
+    # Один UPDATE ... CASE без побічних дій PropertyImage.save.
+    images = list(property_obj.images.filter(id__in=positions).only("id"))
+    for image in images:
+        image.sort_order = positions[image.id]
+    PropertyImage.objects.bulk_update(images, ["sort_order"])
+    return JsonResponse({"status": "ok", "updated": len(images)}, status=200)
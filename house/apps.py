@@ -4,3 +4,20 @@ from django.apps import AppConfig
 class HouseConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "house"
+
+    def ready(self):
+        from django.utils.module_loading import autodiscover_modules
+
+        # Реєстрація обробників фонових задач і задач черги (<app>/tasks.py).
+        from house.services import (  # noqa: F401
+            bulk_actions,
+            bulk_import,
+            html_import,
+            link_import,
+            zip_import,
+        )
+
+        # Профілі розбору HTML компілюються один раз під час старту.
+        from house.utils import extraction_profiles  # noqa: F401
+
+        autodiscover_modules("tasks")
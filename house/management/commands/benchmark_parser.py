@@ -0,0 +1,118 @@
+import logging
+
+from django.core.management.base import BaseCommand, CommandError
+
+from house.services.parser_benchmark import (
+    engines,
+    extraction_stages,
+    golden_diff,
+    load_corpus,
+    measure,
+    parse_document,
+)
+
+
+def _kib(size: int) -> str:
+    return f"{size / 1024:.0f} KiB"
+
+
+class Command(BaseCommand):
+    help = (
+        "Бенчмарк парсера презентацій на корпусі house/fixtures/parser_corpus: "
+        "час і пам'ять на документ та на кожну функцію витягання, звірка з еталонами."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--engine",
+            choices=["all", "bs4", "lxml"],
+            default="all",
+            help="Який рушій вимірювати.",
+        )
+        parser.add_argument(
+            "--repeat", type=int, default=20, help="Повторів на кожен замір."
+        )
+        parser.add_argument("--corpus", help="Інший каталог із HTML-файлами.")
+        parser.add_argument(
+            "--functions",
+            action="store_true",
+            help="Показати час і пам'ять кожної функції витягання.",
+        )
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Завершитись помилкою, якщо результат відрізняється від еталону.",
+        )
+        parser.add_argument(
+            "--update-golden",
+            action="store_true",
+            help="Перезаписати еталони результатом BeautifulSoup-рушія.",
+        )
+
+    def handle(self, *args, **options):
+        documents = load_corpus(options["corpus"])
+        if not documents:
+            raise CommandError("У корпусі немає HTML-файлів.")
+        selected = engines() if options["engine"] == "all" else [options["engine"]]
+        if options["engine"] == "lxml" and "lxml" not in engines():
+            raise CommandError("lxml не встановлено.")
+
+        # Попередження парсера про відсутні поля лише засмічують звіт.
+        parser_logger = logging.getLogger("house.utils.html_parser")
+        level = parser_logger.level
+        parser_logger.setLevel(logging.ERROR)
+        try:
+            self._run(documents, selected, options)
+        finally:
+            parser_logger.setLevel(level)
+
+    def _run(self, documents, selected, options):
+        if options["update_golden"]:
+            for document in documents:
+                document.write_golden(parse_document(document, "bs4"))
+            self.stdout.write(f"Оновлено еталонів: {len(documents)}.")
+
+        mismatches = 0
+        for engine in selected:
+            self.stdout.write(self.style.MIGRATE_HEADING(f"Рушій {engine}"))
+            total_seconds = 0.0
+            peak = 0
+            for document in documents:
+                result = measure(
+                    lambda: parse_document(document, engine), options["repeat"]
+                )
+                total_seconds += result.seconds
+                peak = max(peak, result.peak_bytes)
+
+                golden = document.golden
+                if golden is None:
+                    status = self.style.WARNING("немає еталону")
+                else:
+                    diff = golden_diff(golden, parse_document(document, engine))
+                    mismatches += bool(diff)
+                    status = (
+                        self.style.ERROR("відрізняється: " + ", ".join(diff))
+                        if diff
+                        else self.style.SUCCESS("OK")
+                    )
+                self.stdout.write(
+                    f"  {document.name:<28} {result.seconds * 1000:8.2f} мс "
+                    f"{result.per_second:8.0f} док/с  пік {_kib(result.peak_bytes):>9}  "
+                    f"{status}"
+                )
+
+                if options["functions"]:
+                    for label, func in extraction_stages(document.html, engine):
+                        stage = measure(func, options["repeat"])
+                        self.stdout.write(
+                            f"      {label:<14} {stage.seconds * 1000:8.3f} мс  "
+                            f"пік {_kib(stage.peak_bytes):>9}"
+                        )
+
+            self.stdout.write(
+                f"  Разом: {len(documents)} док., {total_seconds * 1000:.2f} мс, "
+                f"{len(documents) / total_seconds:.0f} док/с, пік {_kib(peak)}"
+            )
+
+        if mismatches and options["check"]:
+            raise CommandError(f"Розбіжностей з еталонами: {mismatches}.")
@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand
+
+from house.models import Property
+from house.services.duplicates import index_properties
+
+
+class Command(BaseCommand):
+    help = (
+        "Будує MinHash-підписи й кошики LSH для пошуку дублікатів. Об'єкти з "
+        "незміненим текстом пропускаються, тож повторний запуск дешевий."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size", type=int, default=500, help="Об'єктів за один запис."
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        rows = Property.objects.only("address", "description").order_by("pk")
+        total = updated = 0
+        batch = []
+        for property_obj in rows.iterator(chunk_size=batch_size):
+            batch.append(property_obj)
+            if len(batch) == batch_size:
+                updated += index_properties(batch)
+                total += len(batch)
+                batch = []
+                self.stdout.write(f"  {total}...")
+        if batch:
+            updated += index_properties(batch)
+            total += len(batch)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Перевірено об'єктів: {total}, оновлено підписів: {updated}."
+            )
+        )
@@ -0,0 +1,58 @@
+from django.core.management.base import BaseCommand
+
+from house.models import PropertyImage
+from house.services.images import dominant_color, placeholder, preview_source
+
+
+class Command(BaseCommand):
+    help = (
+        "Заповнює заглушки (крихітний WebP) і основний колір для наявних фото. "
+        "Рахуються з найменшого варіанту, спільний файл обробляється один раз."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--limit", type=int, default=0)
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Перерахувати заглушки для всіх фото.",
+        )
+        parser.add_argument("--batch-size", type=int, default=200)
+
+    def handle(self, *args, **options):
+        queryset = PropertyImage.objects.exclude(image="").order_by("image", "id")
+        if not options["force"]:
+            queryset = queryset.filter(placeholder="")
+        if options["limit"]:
+            queryset = queryset[: options["limit"]]
+
+        batch, done, failed = [], 0, 0
+        # Записи відсортовані за файлом: спільний файл декодується один раз.
+        last_name, preview = None, None
+        for image_obj in queryset.only("image", "variants").iterator(chunk_size=500):
+            if image_obj.image.name != last_name:
+                last_name = image_obj.image.name
+                try:
+                    img = preview_source(image_obj)
+                    preview = (placeholder(img), dominant_color(img))
+                except Exception as exc:
+                    self.stderr.write(f"#{image_obj.pk} {last_name}: {exc}")
+                    preview = None
+            if preview is None:
+                failed += 1
+                continue
+            image_obj.placeholder, image_obj.dominant_color = preview
+            batch.append(image_obj)
+            if len(batch) >= options["batch_size"]:
+                PropertyImage.objects.bulk_update(
+                    batch, ["placeholder", "dominant_color"]
+                )
+                done += len(batch)
+                batch = []
+        if batch:
+            PropertyImage.objects.bulk_update(batch, ["placeholder", "dominant_color"])
+            done += len(batch)
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Заглушки оновлено: {done}, помилок: {failed}.")
+        )
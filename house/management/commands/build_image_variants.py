@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand
+
+from house.models import PropertyImage
+from house.services.tasks import enqueue, queue_enabled
+
+
+class Command(BaseCommand):
+    help = (
+        "Ставить у чергу генерацію WebP/AVIF-варіантів для фото, у яких їх ще немає "
+        "(без TASK_QUEUE_ENABLED обробляє одразу)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--limit", type=int, default=0)
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Перегенерувати варіанти для всіх фото.",
+        )
+
+    def handle(self, *args, **options):
+        queryset = PropertyImage.objects.exclude(image="").order_by("id")
+        if options["force"]:
+            queryset.update(variants={})
+        else:
+            queryset = queryset.filter(variants={})
+        ids = list(queryset.values_list("id", flat=True))
+        if options["limit"]:
+            ids = ids[: options["limit"]]
+
+        for image_id in ids:
+            enqueue("images.process", {"image_id": image_id})
+
+        action = "Поставлено в чергу" if queue_enabled() else "Оброблено"
+        self.stdout.write(self.style.SUCCESS(f"{action} фото: {len(ids)}."))
@@ -0,0 +1,65 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from house.services.media_gc import collect_garbage
+from house.services.tasks import enqueue, queue_enabled
+
+
+class Command(BaseCommand):
+    help = (
+        "Знаходить файли фото, на які не посилається жоден PropertyImage, і "
+        "видаляє їх. Файли, новіші за пільговий період, пропускаються."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Лише показати файли без посилань, нічого не видаляючи.",
+        )
+        parser.add_argument(
+            "--grace-hours",
+            type=int,
+            default=None,
+            help="Не чіпати файли, новіші за стільки годин "
+            "(типово MEDIA_GC_GRACE_HOURS).",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Скільки імен перевіряти в БД одним запитом.",
+        )
+        parser.add_argument(
+            "--schedule",
+            action="store_true",
+            help="Поставити періодичне прибирання в чергу задач замість запуску зараз.",
+        )
+
+    def handle(self, *args, **options):
+        if options["schedule"]:
+            if not queue_enabled():
+                # Без черги enqueue одразу видалив би файли, нічого не запланувавши.
+                raise CommandError(
+                    "--schedule потребує TASK_QUEUE_ENABLED=1 і запущеного run_worker."
+                )
+            enqueue("media.gc", {"schedule": True})
+            self.stdout.write(
+                self.style.SUCCESS("Періодичне прибирання поставлено в чергу.")
+            )
+            return
+
+        report = collect_garbage(
+            dry_run=options["dry_run"],
+            grace_hours=options["grace_hours"],
+            batch_size=options["batch_size"],
+        )
+        if options["dry_run"] or options["verbosity"] > 1:
+            for item in report.orphans:
+                self.stdout.write(f"  {item.name} ({item.size} байт)")
+        self.stdout.write(
+            f"Перевірено файлів: {report.scanned}, пропущено нових: "
+            f"{report.skipped_recent}, без посилань: {len(report.orphans)} "
+            f"({report.orphan_bytes} байт)."
+        )
+        if not options["dry_run"]:
+            self.stdout.write(self.style.SUCCESS(f"Видалено: {report.deleted}."))
@@ -0,0 +1,91 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from house.models import Property
+from house.services.geocoding import address_key, cached_lookup, geocode_address
+
+
+class Command(BaseCommand):
+    help = (
+        "Заповнює відсутні координати об'єктів. Однакові адреси геокодуються один раз, "
+        "запити йдуть не частіше GEOCODE_MIN_INTERVAL; повторний запуск продовжує "
+        "з того місця, де зупинився."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--limit", type=int, default=0, help="Максимум унікальних адрес за запуск."
+        )
+        parser.add_argument(
+            "--retry-missing",
+            action="store_true",
+            help="Повторно запитати адреси, які раніше не знайшлися.",
+        )
+        parser.add_argument(
+            "--dry-run", action="store_true", help="Лише показати, що буде зроблено."
+        )
+
+    def handle(self, *args, **options):
+        rows = (
+            Property.objects.filter(
+                Q(latitude__isnull=True) | Q(longitude__isnull=True)
+            )
+            .exclude(address="")
+            .values_list("id", "address")
+            .order_by("id")
+        )
+
+        # Одна адреса - один запит, навіть якщо за нею кілька об'єктів.
+        groups: dict[str, tuple[str, list[int]]] = {}
+        for property_id, address in rows.iterator():
+            key = address_key(address)
+            groups.setdefault(key, (address, []))[1].append(property_id)
+
+        addresses = [address for address, _ in groups.values()]
+        cached = cached_lookup(addresses)
+        pending = [
+            (address, ids)
+            for address, ids in groups.values()
+            if address not in cached
+            or cached[address].found
+            or options["retry_missing"]
+        ]
+        if options["limit"]:
+            pending = pending[: options["limit"]]
+
+        self.stdout.write(
+            f"Об'єктів без координат: {sum(len(ids) for _, ids in groups.values())}, "
+            f"унікальних адрес: {len(groups)}, до обробки: {len(pending)}."
+        )
+        if options["dry_run"] or not pending:
+            return
+
+        interval = getattr(settings, "GEOCODE_MIN_INTERVAL", 1)
+        self.stdout.write(f"Орієнтовний час: ~{len(pending) * interval} с.")
+
+        found = updated = 0
+        try:
+            for index, (address, ids) in enumerate(pending, start=1):
+                entry = cached.get(address)
+                latitude, longitude = geocode_address(
+                    address, refresh=entry is not None and not entry.found
+                )
+                if latitude is not None and longitude is not None:
+                    found += 1
+                    # Кожна адреса фіксується одразу - перерваний запуск не втрачає роботу.
+                    updated += Property.objects.filter(id__in=ids).update(
+                        latitude=latitude, longitude=longitude
+                    )
+                if index % 25 == 0:
+                    self.stdout.write(f"  {index}/{len(pending)}...")
+        except KeyboardInterrupt:
+            self.stdout.write(
+                self.style.WARNING("Перервано; наступний запуск продовжить.")
+            )
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Знайдено адрес: {found}, оновлено об'єктів: {updated}."
+            )
+        )
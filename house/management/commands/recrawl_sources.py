@@ -0,0 +1,70 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from house.models import Task
+from house.services.recrawl import due_properties, recrawl
+from house.services.tasks import enqueue, queue_enabled
+
+
+class Command(BaseCommand):
+    help = (
+        "Повторно перевіряє сторінки, з яких імпортовано об'єкти. Запити умовні "
+        "(ETag / Last-Modified), незмінені сторінки не розбираються, змінені "
+        "оновлюють лише відмінні поля."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--limit",
+            type=int,
+            default=None,
+            help="Максимум сторінок за запуск (типово RECRAWL_BUDGET).",
+        )
+        parser.add_argument(
+            "--max-age",
+            type=int,
+            default=None,
+            help="Перевіряти об'єкти, не перевірені стільки годин "
+            "(типово RECRAWL_MAX_AGE_HOURS).",
+        )
+        parser.add_argument(
+            "--dry-run", action="store_true", help="Лише показати, що буде зроблено."
+        )
+        parser.add_argument(
+            "--schedule",
+            action="store_true",
+            help="Поставити періодичний обхід у чергу задач замість запуску зараз.",
+        )
+
+    def handle(self, *args, **options):
+        if options["schedule"]:
+            if not queue_enabled():
+                # Без черги enqueue одразу запустив би обхід, нічого не запланувавши.
+                raise CommandError(
+                    "--schedule потребує TASK_QUEUE_ENABLED=1 і запущеного run_worker."
+                )
+            if Task.objects.filter(
+                name="property.recrawl",
+                status__in=[Task.STATUS_QUEUED, Task.STATUS_RUNNING],
+            ).exists():
+                # Другий ланцюжок перезапусків подвоїв би бюджет обходу.
+                self.stdout.write("Періодичний обхід уже в черзі.")
+                return
+            enqueue("property.recrawl", {"schedule": True})
+            self.stdout.write(
+                self.style.SUCCESS("Періодичний обхід поставлено в чергу.")
+            )
+            return
+
+        due = list(due_properties(options["limit"], options["max_age"]))
+        self.stdout.write(f"До перевірки: {len(due)} об'єктів.")
+        if options["dry_run"] or not due:
+            return
+
+        counts = recrawl(due)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Без змін (304): {counts['not_modified']}, "
+                f"той самий вміст: {counts['unchanged']}, "
+                f"оновлено: {counts['updated']}, помилок: {counts['failed']}."
+            )
+        )
@@ -0,0 +1,128 @@
+import multiprocessing
+import signal
+import time
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connection
+
+# Моделі тут не імпортуються на рівні модуля: при spawn дочірній процес
+# імпортує цей модуль ще до django.setup() в _init_process.
+
+
+def _init_process():
+    import django
+
+    django.setup()
+
+
+def _execute(task_id):
+    from house.services.tasks import run_task
+
+    close_old_connections()
+    try:
+        run_task(task_id)
+    finally:
+        connection.close()
+
+
+class Command(BaseCommand):
+    help = "Виконує задачі з черги в базі даних (TASK_QUEUE_ENABLED)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=getattr(settings, "TASK_WORKER_CONCURRENCY", 4),
+            help="Скільки задач виконувати одночасно.",
+        )
+        parser.add_argument(
+            "--pool",
+            choices=["thread", "process"],
+            default="thread",
+            help="thread - для мережевих задач, process - для CPU (обробка фото).",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=getattr(settings, "TASK_WORKER_POLL_INTERVAL", 2),
+            help="Пауза між опитуваннями порожньої черги, с.",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Виконати все, що готове зараз, і завершитись.",
+        )
+
+    def handle(self, *args, **options):
+        from house.services.tasks import claim_tasks, default_worker_id, heartbeat
+
+        concurrency = max(options["concurrency"], 1)
+        worker_id = default_worker_id()
+        self._stopping = False
+        signal.signal(signal.SIGTERM, self._stop)
+        signal.signal(signal.SIGINT, self._stop)
+
+        if options["pool"] == "process":
+            # spawn: дочірні процеси не успадковують відкриті з'єднання з БД.
+            executor = ProcessPoolExecutor(
+                max_workers=concurrency,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_process,
+            )
+        else:
+            executor = ThreadPoolExecutor(
+                max_workers=concurrency, thread_name_prefix="dominium-task"
+            )
+
+        self.stdout.write(
+            f"Воркер {worker_id}: {options['pool']} x {concurrency}, "
+            f"інтервал {options['poll_interval']} с."
+        )
+        running = set()
+        completed = 0
+        # Довгі задачі не мають вважатися завислими (TASK_LOCK_TIMEOUT).
+        heartbeat_every = getattr(settings, "TASK_LOCK_TIMEOUT", 900) / 3
+        last_heartbeat = time.monotonic()
+        try:
+            while not self._stopping:
+                if running and time.monotonic() - last_heartbeat >= heartbeat_every:
+                    heartbeat(worker_id)
+                    last_heartbeat = time.monotonic()
+                free = concurrency - len(running)
+                task_ids = claim_tasks(free, worker_id) if free else []
+                connection.close()
+                running.update(
+                    executor.submit(_execute, task_id) for task_id in task_ids
+                )
+
+                if not running:
+                    if options["once"]:
+                        break
+                    time.sleep(options["poll_interval"])
+                    continue
+
+                done, running = wait(
+                    running,
+                    timeout=options["poll_interval"],
+                    return_when=FIRST_COMPLETED,
+                )
+                for future in done:
+                    exc = future.exception()
+                    if exc is not None:
+                        self.stderr.write(f"Помилка виконання задачі: {exc}")
+                completed += len(done)
+        finally:
+            executor.shutdown(wait=True)
+
+        self.stdout.write(self.style.SUCCESS(f"Виконано задач: {completed}."))
+
+    def _stop(self, signum, frame):
+        self.stdout.write("Зупинка після завершення поточних задач...")
+        self._stopping = True
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-19 07:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("house", "0009_geocodecache"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="propertyimage",
+            name="variants",
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
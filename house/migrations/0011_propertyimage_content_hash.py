@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-19 07:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("house", "0010_propertyimage_variants"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="propertyimage",
+            name="content_hash",
+            field=models.CharField(blank=True, db_index=True, max_length=64),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.8 on 2026-10-19 07:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("house", "0011_propertyimage_content_hash"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="property",
+            name="source_fingerprint",
+            field=models.CharField(blank=True, max_length=64),
+        ),
+        migrations.AddField(
+            model_name="property",
+            name="source_url",
+            field=models.URLField(blank=True, db_index=True, max_length=500),
+        ),
+        migrations.AddField(
+            model_name="propertyimage",
+            name="source_url",
+            field=models.URLField(blank=True, max_length=500),
+        ),
+    ]
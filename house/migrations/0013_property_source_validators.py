@@ -0,0 +1,33 @@
+# Generated by Django 5.2.8 on 2026-10-19 07:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("house", "0012_property_source_url"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="property",
+            name="source_checked_at",
+            field=models.DateTimeField(blank=True, db_index=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="property",
+            name="source_content_hash",
+            field=models.CharField(blank=True, max_length=64),
+        ),
+        migrations.AddField(
+            model_name="property",
+            name="source_etag",
+            field=models.CharField(blank=True, max_length=255),
+        ),
+        migrations.AddField(
+            model_name="property",
+            name="source_last_modified",
+            field=models.CharField(blank=True, max_length=64),
+        ),
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 5.2.8 on 2026-10-19 07:39
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("house", "0013_property_source_validators"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PropertySignature",
+            fields=[
+                (
+                    "property",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="signature",
+                        serialize=False,
+                        to="house.property",
+                    ),
+                ),
+                ("text_hash", models.CharField(max_length=64)),
+                ("minhash", models.JSONField(default=list)),
+            ],
+        ),
+        migrations.CreateModel(
+            name="PropertyLSHBucket",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("bucket", models.CharField(db_index=True, max_length=16)),
+                (
+                    "property",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="lsh_buckets",
+                        to="house.property",
+                    ),
+                ),
+            ],
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.8 on 2026-10-19 07:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("house", "0014_property_signature"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="propertyimage",
+            name="dominant_color",
+            field=models.CharField(blank=True, max_length=7),
+        ),
+        migrations.AddField(
+            model_name="propertyimage",
+            name="placeholder",
+            field=models.TextField(blank=True),
+        ),
+    ]
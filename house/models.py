@@ -1,16 +1,12 @@
 import json
-import os
 import random
 import uuid
-from io import BytesIO
 
-from django.core.files.base import ContentFile
-from django.db import models
+from django.db import models, transaction
 from django.urls import reverse
+from django.utils import timezone
 from django.utils.safestring import mark_safe
 from django.utils.text import slugify
-from geopy.geocoders import Nominatim
-from PIL import Image
 
 
 class PropertyType(models.Model):
@@ -48,6 +44,12 @@ class Feature(models.Model):
         return self.name
 
 
+def _enqueue(name: str, payload: dict) -> None:
+    from house.services.tasks import enqueue  # циклічний імпорт із house.services
+
+    enqueue(name, payload)
+
+
 class Property(models.Model):
     title = models.CharField(max_length=255)
     description = models.TextField(blank=True, max_length=4569)
@@ -74,6 +76,17 @@ class Property(models.Model):
 
     slug = models.SlugField(unique=True, blank=True)
 
+    # Сторінка, з якої імпортовано об'єкт, і відбиток розібраних полів:
+    # повторний імпорт без змін нічого не робить, зі змінами - оновлює лише їх.
+    source_url = models.URLField(max_length=500, blank=True, db_index=True)
+    source_fingerprint = models.CharField(max_length=64, blank=True)
+    # Валідатори сторінки для умовних запитів під час повторного обходу
+    # (house/services/recrawl.py) і SHA-256 тіла останньої відповіді.
+    source_etag = models.CharField(max_length=255, blank=True)
+    source_last_modified = models.CharField(max_length=64, blank=True)
+    source_content_hash = models.CharField(max_length=64, blank=True)
+    source_checked_at = models.DateTimeField(null=True, blank=True, db_index=True)
+
     def get_absolute_url(self):
         return reverse("property_detail", kwargs={"slug": self.slug})
 
@@ -112,11 +125,14 @@ class Property(models.Model):
         original_lat = None
         original_lon = None
         address_changed = creating
+        text_changed = True
 
         if not creating and self.pk:
             try:
                 original = (
-                    self.__class__.objects.only("address", "latitude", "longitude")
+                    self.__class__.objects.only(
+                        "address", "description", "latitude", "longitude"
+                    )
                     .filter(pk=self.pk)
                     .first()
                 )
@@ -125,6 +141,9 @@ class Property(models.Model):
 
             if original:
                 address_changed = (original.address or "") != (self.address or "")
+                text_changed = address_changed or (original.description or "") != (
+                    self.description or ""
+                )
                 original_lat = original.latitude
                 original_lon = original.longitude
 
@@ -147,15 +166,8 @@ class Property(models.Model):
                     coords_missing and (original_lat is None or original_lon is None)
                 )
 
-        if should_geocode:
-            try:
-                geolocator = Nominatim(user_agent="dominium", timeout=10)
-                location = geolocator.geocode(self.address)
-                if location:
-                    self.latitude = location.latitude
-                    self.longitude = location.longitude
-            except Exception as e:
-                print("⚠️ Geocode error:", e)
+        # Мережевий запит не робимо під час збереження: лише кеш, решта - після коміту.
+        geocode_later = should_geocode and not self.fetch_coordinates(cached_only=True)
 
         # Генеруємо slug, якщо він ще не встановлений
         if not self.slug:
@@ -176,6 +188,31 @@ class Property(models.Model):
         # Фінальне збереження
         super().save(*args, **kwargs)
 
+        if geocode_later:
+            property_id = self.pk
+            transaction.on_commit(
+                lambda: _enqueue("property.geocode", {"property_id": property_id})
+            )
+        if text_changed:
+            # Підпис для пошуку дублікатів оновлюється лише за зміни тексту.
+            property_id = self.pk
+            transaction.on_commit(
+                lambda: _enqueue("property.signature", {"property_ids": [property_id]})
+            )
+
+    def fetch_coordinates(self, *, cached_only: bool = False) -> bool:
+        """Заповнює latitude/longitude за адресою. Повертає True, якщо знайдено."""
+        from house.services.geocoding import geocode_address
+
+        latitude, longitude = geocode_address(
+            self.address, user_agent="dominium", cached_only=cached_only
+        )
+        if latitude is None or longitude is None:
+            return False
+        self.latitude = latitude
+        self.longitude = longitude
+        return True
+
     @property
     def images_json(self):
         """Список URL всіх зображень (використовують JS-галереї)."""
@@ -245,6 +282,15 @@ class PropertyImage(models.Model):
     image = models.ImageField(upload_to="property_images/")
     is_main = models.BooleanField(default=False)
     sort_order = models.PositiveIntegerField(default=0)
+    # {"thumb": {"width": 320, "height": 240, "webp": "...", "avif": "..."}, ...}
+    variants = models.JSONField(default=dict, blank=True)
+    # SHA-256 завантаженого файлу: однаковий вміст зберігається один раз.
+    content_hash = models.CharField(max_length=64, blank=True, db_index=True)
+    # Показується, поки вантажиться фото: крихітний WebP (data URI) і основний колір.
+    placeholder = models.TextField(blank=True)
+    dominant_color = models.CharField(max_length=7, blank=True)
+    # URL, з якого фото завантажено під час імпорту (порожній - завантажене вручну).
+    source_url = models.URLField(max_length=500, blank=True)
 
     class Meta:
         ordering = ["sort_order", "-id"]
@@ -263,35 +309,171 @@ class PropertyImage(models.Model):
             )
             self.sort_order = (max_order or 0) + 1
 
-        if self.image and not self.image.name.endswith(".webp"):
-            original_path = self.image.path
-            # 2. конвертуємо, але формуємо ім’я зі «шляхом» через upload_to
-            filename = os.path.basename(self.image.name)  # це «ім’я.розширення»
-            self.image = self.convert_to_webp(self.image, filename)
+        shared = False
+        if self.image and not self.image._committed:
+            shared = self._reuse_stored_file()
 
-            if os.path.exists(original_path):
-                try:
-                    os.remove(original_path)
-                except Exception as e:
-                    print(f"⚠️ Помилка при видаленні {original_path}: {e}")
+        if self.variants and self.image.name not in {
+            variant.get("webp") for variant in self.variants.values()
+        }:
+            self.variants = {}  # файл замінили - варіанти застаріли
+            self.placeholder = self.dominant_color = ""
+        # Спільний файл обробляє задача запису, який його зберіг першим.
+        needs_processing = bool(self.image) and not self.variants and not shared
 
         super().save(*args, **kwargs)
 
-    def convert_to_webp(self, image_field, filename):
-        img = Image.open(image_field)
+        if needs_processing:
+            # WebP і варіанти розмірів готуються поза запитом (images.process).
+            image_id = self.pk
+            transaction.on_commit(
+                lambda: _enqueue("images.process", {"image_id": image_id})
+            )
+
+    def _reuse_stored_file(self) -> bool:
+        """Якщо такий самий вміст уже збережено, посилається на наявний файл."""
+        from house.services.images import content_hash
+
+        self.content_hash = content_hash(self.image)
+        twin = (
+            PropertyImage.objects.filter(content_hash=self.content_hash)
+            .exclude(pk=self.pk)
+            .exclude(image="")
+            .only("image", "variants", "placeholder", "dominant_color")
+            .first()
+        )
+        if twin is None:
+            return False
+        self.image = twin.image.name
+        self.variants = twin.variants
+        self.placeholder = twin.placeholder
+        self.dominant_color = twin.dominant_color
+        return True
+
+
+class BackgroundJob(models.Model):
+    """Довготривала операція (масові дії, імпорт), що виконується поза запитом."""
+
+    STATUS_PENDING = "pending"
+    STATUS_RUNNING = "running"
+    STATUS_COMPLETED = "completed"
+    STATUS_FAILED = "failed"
+    STATUS_CHOICES = [
+        (STATUS_PENDING, "Очікує"),
+        (STATUS_RUNNING, "Виконується"),
+        (STATUS_COMPLETED, "Завершено"),
+        (STATUS_FAILED, "Помилка"),
+    ]
+
+    kind = models.CharField(max_length=50)
+    status = models.CharField(
+        max_length=20, choices=STATUS_CHOICES, default=STATUS_PENDING
+    )
+    payload = models.JSONField(default=dict, blank=True)
+    result = models.JSONField(default=dict, blank=True)
+    error = models.TextField(blank=True)
+    total = models.PositiveIntegerField(default=0)
+    processed = models.PositiveIntegerField(default=0)
+    failed = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        indexes = [models.Index(fields=["status"])]
+
+    def __str__(self):
+        return f"{self.kind} #{self.pk} ({self.status})"
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in {self.STATUS_COMPLETED, self.STATUS_FAILED}
+
+    def advance(self, processed: int = 0, failed: int = 0) -> None:
+        """Атомарно збільшує лічильники прогресу (без гонок між потоками)."""
+        self.__class__.objects.filter(pk=self.pk).update(
+            processed=models.F("processed") + processed,
+            failed=models.F("failed") + failed,
+        )
+        self.processed += processed
+        self.failed += failed
+
+
+class Task(models.Model):
+    """Запис черги фонових задач у базі (див. house/services/tasks.py)."""
+
+    STATUS_QUEUED = "queued"
+    STATUS_RUNNING = "running"
+    STATUS_DONE = "done"
+    STATUS_FAILED = "failed"
+    STATUS_CHOICES = [
+        (STATUS_QUEUED, "У черзі"),
+        (STATUS_RUNNING, "Виконується"),
+        (STATUS_DONE, "Виконано"),
+        (STATUS_FAILED, "Помилка"),
+    ]
+
+    name = models.CharField(max_length=100)
+    payload = models.JSONField(default=dict, blank=True)
+    status = models.CharField(
+        max_length=20, choices=STATUS_CHOICES, default=STATUS_QUEUED
+    )
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=5)
+    run_at = models.DateTimeField(default=timezone.now)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    locked_by = models.CharField(max_length=100, blank=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["run_at", "id"]
+        indexes = [models.Index(fields=["status", "run_at"])]
+
+    def __str__(self):
+        return f"{self.name} #{self.pk} ({self.status})"
+
+
+class GeocodeCache(models.Model):
+    """Результат геокодування за нормалізованою адресою (і для промахів теж)."""
+
+    key = models.CharField(max_length=40, unique=True)
+    address = models.CharField(max_length=512)
+    latitude = models.FloatField(null=True, blank=True)
+    longitude = models.FloatField(null=True, blank=True)
+    found = models.BooleanField(default=False)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
-        max_width = 1280
-        if img.width > max_width:
-            height = int((max_width / img.width) * img.height)
-            img = img.resize((max_width, height), Image.LANCZOS)
+    class Meta:
+        verbose_name = "Кеш геокодування"
+        verbose_name_plural = "Кеш геокодування"
 
-        img = img.convert("RGB")
+    def __str__(self):
+        return self.address
 
-        buffer = BytesIO()
-        img.save(buffer, format="WEBP", quality=70, method=6)
 
-        # filename уже без шляху, наприклад 'aed02f3....webp'
-        webp_name = filename.rsplit(".", 1)[0] + ".webp"
+class PropertySignature(models.Model):
+    """MinHash-підпис адреси й опису об'єкта (див. house/services/duplicates.py)."""
 
-        # повертаємо ContentFile — Django додасть 'property_images/' з upload_to
-        return ContentFile(buffer.getvalue(), name=webp_name)
+    property = models.OneToOneField(
+        Property,
+        primary_key=True,
+        related_name="signature",
+        on_delete=models.CASCADE,
+    )
+    # SHA-256 нормалізованого тексту: незмінений текст не перераховується.
+    text_hash = models.CharField(max_length=64)
+    minhash = models.JSONField(default=list)
+
+
+class PropertyLSHBucket(models.Model):
+    """Кошик LSH: об'єкти з однаковим кошиком хоча б в одній смузі - кандидати."""
+
+    property = models.ForeignKey(
+        Property, related_name="lsh_buckets", on_delete=models.CASCADE
+    )
+    # Хеш смуги підпису разом із її номером, тож кошики різних смуг не збігаються.
+    bucket = models.CharField(max_length=16, db_index=True)
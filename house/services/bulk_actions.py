@@ -0,0 +1,61 @@
+"""Масові дії над об'єктами (архівування, відновлення, видалення) порціями."""
+
+from __future__ import annotations
+
+from typing import Iterable
+
+from django.conf import settings
+from django.db import transaction
+
+from house.models import BackgroundJob, Property, PropertyImage
+from house.services.images import release_image_files
+from house.services.jobs import job_handler
+
+BULK_ACTIONS = {"archive", "restore", "delete"}
+
+
+def _chunks(items: list, size: int) -> Iterable[list]:
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
+
+def _apply_chunk(ids: list[int], action: str) -> int:
+    queryset = Property.objects.filter(id__in=ids)
+    if action == "archive":
+        return queryset.update(is_archived=True)
+    if action == "restore":
+        return queryset.update(is_archived=False)
+
+    with transaction.atomic():
+        images = list(
+            PropertyImage.objects.filter(property_id__in=ids).values_list(
+                "image", "variants"
+            )
+        )
+        deleted = queryset.count()
+        queryset.delete()
+        # Файли прибираємо лише після успішного коміту порції і лише ті,
+        # на які не посилаються фото інших об'єктів.
+        transaction.on_commit(lambda: release_image_files(images))
+    return deleted
+
+
+def apply_bulk_action(
+    ids: list[int], action: str, *, job: BackgroundJob | None = None
+) -> int:
+    """Виконує дію порціями по BULK_ACTION_CHUNK_SIZE; повертає кількість змінених."""
+    chunk_size = getattr(settings, "BULK_ACTION_CHUNK_SIZE", 200)
+    processed = 0
+    for chunk in _chunks(ids, chunk_size):
+        affected = _apply_chunk(chunk, action)
+        processed += affected
+        if job is not None:
+            job.advance(processed=affected, failed=len(chunk) - affected)
+    return processed
+
+
+@job_handler("bulk_action")
+def run_bulk_action_job(job: BackgroundJob) -> dict:
+    payload = job.payload
+    processed = apply_bulk_action(payload["ids"], payload["action"], job=job)
+    return {"action": payload["action"], "processed": processed}
@@ -0,0 +1,240 @@
+"""
+Пакетний імпорт об'єктів.
+
+Об'єкти вставляються через bulk_create порціями, slug-и резервуються пакетно,
+характеристики пишуться одним INSERT у through-таблицю, а геокодування та
+завантаження фото виконуються фоновою задачею після коміту.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import random
+from dataclasses import dataclass, field
+from typing import Iterable, Iterator
+
+from django.conf import settings
+from django.db import transaction
+
+from house.models import BackgroundJob, Property
+from house.services.importer import import_images
+from house.services.jobs import job_handler, start_job
+from house.services.tasks import enqueue
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ImportEntry:
+    """Підготовлений (провалідований, ще не збережений) об'єкт імпорту."""
+
+    instance: Property
+    feature_ids: set[int] = field(default_factory=set)
+    images: dict | None = None
+
+
+def images_payload(data: dict) -> dict | None:
+    """Фото з розібраної сторінки у форматі ImportEntry.images (None - фото немає)."""
+    if not (data.get("main_image") or data.get("gallery")):
+        return None
+    return {"main_image": data.get("main_image"), "gallery": data.get("gallery") or []}
+
+
+@dataclass
+class StreamRow:
+    """Рядок NDJSON: розібраний об'єкт або помилка розбору."""
+
+    line: int
+    item: dict | None = None
+    error: str = ""
+
+
+def _read_lines(stream, max_bytes: int) -> Iterator[tuple[int, bytes | None]]:
+    """Рядки потоку по одному; None замість рядка, довшого за max_bytes."""
+    number = 0
+    while True:
+        raw = stream.readline(max_bytes + 1)
+        if not raw:
+            return
+        number += 1
+        if len(raw) > max_bytes and not raw.endswith(b"\n"):
+            # Решту задовгого рядка пропускаємо, не тримаючи її в пам'яті.
+            while raw and not raw.endswith(b"\n"):
+                raw = stream.readline(max_bytes)
+            yield number, None
+        else:
+            yield number, raw
+
+
+def iter_ndjson(
+    stream, *, chunk_size: int | None = None, max_line_bytes: int | None = None
+) -> Iterator[list[StreamRow]]:
+    """
+    Читає NDJSON (один JSON-об'єкт на рядок) з потоку порціями по chunk_size.
+
+    У пам'яті одночасно лише поточна порція, тож розмір файлу не обмежений.
+    Порожні рядки пропускаються, номери рядків рахуються від 1.
+    """
+    chunk_size = chunk_size or getattr(settings, "PROPERTY_IMPORT_CHUNK_SIZE", 500)
+    max_line_bytes = max_line_bytes or getattr(
+        settings, "PROPERTY_IMPORT_MAX_LINE_BYTES", 1024 * 1024
+    )
+    chunk = []
+    for number, raw in _read_lines(stream, max_line_bytes):
+        if raw is None:
+            chunk.append(StreamRow(number, error="Рядок задовгий."))
+        elif raw.strip():
+            try:
+                item = json.loads(raw)
+            except (json.JSONDecodeError, UnicodeDecodeError):
+                chunk.append(StreamRow(number, error="Некоректний JSON."))
+            else:
+                if isinstance(item, dict):
+                    chunk.append(StreamRow(number, item=item))
+                else:
+                    chunk.append(
+                        StreamRow(number, error="Елемент має бути JSON-об'єктом.")
+                    )
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _chunks(items: list, size: int) -> Iterable[list]:
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
+
+def _base_slug(instance: Property) -> str:
+    generators = [
+        instance.generate_semantic_slug,
+        instance.generate_data_driven_slug,
+        instance.generate_branded_slug,
+    ]
+    return random.choice(generators)()
+
+
+def allocate_slugs(instances: list[Property]) -> None:
+    """Призначає унікальні slug-и всім об'єктам без slug за кілька запитів."""
+    pending = {}
+    for instance in instances:
+        if not instance.slug:
+            pending[id(instance)] = [instance, _base_slug(instance), 0]
+
+    reserved = {instance.slug for instance in instances if instance.slug}
+    while pending:
+        candidates = {}
+        for key, (instance, base, attempt) in pending.items():
+            candidate = base if attempt == 0 else f"{base}-{attempt}"
+            candidates[key] = candidate
+
+        taken = set(
+            Property.objects.filter(slug__in=candidates.values()).values_list(
+                "slug", flat=True
+            )
+        )
+        for key, candidate in candidates.items():
+            if candidate in taken or candidate in reserved:
+                pending[key][2] += 1
+                continue
+            instance = pending.pop(key)[0]
+            instance.slug = candidate
+            reserved.add(candidate)
+
+
+def bulk_import_properties(entries: list[ImportEntry]) -> list[Property]:
+    """
+    Зберігає підготовлені об'єкти пакетно та планує побічні дії після коміту.
+
+    Повертає створені об'єкти з pk.
+    """
+    if not entries:
+        return []
+
+    instances = [entry.instance for entry in entries]
+    chunk_size = getattr(settings, "PROPERTY_IMPORT_CHUNK_SIZE", 500)
+    through = Property.features.through
+
+    with transaction.atomic():
+        allocate_slugs(instances)
+        for chunk in _chunks(instances, chunk_size):
+            Property.objects.bulk_create(chunk)
+
+        links = [
+            through(property_id=entry.instance.pk, feature_id=feature_id)
+            for entry in entries
+            for feature_id in entry.feature_ids
+        ]
+        if links:
+            through.objects.bulk_create(links, batch_size=chunk_size)
+
+        schedule_followup(entries)
+        # bulk_create обходить Property.save, тож підписи дублікатів - окремою задачею.
+        ids = [instance.pk for instance in instances]
+        transaction.on_commit(
+            lambda: enqueue("property.signature", {"property_ids": ids})
+        )
+
+    return instances
+
+
+def schedule_followup(
+    entries: list[ImportEntry], *, geocode: bool = True
+) -> BackgroundJob | None:
+    """Ставить у фон геокодування та завантаження фото для нових об'єктів."""
+    geocode_ids = [
+        entry.instance.pk
+        for entry in entries
+        if geocode
+        and entry.instance.address
+        and (entry.instance.latitude is None or entry.instance.longitude is None)
+    ]
+    images = {str(entry.instance.pk): entry.images for entry in entries if entry.images}
+    if not geocode_ids and not images:
+        return None
+    return start_job(
+        "import_followup",
+        {"geocode_ids": geocode_ids, "images": images},
+        total=len(geocode_ids) + len(images),
+    )
+
+
+def geocode_properties(properties: Iterable[Property]) -> int:
+    """Геокодує об'єкти по одному й зберігає лише координати."""
+    found = 0
+    for property_obj in properties:
+        if property_obj.address and property_obj.fetch_coordinates():
+            Property.objects.filter(pk=property_obj.pk).update(
+                latitude=property_obj.latitude, longitude=property_obj.longitude
+            )
+            found += 1
+    return found
+
+
+@job_handler("import_followup")
+def run_import_followup_job(job: BackgroundJob) -> dict:
+    payload = job.payload
+    timeout = getattr(settings, "REQUESTS_TIMEOUT", 10)
+
+    geocoded = 0
+    for property_obj in Property.objects.filter(pk__in=payload.get("geocode_ids", [])):
+        ok = geocode_properties([property_obj]) == 1
+        geocoded += ok
+        job.advance(processed=int(ok), failed=int(not ok))
+
+    warnings = []
+    images = payload.get("images") or {}
+    properties = Property.objects.in_bulk([int(pk) for pk in images])
+    for pk, data in images.items():
+        property_obj = properties.get(int(pk))
+        if property_obj is None:
+            job.advance(failed=1)
+            continue
+        item_warnings = import_images(property_obj, data, timeout=timeout)
+        warnings.extend(item_warnings)
+        job.advance(processed=int(not item_warnings), failed=int(bool(item_warnings)))
+
+    return {"geocoded": geocoded, "warnings": warnings}
@@ -0,0 +1,213 @@
+"""
+Пошук схожих оголошень (можливих дублікатів) через MinHash і LSH.
+
+Нормалізований текст адреси й опису розбивається на шинґли з трьох слів;
+MinHash-підпис із NUM_PERM значень оцінює схожість Жаккара між двома
+текстами. Підпис ділиться на BANDS смуг по ROWS значень, і кожна смуга
+записується як кошик у PropertyLSHBucket: кандидати - лише об'єкти, що
+поділяють з текстом хоча б один кошик (пошук за індексом, без порівняння з
+усім каталогом). Кандидати відсіюються за оцінкою схожості підписів.
+
+32 смуги по 4 рядки знаходять пару зі схожістю 0.5 з імовірністю ~87%,
+а 0.7 - практично завжди.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import random
+import re
+from dataclasses import dataclass
+from typing import Iterable
+
+from django.conf import settings
+from django.db import transaction
+from django.utils.html import strip_tags
+
+from house.models import Property, PropertyLSHBucket, PropertySignature
+
+NUM_PERM = 128
+BANDS = 32
+ROWS = NUM_PERM // BANDS
+SHINGLE_SIZE = 3
+
+_PRIME = (1 << 61) - 1
+_rng = random.Random(20240501)  # фіксоване зерно: підписи стабільні між запусками
+_PERMUTATIONS = tuple(
+    (_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME)) for _ in range(NUM_PERM)
+)
+_WORD_RE = re.compile(r"\w+")
+
+
+@dataclass
+class Duplicate:
+    property_id: int
+    similarity: float
+
+
+def normalize_text(address: str, description: str) -> str:
+    text = f"{address or ''} {strip_tags(description or '')}".lower()
+    return " ".join(_WORD_RE.findall(text))
+
+
+def _shingles(text: str) -> set[str]:
+    words = text.split()
+    if len(words) < SHINGLE_SIZE:
+        return {text} if text else set()
+    return {
+        " ".join(words[index : index + SHINGLE_SIZE])
+        for index in range(len(words) - SHINGLE_SIZE + 1)
+    }
+
+
+def _hash64(value: str) -> int:
+    return int.from_bytes(
+        hashlib.blake2b(value.encode("utf-8"), digest_size=8).digest(), "big"
+    )
+
+
+def minhash(text: str) -> list[int]:
+    """MinHash-підпис тексту (порожній список для порожнього тексту)."""
+    hashes = [_hash64(shingle) for shingle in _shingles(text)]
+    if not hashes:
+        return []
+    return [min((a * h + b) % _PRIME for h in hashes) for a, b in _PERMUTATIONS]
+
+
+def lsh_buckets(signature: list[int]) -> list[str]:
+    buckets = []
+    for band in range(BANDS):
+        rows = signature[band * ROWS : (band + 1) * ROWS]
+        key = f"{band}:" + ",".join(map(str, rows))
+        buckets.append(hashlib.blake2b(key.encode(), digest_size=8).hexdigest())
+    return buckets
+
+
+def similarity(first: list[int], second: list[int]) -> float:
+    """Оцінка схожості Жаккара за двома підписами."""
+    if not first or len(first) != len(second):
+        return 0.0
+    return sum(a == b for a, b in zip(first, second)) / len(first)
+
+
+def _threshold() -> float:
+    return getattr(settings, "DUPLICATE_SIMILARITY", 60) / 100
+
+
+def index_properties(properties: Iterable[Property]) -> int:
+    """Оновлює підписи й кошики об'єктів, текст яких змінився; повертає їх кількість."""
+    properties = list(properties)
+    stored = PropertySignature.objects.in_bulk([p.pk for p in properties])
+    signatures, buckets = [], []
+    for property_obj in properties:
+        text = normalize_text(property_obj.address, property_obj.description)
+        text_hash = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        current = stored.get(property_obj.pk)
+        if current is not None and current.text_hash == text_hash:
+            continue
+        signature = minhash(text)
+        signatures.append(
+            PropertySignature(
+                property_id=property_obj.pk, text_hash=text_hash, minhash=signature
+            )
+        )
+        if signature:
+            buckets.extend(
+                PropertyLSHBucket(property_id=property_obj.pk, bucket=bucket)
+                for bucket in lsh_buckets(signature)
+            )
+    if not signatures:
+        return 0
+
+    changed_ids = [signature.property_id for signature in signatures]
+    with transaction.atomic():
+        PropertyLSHBucket.objects.filter(property_id__in=changed_ids).delete()
+        PropertySignature.objects.filter(property_id__in=changed_ids).delete()
+        PropertySignature.objects.bulk_create(signatures)
+        PropertyLSHBucket.objects.bulk_create(buckets, batch_size=1000)
+    return len(signatures)
+
+
+def find_similar(
+    signatures: list[list[int]],
+    *,
+    exclude: Iterable[int] = (),
+    threshold: float | None = None,
+    limit: int = 10,
+) -> list[list[Duplicate]]:
+    """
+    Схожі об'єкти для кожного підпису (за спаданням схожості).
+
+    Один запит кандидатів за кошиками для всіх підписів і один - їхніх підписів.
+    """
+    threshold = _threshold() if threshold is None else threshold
+    exclude = set(exclude)
+    bands = [lsh_buckets(signature) if signature else [] for signature in signatures]
+    all_buckets = {bucket for buckets in bands for bucket in buckets}
+    if not all_buckets:
+        return [[] for _ in signatures]
+
+    by_bucket: dict[str, set[int]] = {}
+    for bucket, property_id in PropertyLSHBucket.objects.filter(
+        bucket__in=all_buckets, property__is_archived=False
+    ).values_list("bucket", "property_id"):
+        if property_id not in exclude:
+            by_bucket.setdefault(bucket, set()).add(property_id)
+    candidates = set().union(*by_bucket.values()) if by_bucket else set()
+    stored = dict(
+        PropertySignature.objects.filter(property_id__in=candidates).values_list(
+            "property_id", "minhash"
+        )
+    )
+
+    results = []
+    for signature, buckets in zip(signatures, bands):
+        ids = set().union(*(by_bucket.get(bucket, ()) for bucket in buckets))
+        matches = [
+            Duplicate(property_id, similarity(signature, stored.get(property_id, [])))
+            for property_id in ids
+        ]
+        matches = [match for match in matches if match.similarity >= threshold]
+        matches.sort(key=lambda match: (-match.similarity, match.property_id))
+        results.append(matches[:limit])
+    return results
+
+
+def possible_duplicates(property_obj: Property, *, limit: int = 10) -> list[Duplicate]:
+    """Схожі на ``property_obj`` об'єкти за збереженим (або свіжим) підписом."""
+    stored = PropertySignature.objects.filter(property=property_obj).first()
+    signature = (
+        stored.minhash
+        if stored is not None
+        else minhash(normalize_text(property_obj.address, property_obj.description))
+    )
+    return find_similar([signature], exclude=[property_obj.pk], limit=limit)[0]
+
+
+def duplicates_for_parsed(parsed: list[dict], *, exclude: Iterable[int] = ()):
+    """Можливі дублікати для розібраних сторінок (перевірка під час імпорту)."""
+    signatures = [
+        minhash(normalize_text(data.get("address") or "", data.get("description_html")))
+        for data in parsed
+    ]
+    return find_similar(signatures, exclude=exclude, limit=3)
+
+
+def duplicate_warnings(matches: list[Duplicate]) -> list[str]:
+    if not matches:
+        return []
+    titles = dict(
+        Property.objects.filter(
+            pk__in=[match.property_id for match in matches]
+        ).values_list("pk", "title")
+    )
+    return [
+        f"Можливий дублікат об'єкта #{match.property_id} «{titles.get(match.property_id, '')}» "
+        f"(схожість {match.similarity:.0%})"
+        for match in matches
+    ]
+
+
+def parsed_duplicate_warnings(parsed: dict) -> list[str]:
+    """Попередження про схожі об'єкти для однієї розібраної сторінки."""
+    return duplicate_warnings(duplicates_for_parsed([parsed])[0])
@@ -0,0 +1,171 @@
+"""
+Геокодування адрес через Nominatim зі сталим кешем у БД (GeocodeCache).
+
+Кеш спільний для моделі Property і HTML-парсера; ключ - нормалізована адреса
+(окремо кешуються й усі варіанти з ``address_variants``). Запити до Nominatim
+обмежуються GEOCODE_MIN_INTERVAL секунд між викликами в межах процесу.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import re
+import threading
+import time
+from typing import Optional, Tuple
+
+from django.conf import settings
+
+from house.models import GeocodeCache
+
+logger = logging.getLogger(__name__)
+
+Coordinates = Tuple[Optional[float], Optional[float]]
+
+_GEOCODERS: dict[str, object] = {}
+_THROTTLE_LOCK = threading.Lock()
+_last_request_at = 0.0
+
+
+def normalize_address(address: str) -> str:
+    text = re.sub(r"\s+", " ", address or "").strip().lower()
+    text = re.sub(r"\s*,\s*", ", ", text)
+    return text.strip(" ,.;")
+
+
+def address_key(address: str) -> str:
+    return hashlib.sha1(normalize_address(address).encode("utf-8")).hexdigest()
+
+
+def address_variants(address: str) -> list[str]:
+    variants: list[str] = []
+    parts = [part.strip() for part in address.split(",") if part.strip()]
+
+    def add(candidate: str):
+        candidate = candidate.strip(", ")
+        if not candidate:
+            return
+        if candidate not in variants:
+            variants.append(candidate)
+        if "україн" not in candidate.lower():
+            with_country = f"{candidate}, Україна"
+            if with_country not in variants:
+                variants.append(with_country)
+
+    add(", ".join(parts) if parts else address)
+
+    no_district = [part for part in parts if "район" not in part.lower()]
+    if no_district and no_district != parts:
+        add(", ".join(no_district))
+
+    for idx, part in enumerate(parts):
+        if "район" in part.lower() and idx + 1 < len(parts):
+            add(", ".join(parts[idx + 1 :]))
+
+    return variants or [address]
+
+
+def _get_geolocator(user_agent: str):
+    geolocator = _GEOCODERS.get(user_agent)
+    if geolocator:
+        return geolocator
+    try:
+        from geopy.geocoders import Nominatim  # type: ignore
+    except ImportError as exc:
+        raise RuntimeError("geopy не встановлено, геокодування неможливе.") from exc
+    geolocator = Nominatim(user_agent=user_agent, timeout=10)
+    _GEOCODERS[user_agent] = geolocator
+    return geolocator
+
+
+def _throttle() -> None:
+    """Не частіше одного запиту на GEOCODE_MIN_INTERVAL (політика Nominatim)."""
+    global _last_request_at
+    interval = getattr(settings, "GEOCODE_MIN_INTERVAL", 1)
+    with _THROTTLE_LOCK:
+        wait = _last_request_at + interval - time.monotonic()
+        if wait > 0:
+            time.sleep(wait)
+        _last_request_at = time.monotonic()
+
+
+def _store(address: str, coordinates: Coordinates) -> None:
+    latitude, longitude = coordinates
+    GeocodeCache.objects.update_or_create(
+        key=address_key(address),
+        defaults={
+            "address": normalize_address(address)[:512],
+            "latitude": latitude,
+            "longitude": longitude,
+            "found": latitude is not None and longitude is not None,
+        },
+    )
+
+
+def cached_lookup(addresses: list[str]) -> dict[str, GeocodeCache]:
+    """Записи кешу для переданих адрес одним запитом: {адреса: запис}."""
+    keys = {address_key(address): address for address in addresses}
+    entries = GeocodeCache.objects.filter(key__in=keys)
+    return {keys[entry.key]: entry for entry in entries}
+
+
+def geocode_address(
+    address: str,
+    *,
+    user_agent: str = "dominium",
+    cached_only: bool = False,
+    refresh: bool = False,
+) -> Coordinates:
+    """
+    Повертає (latitude, longitude) або (None, None).
+
+    Спершу дивиться в кеш (сама адреса та її варіанти), потім по черзі
+    запитує варіанти в Nominatim. Знайдені й не знайдені результати
+    зберігаються; мережеві помилки - ні, щоб адресу можна було повторити.
+    """
+    if not address or not address.strip():
+        return None, None
+
+    variants = address_variants(address)
+    cached = {} if refresh else cached_lookup([address, *variants])
+    entry = cached.get(address)
+    if entry is not None:
+        return (entry.latitude, entry.longitude) if entry.found else (None, None)
+    for candidate in variants:
+        entry = cached.get(candidate)
+        if entry is not None and entry.found:
+            _store(address, (entry.latitude, entry.longitude))
+            return entry.latitude, entry.longitude
+    if cached_only:
+        return None, None
+
+    try:
+        geolocator = _get_geolocator(user_agent)
+    except Exception as exc:  # geopy might be missing or misconfigured
+        logger.warning("Geocoder недоступний: %s", exc)
+        return None, None
+
+    transient_error = False
+    for candidate in variants:
+        if candidate in cached:
+            continue  # відомий промах
+        _throttle()
+        try:
+            location = geolocator.geocode(candidate)
+        except Exception as exc:
+            logger.warning("Не вдалося геокодувати адресу '%s': %s", candidate, exc)
+            transient_error = True
+            continue
+        coordinates = (
+            (location.latitude, location.longitude) if location else (None, None)
+        )
+        _store(candidate, coordinates)
+        if location:
+            _store(address, coordinates)
+            return coordinates
+
+    logger.info("Геокодер не знайшов координати для '%s'", address)
+    if not transient_error:
+        _store(address, (None, None))
+    return None, None
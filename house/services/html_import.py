@@ -0,0 +1,218 @@
+"""
+Імпорт об'єктів із кількох HTML-файлів.
+
+Розбір HTML (CPU) розкладається на пул процесів, а запис у БД виконується
+одним пакетом через bulk_import_properties. Великі пакети виконуються
+фоновою задачею з прогресом по файлах.
+"""
+
+from __future__ import annotations
+
+import logging
+import multiprocessing
+import uuid
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Callable
+
+import django
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.utils.html import strip_tags
+
+from house.models import BackgroundJob, DealType, Property, PropertyType
+from house.services.bulk_import import (
+    ImportEntry,
+    bulk_import_properties,
+    images_payload,
+)
+from house.services.duplicates import duplicate_warnings, duplicates_for_parsed
+from house.services.importer import parsed_fingerprint
+from house.services.jobs import job_handler, start_job
+from house.utils.currency import get_exchange_rates
+from house.utils.html_parser import parse_property_html
+
+logger = logging.getLogger(__name__)
+
+UPLOAD_DIR = "imports/html"
+
+
+def parse_file(name: str, raw: bytes, rates: dict) -> dict:
+    """Розбирає один файл; виконується й у дочірньому процесі, тож без БД."""
+    try:
+        html = raw.decode("utf-8")
+    except UnicodeDecodeError:
+        return {"file": name, "error": "Не вдалося прочитати файл у кодуванні UTF-8."}
+
+    try:
+        data = parse_property_html(html, source=name, rates=rates).as_dict()
+    except Exception as exc:
+        logger.exception("Помилка парсингу файлу %s: %s", name, exc)
+        return {"file": name, "error": f"Не вдалося розібрати HTML: {exc}"}
+
+    errors = {}
+    if not data.get("title"):
+        errors["title"] = "Не вдалося визначити назву."
+    if not data.get("address"):
+        errors["address"] = "Не вдалося визначити адресу."
+    if errors:
+        return {"file": name, "errors": errors}
+    return {"file": name, "data": data}
+
+
+def parse_files(
+    files: list[tuple[str, bytes]],
+    *,
+    rates: dict | None = None,
+    on_result: Callable[[dict], None] | None = None,
+) -> list[dict]:
+    """
+    Розбирає файли (паралельно, якщо їх не менше HTML_IMPORT_PARALLEL_MIN).
+
+    Результати повертаються в порядку файлів; ``on_result`` викликається
+    для кожного файлу одразу після розбору.
+    """
+    rates = rates if rates is not None else get_exchange_rates()
+    workers = min(getattr(settings, "HTML_IMPORT_WORKERS", 4), len(files))
+    if workers <= 1 or len(files) < getattr(settings, "HTML_IMPORT_PARALLEL_MIN", 8):
+        results = []
+        for name, raw in files:
+            results.append(parse_file(name, raw, rates))
+            if on_result:
+                on_result(results[-1])
+        return results
+
+    results: list[dict | None] = [None] * len(files)
+    # spawn: дочірні процеси не успадковують з'єднання з БД і потоки веб-процесу;
+    # django.setup() виконується до того, як процес імпортує цей модуль.
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=django.setup,
+    ) as executor:
+        futures = {
+            executor.submit(parse_file, name, raw, rates): index
+            for index, (name, raw) in enumerate(files)
+        }
+        for future in as_completed(futures):
+            index = futures[future]
+            try:
+                result = future.result()
+            except Exception as exc:  # процес упав
+                result = {"file": files[index][0], "error": str(exc)}
+            results[index] = result
+            if on_result:
+                on_result(result)
+    return results
+
+
+def _resolve_by_name(model, names: set[str]) -> dict[str, object]:
+    """Повертає {назва в нижньому регістрі: об'єкт}, створюючи відсутні."""
+    existing = {obj.name.strip().lower(): obj for obj in model.objects.all()}
+    for name in names:
+        if name.lower() not in existing:
+            existing[name.lower()] = model.objects.create(name=name)
+    return existing
+
+
+def save_parsed(results: list[dict]) -> tuple[list[dict], list[dict]]:
+    """
+    Записує розібрані файли одним пакетом; повертає (created, errors).
+
+    Результат із ключем ``source_url`` зберігається з адресою сторінки та
+    відбитком, щоб повторний імпорт оновлював об'єкт.
+    """
+    errors = [result for result in results if "data" not in result]
+    parsed = [result for result in results if "data" in result]
+    if not parsed:
+        return [], errors
+
+    type_names = {
+        r["data"]["property_type"].strip()
+        for r in parsed
+        if (r["data"].get("property_type") or "").strip()
+    }
+    deal_names = {
+        r["data"]["deal_type"].strip()
+        for r in parsed
+        if (r["data"].get("deal_type") or "").strip()
+    }
+    property_types = _resolve_by_name(PropertyType, type_names)
+    deal_types = _resolve_by_name(DealType, deal_names)
+
+    entries = []
+    for result in parsed:
+        data = result["data"]
+        entries.append(
+            ImportEntry(
+                instance=Property(
+                    title=data["title"].strip(),
+                    address=data["address"].strip(),
+                    description=strip_tags(data.get("description_html") or "")[:4000],
+                    price=data.get("price") or 0,
+                    area=int(round(data.get("area") or 0)),
+                    rooms=int(data.get("rooms") or 1),
+                    latitude=data.get("latitude"),
+                    longitude=data.get("longitude"),
+                    property_type=property_types.get(
+                        (data.get("property_type") or "").strip().lower()
+                    ),
+                    deal_type=deal_types.get(
+                        (data.get("deal_type") or "").strip().lower()
+                    ),
+                    source_url=result.get("source_url", ""),
+                    source_fingerprint=(
+                        parsed_fingerprint(data) if result.get("source_url") else ""
+                    ),
+                    **result.get("validators", {}),
+                ),
+                images=images_payload(data),
+            )
+        )
+
+    # Перевірка дублікатів - до запису, щоб пакет не знаходив сам себе.
+    duplicates = duplicates_for_parsed([result["data"] for result in parsed])
+    created = bulk_import_properties(entries)
+    return [
+        {
+            "file": result["file"],
+            "id": property_obj.id,
+            "title": property_obj.title,
+            "warnings": duplicate_warnings(matches),
+        }
+        for result, property_obj, matches in zip(parsed, created, duplicates)
+    ], errors
+
+
+def start_html_import_job(files: list[tuple[str, bytes]]) -> BackgroundJob:
+    """Зберігає файли у сховище й ставить розбір у фон."""
+    prefix = f"{UPLOAD_DIR}/{uuid.uuid4().hex}"
+    stored = [
+        {
+            "name": name,
+            "path": default_storage.save(f"{prefix}/file.html", ContentFile(raw)),
+        }
+        for name, raw in files
+    ]
+    return start_job("html_import", {"files": stored}, total=len(stored))
+
+
+@job_handler("html_import")
+def run_html_import_job(job: BackgroundJob) -> dict:
+    stored = job.payload["files"]
+    files = []
+    for item in stored:
+        with default_storage.open(item["path"], "rb") as fh:
+            files.append((item["name"], fh.read()))
+
+    def on_result(result):
+        ok = "data" in result
+        job.advance(processed=int(ok), failed=int(not ok))
+
+    try:
+        results = parse_files(files, on_result=on_result)
+        created, errors = save_parsed(results)
+    finally:
+        for item in stored:
+            default_storage.delete(item["path"])
+    return {"created": created, "errors": errors}
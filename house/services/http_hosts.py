@@ -0,0 +1,72 @@
+"""
+Сесії й ліміти запитів на хост для паралельних завантажень (фото, сторінки).
+
+Кожен хост отримує свою сесію з пулом на ``per_host`` з'єднань і семафор на
+стільки ж одночасних запитів; з ``delay`` запити до одного хоста ще й
+розносяться в часі. Спільне для ImageFetcher і PageFetcher.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+class HostSessions:
+    def __init__(self, per_host: int, delay: float = 0.0):
+        self.per_host = per_host
+        self.delay = delay
+        self._lock = threading.Lock()
+        self._sessions: dict[str, requests.Session] = {}
+        self._slots: dict[str, threading.BoundedSemaphore] = {}
+        self._next_request: dict[str, float] = {}
+
+    def __enter__(self) -> "HostSessions":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _host(self, host: str) -> tuple[requests.Session, threading.BoundedSemaphore]:
+        with self._lock:
+            session = self._sessions.get(host)
+            if session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.per_host)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                self._sessions[host] = session
+                self._slots[host] = threading.BoundedSemaphore(self.per_host)
+            return session, self._slots[host]
+
+    def _wait_turn(self, host: str) -> None:
+        """Запити до одного хоста йдуть не частіше, ніж раз на delay с."""
+        if self.delay <= 0:
+            return
+        with self._lock:
+            now = time.monotonic()
+            turn = max(now, self._next_request.get(host, now))
+            self._next_request[host] = turn + self.delay
+        if turn > now:
+            time.sleep(turn - now)
+
+    @contextmanager
+    def request(self, host: str) -> Iterator[requests.Session]:
+        """Сесія хоста; слот тримається, доки виконується блок (разом із читанням тіла)."""
+        session, slot = self._host(host.lower())
+        with slot:
+            self._wait_turn(host.lower())
+            yield session
+
+    def close(self) -> None:
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+            self._slots.clear()
+        for session in sessions:
+            session.close()
@@ -0,0 +1,174 @@
+"""
+Паралельне завантаження фото для імпорту.
+
+Одна сесія (пул з'єднань) на хост, обмежена кількість потоків, тіло відповіді
+пишеться потоково у тимчасовий файл з лімітом розміру, однакові URL у межах
+пакета завантажуються один раз.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import mimetypes
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from urllib.parse import urlparse
+
+import requests
+from django.conf import settings
+from django.core.files import File
+
+from house.services.http_hosts import HostSessions
+
+CHUNK_SIZE = 64 * 1024
+
+
+class ImageFetchError(Exception):
+    """Фото не вдалося завантажити або воно не пройшло перевірки."""
+
+
+@dataclass
+class FetchedImage:
+    url: str
+    filename: str = ""
+    path: str = ""
+    content_type: str = ""
+    size: int = 0
+    sha256: str = ""
+    error: str = ""
+
+    @property
+    def ok(self) -> bool:
+        return not self.error and bool(self.path)
+
+    def as_file(self) -> File:
+        """Файл для ImageField; закривається разом із пакетом."""
+        return File(open(self.path, "rb"), name=self.filename)
+
+
+def _filename(url: str, content_type: str, index: int) -> str:
+    filename = os.path.basename(urlparse(url).path) or f"image-{index}"
+    if not os.path.splitext(filename)[1]:
+        filename += mimetypes.guess_extension(content_type) or ".jpg"
+    return filename
+
+
+class ImageBatch:
+    """Результати завантаження; тимчасові файли видаляються при виході з with."""
+
+    def __init__(self, results: dict[str, FetchedImage]):
+        self.results = results
+        self._files: list[File] = []
+
+    def __enter__(self) -> "ImageBatch":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def get(self, url: str) -> FetchedImage | None:
+        return self.results.get(url)
+
+    def open(self, url: str) -> File:
+        result = self.results[url]
+        if not result.ok:
+            raise ImageFetchError(result.error)
+        image_file = result.as_file()
+        self._files.append(image_file)
+        return image_file
+
+    def close(self) -> None:
+        for image_file in self._files:
+            image_file.close()
+        self._files.clear()
+        for result in self.results.values():
+            if result.path and os.path.exists(result.path):
+                os.unlink(result.path)
+            result.path = ""
+
+
+class ImageFetcher:
+    def __init__(
+        self,
+        *,
+        timeout: int | None = None,
+        max_bytes: int | None = None,
+        max_workers: int | None = None,
+        per_host: int | None = None,
+    ):
+        self.timeout = timeout or getattr(settings, "REQUESTS_TIMEOUT", 10)
+        self.max_bytes = max_bytes or getattr(
+            settings, "IMAGE_FETCH_MAX_BYTES", 15 * 1024 * 1024
+        )
+        self.max_workers = max_workers or getattr(settings, "IMAGE_FETCH_WORKERS", 6)
+        self.per_host = per_host or getattr(settings, "IMAGE_FETCH_PER_HOST", 4)
+        self._hosts = HostSessions(self.per_host)
+
+    def _download(self, url: str, index: int) -> FetchedImage:
+        result = FetchedImage(url=url)
+        parsed = urlparse(url)
+        if parsed.scheme not in ("http", "https") or not parsed.netloc:
+            result.error = "Некоректна URL-адреса"
+            return result
+
+        try:
+            with self._hosts.request(parsed.netloc) as session, session.get(
+                url, timeout=self.timeout, stream=True
+            ) as response:
+                response.raise_for_status()
+                content_type = (
+                    response.headers.get("Content-Type", "").split(";")[0].strip()
+                )
+                if content_type and not content_type.startswith("image/"):
+                    raise ImageFetchError(f"Не зображення ({content_type})")
+                declared = response.headers.get("Content-Length")
+                if declared and declared.isdigit() and int(declared) > self.max_bytes:
+                    raise ImageFetchError("Файл завеликий")
+
+                result.content_type = content_type
+                result.filename = _filename(url, content_type, index)
+                fd, result.path = tempfile.mkstemp(
+                    prefix="dominium-img-", suffix=os.path.splitext(result.filename)[1]
+                )
+                digest = hashlib.sha256()
+                with os.fdopen(fd, "wb") as fh:
+                    for chunk in response.iter_content(CHUNK_SIZE):
+                        result.size += len(chunk)
+                        if result.size > self.max_bytes:
+                            raise ImageFetchError("Файл завеликий")
+                        digest.update(chunk)
+                        fh.write(chunk)
+                result.sha256 = digest.hexdigest()
+                if not result.size:
+                    raise ImageFetchError("Порожня відповідь")
+        except (requests.RequestException, ImageFetchError) as exc:
+            result.error = str(exc)
+            if result.path and os.path.exists(result.path):
+                os.unlink(result.path)
+            result.path = ""
+        return result
+
+    def fetch(self, urls) -> ImageBatch:
+        unique = list(dict.fromkeys(url for url in urls if url))
+        results: dict[str, FetchedImage] = {}
+        if not unique:
+            return ImageBatch(results)
+        workers = min(self.max_workers, len(unique))
+        try:
+            with ThreadPoolExecutor(
+                max_workers=workers, thread_name_prefix="image-fetch"
+            ) as executor:
+                for result in executor.map(
+                    self._download, unique, range(1, len(unique) + 1)
+                ):
+                    results[result.url] = result
+        finally:
+            self._hosts.close()
+        return ImageBatch(results)
+
+
+def fetch_images(urls, **options) -> ImageBatch:
+    """Завантажує набір URL паралельно; використовувати як ``with``."""
+    return ImageFetcher(**options).fetch(urls)
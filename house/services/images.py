@@ -0,0 +1,367 @@
+"""
+Обробка фото об'єктів: основний WebP і адаптивні варіанти для srcset.
+
+Обробка запускається задачею черги ``images.process`` після збереження
+PropertyImage, тож запит на завантаження фото не чекає на кодування.
+Пакетне завантаження (ingest_images) конвертує фото паралельно одразу й
+вставляє записи одним bulk_create.
+"""
+
+from __future__ import annotations
+
+import base64
+import hashlib
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from pathlib import PurePosixPath
+from typing import NamedTuple
+
+from django.conf import settings
+from django.core.files import File
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.db.models import Max, Q
+from PIL import Image, features
+
+from house.models import Property, PropertyImage
+
+logger = logging.getLogger(__name__)
+
+VARIANTS_DIR = "property_images/variants"
+DEFAULT_VARIANT_SIZES = {"thumb": 320, "card": 640, "gallery": 1024, "full": 1280}
+PLACEHOLDER_WIDTH = 16
+
+
+class ConvertedImage(NamedTuple):
+    name: str
+    variants: dict
+    placeholder: str
+    dominant_color: str
+
+
+def variant_sizes() -> dict[str, int]:
+    return getattr(settings, "IMAGE_VARIANT_SIZES", DEFAULT_VARIANT_SIZES)
+
+
+def avif_enabled() -> bool:
+    return getattr(settings, "IMAGE_VARIANTS_AVIF", False) and features.check("avif")
+
+
+def _resize(img: Image.Image, width: int) -> Image.Image:
+    if img.width <= width:
+        return img
+    height = round(img.height * width / img.width)
+    return img.resize((width, height), Image.LANCZOS)
+
+
+def _encode(img: Image.Image, fmt: str) -> bytes:
+    buffer = BytesIO()
+    if fmt == "avif":
+        img.save(
+            buffer,
+            format="AVIF",
+            quality=getattr(settings, "IMAGE_AVIF_QUALITY", 50),
+            speed=8,
+        )
+    else:
+        img.save(
+            buffer,
+            format="WEBP",
+            quality=getattr(settings, "IMAGE_WEBP_QUALITY", 70),
+            method=getattr(settings, "IMAGE_WEBP_METHOD", 4),
+        )
+    return buffer.getvalue()
+
+
+def _replace(storage, name: str, data: bytes) -> str:
+    # Детерміновані імена: повторна обробка перезаписує, а не множить файли.
+    if storage.exists(name):
+        storage.delete(name)
+    return storage.save(name, ContentFile(data))
+
+
+def _open_scaled(storage, name: str, width: int) -> Image.Image:
+    with storage.open(name, "rb") as fh:
+        img = Image.open(fh)
+        # Для JPEG декодер одразу зменшує масштаб (1/2, 1/4, 1/8) - у рази швидше.
+        img.draft("RGB", (width, width))
+        img.load()
+    return img.convert("RGB")
+
+
+def content_hash(file) -> str:
+    """SHA-256 вмісту файлу; позиція читання повертається на початок."""
+    digest = hashlib.sha256()
+    file.seek(0)
+    for chunk in iter(lambda: file.read(64 * 1024), b""):
+        digest.update(chunk)
+    file.seek(0)
+    return digest.hexdigest()
+
+
+def placeholder(img: Image.Image) -> str:
+    """Крихітний WebP як data URI (кількасот байт) - розмита заглушка до завантаження фото."""
+    height = max(1, round(img.height * PLACEHOLDER_WIDTH / img.width))
+    small = img.resize((PLACEHOLDER_WIDTH, height), Image.BILINEAR, reducing_gap=2.0)
+    buffer = BytesIO()
+    small.save(buffer, format="WEBP", quality=30)
+    return "data:image/webp;base64," + base64.b64encode(buffer.getvalue()).decode()
+
+
+def dominant_color(img: Image.Image) -> str:
+    """Найпоширеніший колір після зведення до палітри з 8 кольорів (#rrggbb)."""
+    small = img.resize((64, 64), Image.BILINEAR, reducing_gap=2.0)
+    palette = small.quantize(colors=8)
+    _, index = max(palette.getcolors())
+    red, green, blue = palette.getpalette()[index * 3 : index * 3 + 3]
+    return f"#{red:02x}{green:02x}{blue:02x}"
+
+
+def preview_source(image_obj: PropertyImage) -> Image.Image:
+    """Найменший готовий файл фото (варіант або основний) для заглушки."""
+    storage = image_obj.image.storage
+    entries = sorted(
+        (entry for entry in (image_obj.variants or {}).values() if entry.get("webp")),
+        key=lambda entry: entry["width"],
+    )
+    name = entries[0]["webp"] if entries else image_obj.image.name
+    return _open_scaled(storage, name, PLACEHOLDER_WIDTH * 4)
+
+
+def image_file_names(name: str, variants: dict | None) -> list[str]:
+    """Усі файли фото: основний і варіанти (без повторів)."""
+    names = [name] if name else []
+    for variant in (variants or {}).values():
+        for fmt in ("webp", "avif"):
+            file_name = variant.get(fmt)
+            if file_name and file_name not in names:
+                names.append(file_name)
+    return names
+
+
+def release_image_files(entries: list[tuple[str, dict]], storage=None) -> int:
+    """
+    Видаляє файли фото, на які більше не посилається жоден PropertyImage.
+
+    ``entries`` - пари (image, variants) уже видалених записів. Однаковий вміст
+    зберігається одним файлом для кількох записів, тож файл прибирається лише
+    разом з останнім посиланням. Повертає кількість видалених файлів.
+    """
+    storage = storage or default_storage
+    names = {name for name, _ in entries if name}
+    still_used = set(
+        PropertyImage.objects.filter(image__in=names).values_list("image", flat=True)
+    )
+    deleted = 0
+    released = set()
+    for name, variants in entries:
+        if not name or name in still_used or name in released:
+            continue
+        released.add(name)
+        for file_name in image_file_names(name, variants):
+            try:
+                storage.delete(file_name)
+                deleted += 1
+            except Exception as exc:
+                logger.warning("Не вдалося видалити файл %s: %s", file_name, exc)
+    return deleted
+
+
+def convert_image(storage, source_name: str) -> ConvertedImage:
+    """
+    Створює основний WebP (не ширше найбільшого варіанту) і варіанти розмірів.
+
+    Заодно рахує заглушку й основний колір. БД не змінює,
+    тож придатна для виконання в потоках.
+    """
+    sizes = variant_sizes()
+    max_width = max(sizes.values())
+    img = _open_scaled(storage, source_name, max_width)
+
+    main = _resize(img, max_width)
+    main_name = source_name
+    if not source_name.lower().endswith(".webp") or main is not img:
+        stem = PurePosixPath(source_name).stem
+        main_name = storage.save(
+            f"{PurePosixPath(source_name).parent}/{stem}.webp",
+            ContentFile(_encode(main, "webp")),
+        )
+        if main_name != source_name:
+            storage.delete(source_name)
+
+    stem = PurePosixPath(main_name).stem
+    variants = {}
+    for label, width in sorted(sizes.items(), key=lambda item: item[1]):
+        resized = _resize(main, width)
+        entry = {"width": resized.width, "height": resized.height}
+        if resized is main:
+            entry["webp"] = main_name
+        else:
+            entry["webp"] = _replace(
+                storage, f"{VARIANTS_DIR}/{stem}-{label}.webp", _encode(resized, "webp")
+            )
+        if avif_enabled():
+            entry["avif"] = _replace(
+                storage, f"{VARIANTS_DIR}/{stem}-{label}.avif", _encode(resized, "avif")
+            )
+        variants[label] = entry
+    return ConvertedImage(main_name, variants, placeholder(main), dominant_color(main))
+
+
+def process_image(image_obj: PropertyImage) -> dict:
+    """
+    Конвертує фото запису (convert_image).
+
+    Результат записується в ``image``, ``variants`` і заглушку без виклику
+    save() - для всіх записів, що посилаються на той самий файл.
+    """
+    source_name = image_obj.image.name
+    converted = convert_image(image_obj.image.storage, source_name)
+    fields = converted._asdict()
+    fields["image"] = fields.pop("name")
+    PropertyImage.objects.filter(Q(pk=image_obj.pk) | Q(image=source_name)).update(
+        **fields
+    )
+    for field, value in fields.items():
+        setattr(image_obj, field, value)
+    return converted.variants
+
+
+def ingest_images(
+    property_obj: Property,
+    files: list[File],
+    *,
+    main_index: int | None = None,
+) -> tuple[list[PropertyImage], list[dict]]:
+    """
+    Додає об'єкту кілька фото одним пакетом; повертає (створені, помилки).
+
+    На відміну від PropertyImage.save: порядок рахується одним запитом,
+    однаковий вміст (у пакеті чи в базі) зберігається одним файлом, нові файли
+    конвертуються паралельно (IMAGE_PROCESS_WORKERS) одразу, а записи
+    вставляються через bulk_create - без задач ``images.process``.
+    ``main_index`` - номер файлу, який стане головним фото; якщо саме цей
+    файл не оброблено, головне фото не змінюється, а в помилках про це є запис.
+    """
+    field = PropertyImage._meta.get_field("image")
+    storage = field.storage
+    hashes = [content_hash(file) for file in files]
+    twins = {}
+    for twin in (
+        PropertyImage.objects.filter(content_hash__in=set(hashes))
+        .exclude(image="")
+        .only(
+            "image",
+            "variants",
+            "placeholder",
+            "dominant_color",
+            "content_hash",
+        )
+        .order_by("pk")
+    ):
+        twins.setdefault(twin.content_hash, twin)
+
+    # Кожен новий вміст зберігається й конвертується один раз.
+    stored: dict[str, str] = {}
+    for file, digest in zip(files, hashes):
+        if digest not in twins and digest not in stored:
+            name = PurePosixPath(getattr(file, "name", "") or "image").name
+            stored[digest] = storage.save(field.generate_filename(None, name), file)
+
+    converted: dict[str, ConvertedImage | Exception] = {}
+    if stored:
+        workers = min(getattr(settings, "IMAGE_PROCESS_WORKERS", 4), len(stored))
+
+        def convert(item):
+            digest, name = item
+            try:
+                return digest, convert_image(storage, name)
+            except Exception as exc:
+                logger.warning("Не вдалося обробити фото %s: %s", name, exc)
+                storage.delete(name)
+                return digest, exc
+
+        with ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="image-convert"
+        ) as executor:
+            converted = dict(executor.map(convert, stored.items()))
+
+    max_order = property_obj.images.aggregate(Max("sort_order"))["sort_order__max"]
+    order = max_order or 0
+    instances, errors = [], []
+    main = None
+    for index, (file, digest) in enumerate(zip(files, hashes)):
+        result = converted.get(digest)
+        if isinstance(result, Exception):
+            errors.append({"file": getattr(file, "name", "файл"), "error": str(result)})
+            continue
+        order += 1
+        if result is None:
+            twin = twins[digest]
+            result = ConvertedImage(
+                twin.image.name,
+                twin.variants,
+                twin.placeholder,
+                twin.dominant_color,
+            )
+        instances.append(
+            PropertyImage(
+                property=property_obj,
+                image=result.name,
+                variants=result.variants,
+                placeholder=result.placeholder,
+                dominant_color=result.dominant_color,
+                content_hash=digest,
+                sort_order=order,
+            )
+        )
+        if index == main_index:
+            main = instances[-1]
+
+    if main is not None:
+        main.is_main = True
+    elif main_index is not None:
+        errors.append(
+            {
+                "file": getattr(files[main_index], "name", "файл"),
+                "error": "Головне фото не змінено: цей файл не оброблено.",
+            }
+        )
+
+    try:
+        with transaction.atomic():
+            if main is not None:
+                property_obj.images.filter(is_main=True).update(is_main=False)
+            PropertyImage.objects.bulk_create(instances)
+    except Exception:
+        # Записи не збереглися - нові файли й варіанти нікому не належать.
+        for result in converted.values():
+            if not isinstance(result, Exception):
+                for file_name in image_file_names(result.name, result.variants):
+                    storage.delete(file_name)
+        raise
+    return instances, errors
+
+
+def srcset(variants: dict | None, fmt: str = "webp", storage=None) -> str:
+    if not variants:
+        return ""
+    storage = storage or default_storage
+    seen = set()
+    parts = []
+    for entry in sorted(variants.values(), key=lambda item: item["width"]):
+        name = entry.get(fmt)
+        if not name or entry["width"] in seen:
+            continue
+        seen.add(entry["width"])
+        parts.append(f"{storage.url(name)} {entry['width']}w")
+    return ", ".join(parts)
+
+
+def variant_url(variants: dict | None, label: str, storage=None) -> str | None:
+    entry = (variants or {}).get(label)
+    if not entry or not entry.get("webp"):
+        return None
+    return (storage or default_storage).url(entry["webp"])
@@ -1,14 +1,41 @@
-import os
+import hashlib
+import json
+from dataclasses import dataclass, field
+from decimal import Decimal, InvalidOperation
 from urllib.parse import urlparse
 
 import requests
 from django.conf import settings
-from django.core.files.base import ContentFile
+from django.db import transaction
+from django.utils import timezone
 from django.utils.text import slugify
 
 from house.models import DealType, Property, PropertyImage, PropertyType
+from house.services.duplicates import parsed_duplicate_warnings
+from house.services.image_fetcher import fetch_images
+from house.services.images import release_image_files
 from house.utils.html_parser import parse_property_html
 
+IMPORT_CREATED = "created"
+IMPORT_UPDATED = "updated"
+IMPORT_UNCHANGED = "unchanged"
+
+# Поля розбору, що входять у відбиток сторінки.
+FINGERPRINT_FIELDS = (
+    "title",
+    "address",
+    "price",
+    "area",
+    "rooms",
+    "description_html",
+    "property_type",
+    "deal_type",
+    "latitude",
+    "longitude",
+    "main_image",
+    "gallery",
+)
+
 
 class PropertyImportError(Exception):
     """Базова помилка імпорту нерухомості."""
@@ -60,7 +87,151 @@ def _safe_int(value, default: int = 0) -> int:
         return default
 
 
-def _import_images(property_obj: Property, data: dict, *, timeout: int) -> list[str]:
+def _safe_price(value) -> Decimal | None:
+    try:
+        return Decimal(str(value)).quantize(Decimal("0.01"))
+    except (InvalidOperation, TypeError, ValueError):
+        return None
+
+
+@dataclass
+class ImportResult:
+    property: Property
+    status: str
+    changed: list[str] = field(default_factory=list)
+    warnings: list[str] = field(default_factory=list)
+
+
+def parsed_fingerprint(parsed: dict) -> str:
+    """SHA-256 нормалізованих полів розбору: однаковий для незмінної сторінки."""
+    normalized = {}
+    for key in FINGERPRINT_FIELDS:
+        value = parsed.get(key)
+        if isinstance(value, str):
+            value = " ".join(value.split())
+        elif isinstance(value, float):
+            value = round(value, 6)
+        normalized[key] = value
+    payload = json.dumps(normalized, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def page_validators(response) -> dict:
+    """Поля Property з валідаторами й хешем тіла відповіді для повторного обходу."""
+    return {
+        "source_etag": (response.headers.get("ETag") or "")[:255],
+        "source_last_modified": (response.headers.get("Last-Modified") or "")[:64],
+        "source_content_hash": hashlib.sha256(response.content).hexdigest(),
+        "source_checked_at": timezone.now(),
+    }
+
+
+def _property_values(parsed: dict) -> dict:
+    property_type = _resolve_property_type(parsed.get("property_type"))
+    deal_type = _resolve_deal_type(parsed.get("deal_type"))
+    values = {
+        "title": parsed.get("title") or "",
+        "address": parsed.get("address") or "",
+        "price": _safe_price(parsed.get("price")),
+        "area": _safe_int(parsed.get("area")),
+        "rooms": _safe_int(parsed.get("rooms"), default=1),
+        "description": parsed.get("description_html") or "",
+        "property_type_id": property_type.pk if property_type else None,
+        "deal_type_id": deal_type.pk if deal_type else None,
+    }
+    # Порожні координати не затирають відомі (їх міг знайти геокодер).
+    for key in ("latitude", "longitude"):
+        if parsed.get(key) is not None:
+            values[key] = parsed[key]
+    return values
+
+
+def _release_stale_images(property_obj: Property, parsed: dict) -> int:
+    """Видаляє імпортовані фото, яких на сторінці більше немає."""
+    wanted = {parsed.get("main_image"), *(parsed.get("gallery") or [])}
+    stale = list(
+        property_obj.images.exclude(source_url="")
+        .exclude(source_url__in=[url for url in wanted if url])
+        .only("pk", "image", "variants")
+    )
+    if not stale:
+        return 0
+    entries = [(image.image.name, image.variants) for image in stale]
+    PropertyImage.objects.filter(pk__in=[image.pk for image in stale]).delete()
+    transaction.on_commit(lambda: release_image_files(entries))
+    return len(stale)
+
+
+def import_parsed_property(
+    parsed: dict,
+    *,
+    source_url: str,
+    timeout: int | None = None,
+    with_images: bool = True,
+    validators: dict | None = None,
+) -> ImportResult:
+    """
+    Створює або оновлює об'єкт, імпортований зі ``source_url``.
+
+    Якщо відбиток сторінки не змінився, нічого не записується (крім
+    ``validators`` - див. page_validators) і фото не завантажуються. Інакше
+    оновлюються лише змінені поля, зайві імпортовані фото видаляються, а
+    завантажуються тільки нові URL.
+    """
+    validators = validators or {}
+    fingerprint = parsed_fingerprint(parsed)
+    existing = (
+        Property.objects.filter(source_url=source_url).order_by("pk").first()
+        if source_url
+        else None
+    )
+    if existing is not None and existing.source_fingerprint == fingerprint:
+        if validators:
+            Property.objects.filter(pk=existing.pk).update(**validators)
+        return ImportResult(existing, IMPORT_UNCHANGED)
+
+    values = _property_values(parsed)
+    warnings = []
+    if existing is None:
+        warnings = parsed_duplicate_warnings(parsed)
+        property_obj = Property(
+            source_url=source_url,
+            source_fingerprint=fingerprint,
+            **values,
+            **validators,
+        )
+        property_obj.save()
+        result = ImportResult(
+            property_obj, IMPORT_CREATED, changed=list(values), warnings=warnings
+        )
+    else:
+        changed = [
+            name for name, value in values.items() if getattr(existing, name) != value
+        ]
+        for name, value in [*values.items(), *validators.items()]:
+            setattr(existing, name, value)
+        existing.source_fingerprint = fingerprint
+        update_fields = {*changed, *validators, "source_fingerprint"}
+        if "address" in changed:
+            # Старі координати належать старій адресі: Property.save візьме нові з
+            # кешу геокодування або поставить геокодування після коміту.
+            if "latitude" not in values:
+                existing.latitude = existing.longitude = None
+            update_fields.update({"latitude", "longitude"})
+        existing.save(update_fields=sorted(update_fields))
+        _release_stale_images(existing, parsed)
+        result = ImportResult(existing, IMPORT_UPDATED, changed=changed)
+
+    if with_images:
+        result.warnings += import_images(
+            result.property,
+            parsed,
+            timeout=timeout or getattr(settings, "REQUESTS_TIMEOUT", 10),
+        )
+    return result
+
+
+def import_images(property_obj: Property, data: dict, *, timeout: int) -> list[str]:
     warnings: list[str] = []
     image_pairs: list[tuple[str, bool]] = []
 
@@ -71,37 +242,44 @@ def _import_images(property_obj: Property, data: dict, *, timeout: int) -> list[
         image_pairs.append((url, False))
 
     has_main = property_obj.images.filter(is_main=True).exists()
+    # Повторний імпорт не завантажує вже імпортовані URL і не додає фото,
+    # вміст яких в об'єкта вже є.
+    known = property_obj.images.values_list("source_url", "content_hash")
+    known_urls = {url for url, _ in known if url}
+    known_hashes = {content_hash for _, content_hash in known if content_hash}
+    image_pairs = [pair for pair in image_pairs if pair[0] not in known_urls]
+
+    with fetch_images([url for url, _ in image_pairs], timeout=timeout) as batch:
+        seen = set()
+        for image_url, wants_main in image_pairs:
+            if not image_url or image_url in seen:
+                continue
+            seen.add(image_url)
+            result = batch.get(image_url)
+            if not result.ok:
+                warnings.append(f"{image_url}: {result.error}")
+                continue
+            if result.sha256 in known_hashes:
+                continue
 
-    for index, (image_url, wants_main) in enumerate(image_pairs):
-        if not image_url:
-            continue
-        try:
-            response = requests.get(image_url, timeout=timeout)
-            response.raise_for_status()
-        except requests.RequestException as exc:
-            warnings.append(f"{image_url}: {exc}")
-            continue
-
-        filename = os.path.basename(urlparse(image_url).path) or f"image-{index}.jpg"
-        if not os.path.splitext(filename)[1]:
-            filename += ".jpg"
-
-        try:
-            image_file = ContentFile(response.content, name=filename)
-            PropertyImage.objects.create(
-                property=property_obj,
-                image=image_file,
-                is_main=wants_main and not has_main,
-            )
-            if wants_main and not has_main:
-                has_main = True
-        except Exception as exc:
-            warnings.append(f"{image_url}: {exc}")
+            try:
+                PropertyImage.objects.create(
+                    property=property_obj,
+                    image=batch.open(image_url),
+                    is_main=wants_main and not has_main,
+                    source_url=image_url,
+                )
+                known_hashes.add(result.sha256)
+                if wants_main and not has_main:
+                    has_main = True
+            except Exception as exc:
+                warnings.append(f"{image_url}: {exc}")
 
     return warnings
 
 
-def import_property_from_url(url: str, *, timeout: int | None = None):
+def sync_property_from_url(url: str, *, timeout: int | None = None) -> ImportResult:
+    """Імпортує сторінку; повторний імпорт того самого URL оновлює наявний об'єкт."""
     if not url or not is_valid_url(url):
         raise InvalidImportURL("Некоректна URL-адреса")
 
@@ -110,24 +288,14 @@ def import_property_from_url(url: str, *, timeout: int | None = None):
     response.raise_for_status()
 
     parsed = parse_property_html(response.text, source=url).as_dict()
-    property_type = _resolve_property_type(parsed.get("property_type"))
-    deal_type = _resolve_deal_type(parsed.get("deal_type"))
-
-    property_obj = Property(
-        title=parsed.get("title") or "",
-        address=parsed.get("address") or "",
-        price=parsed.get("price"),
-        area=_safe_int(parsed.get("area")),
-        rooms=_safe_int(parsed.get("rooms"), default=1),
-        description=parsed.get("description_html") or "",
-        property_type=property_type,
-        deal_type=deal_type,
-        latitude=parsed.get("latitude"),
-        longitude=parsed.get("longitude"),
+    return import_parsed_property(
+        parsed,
+        source_url=url,
+        timeout=resolved_timeout,
+        validators=page_validators(response),
     )
-    property_obj.save()
-    property_obj.save()
 
-    warnings = _import_images(property_obj, parsed, timeout=resolved_timeout)
 
-    return property_obj, warnings
+def import_property_from_url(url: str, *, timeout: int | None = None):
+    result = sync_property_from_url(url, timeout=timeout)
+    return result.property, result.warnings
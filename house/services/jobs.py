@@ -0,0 +1,116 @@
+"""Фонові задачі з відстеженням прогресу (BackgroundJob)."""
+
+from __future__ import annotations
+
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+
+from django.conf import settings
+from django.db import close_old_connections, connection, transaction
+from django.utils import timezone
+
+from house.models import BackgroundJob
+
+logger = logging.getLogger(__name__)
+
+JobHandler = Callable[[BackgroundJob], dict | None]
+
+_HANDLERS: dict[str, JobHandler] = {}
+_EXECUTOR: ThreadPoolExecutor | None = None
+
+
+def job_handler(kind: str):
+    """Реєструє функцію, що виконує задачі вказаного типу."""
+
+    def decorator(func: JobHandler) -> JobHandler:
+        _HANDLERS[kind] = func
+        return func
+
+    return decorator
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _EXECUTOR
+    if _EXECUTOR is None:
+        _EXECUTOR = ThreadPoolExecutor(
+            max_workers=getattr(settings, "BACKGROUND_JOBS_WORKERS", 2),
+            thread_name_prefix="dominium-job",
+        )
+    return _EXECUTOR
+
+
+def start_job(kind: str, payload: dict, *, total: int = 0) -> BackgroundJob:
+    """Створює задачу й запускає її після коміту поточної транзакції."""
+    if kind not in _HANDLERS:
+        raise ValueError(f"Невідомий тип задачі: {kind}")
+    job = BackgroundJob.objects.create(kind=kind, payload=payload, total=total)
+    transaction.on_commit(lambda: _schedule(job.pk))
+    return job
+
+
+def _schedule(job_id: int) -> None:
+    if getattr(settings, "BACKGROUND_JOBS_EAGER", False):
+        run_job(job_id)
+        return
+    if getattr(settings, "TASK_QUEUE_ENABLED", False):
+        # Через чергу задача переживе перезапуск веб-процесу.
+        from house.services.tasks import enqueue
+
+        enqueue("jobs.run", {"job_id": job_id})
+        return
+    _get_executor().submit(_run_in_thread, job_id)
+
+
+def _run_in_thread(job_id: int) -> None:
+    close_old_connections()
+    try:
+        run_job(job_id)
+    finally:
+        connection.close()
+
+
+def run_job(job_id: int) -> BackgroundJob | None:
+    job = BackgroundJob.objects.filter(pk=job_id).first()
+    if job is None or job.is_finished:
+        return job
+
+    job.status = BackgroundJob.STATUS_RUNNING
+    job.started_at = timezone.now()
+    job.save(update_fields=["status", "started_at"])
+
+    try:
+        result = _HANDLERS[job.kind](job)
+    except Exception as exc:
+        logger.exception("Фонова задача %s #%s завершилась помилкою", job.kind, job.pk)
+        job.refresh_from_db(fields=["processed", "failed"])
+        job.status = BackgroundJob.STATUS_FAILED
+        job.error = str(exc)
+    else:
+        job.refresh_from_db(fields=["processed", "failed"])
+        job.status = BackgroundJob.STATUS_COMPLETED
+        job.result = result or {}
+
+    job.finished_at = timezone.now()
+    job.save(update_fields=["status", "error", "result", "finished_at"])
+    return job
+
+
+def serialize_job(job: BackgroundJob) -> dict:
+    progress = None
+    if job.total:
+        progress = round(min(job.processed + job.failed, job.total) * 100 / job.total)
+    return {
+        "id": job.id,
+        "kind": job.kind,
+        "status": job.status,
+        "total": job.total,
+        "processed": job.processed,
+        "failed": job.failed,
+        "progress": progress,
+        "result": job.result,
+        "error": job.error,
+        "created_at": job.created_at.isoformat() if job.created_at else None,
+        "started_at": job.started_at.isoformat() if job.started_at else None,
+        "finished_at": job.finished_at.isoformat() if job.finished_at else None,
+    }
@@ -0,0 +1,220 @@
+"""
+Пакетний імпорт об'єктів за посиланнями.
+
+Сторінки завантажуються паралельно з обмеженням з'єднань і паузою між
+запитами до одного хоста, розбираються через html_import.parse_files (пул
+процесів для великих пакетів) і нові записуються одним пакетом; уже
+імпортовані посилання оновлюються на місці. Для кожного посилання
+повертається окремий статус.
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+from urllib.parse import urlparse
+
+import requests
+from django.conf import settings
+
+from house.models import BackgroundJob, Property
+from house.services.bulk_import import (
+    ImportEntry,
+    images_payload,
+    schedule_followup,
+)
+from house.services.html_import import parse_files, save_parsed
+from house.services.http_hosts import HostSessions
+from house.services.importer import (
+    IMPORT_CREATED,
+    IMPORT_UPDATED,
+    import_parsed_property,
+    is_valid_url,
+    page_validators,
+)
+from house.services.jobs import job_handler, start_job
+
+
+class PageFetcher:
+    """Завантажує HTML сторінок: сесія й ліміт з'єднань на хост, ввічлива пауза."""
+
+    def __init__(
+        self,
+        *,
+        timeout: int | None = None,
+        max_workers: int | None = None,
+        per_host: int | None = None,
+        host_delay: float | None = None,
+    ):
+        self.timeout = timeout or getattr(settings, "REQUESTS_TIMEOUT", 10)
+        self.max_workers = max_workers or getattr(settings, "LINK_IMPORT_WORKERS", 8)
+        self.per_host = per_host or getattr(settings, "LINK_IMPORT_PER_HOST", 2)
+        if host_delay is None:
+            host_delay = getattr(settings, "LINK_IMPORT_HOST_DELAY_MS", 500) / 1000
+        self.host_delay = host_delay
+        self._hosts = HostSessions(self.per_host, host_delay)
+
+    def _download(self, url: str, headers: dict | None = None) -> dict:
+        try:
+            with self._hosts.request(urlparse(url).netloc) as session:
+                response = session.get(url, timeout=self.timeout, headers=headers)
+                if response.status_code == 304:
+                    return {"url": url, "status": 304}
+                response.raise_for_status()
+        except requests.RequestException as exc:
+            return {"url": url, "error": f"Не вдалося завантажити HTML: {exc}"}
+        return {
+            "url": url,
+            "status": response.status_code,
+            "html": response.text,
+            "validators": page_validators(response),
+        }
+
+    def fetch(
+        self,
+        urls: list[str],
+        on_result: Callable[[dict], None] | None = None,
+        *,
+        headers: dict[str, dict] | None = None,
+    ) -> list[dict]:
+        """
+        Результати в порядку ``urls``: {"url", "html", "validators"},
+        {"url", "status": 304} або {"url", "error"}.
+
+        ``headers`` - додаткові заголовки запиту для окремих URL (умовні
+        запити повторного обходу).
+        """
+        if not urls:
+            return []
+        headers = headers or {}
+        workers = min(self.max_workers, len(urls))
+        results = []
+        try:
+            with ThreadPoolExecutor(
+                max_workers=workers, thread_name_prefix="link-fetch"
+            ) as executor:
+                for result in executor.map(
+                    self._download, urls, [headers.get(url) for url in urls]
+                ):
+                    results.append(result)
+                    if on_result:
+                        on_result(result)
+        finally:
+            self._hosts.close()
+        return results
+
+
+def clean_urls(raw) -> tuple[list[str], list[dict]]:
+    """Повертає (унікальні коректні URL, помилки для решти)."""
+    urls, errors = [], []
+    for value in raw:
+        url = value.strip() if isinstance(value, str) else ""
+        if not url or not is_valid_url(url):
+            errors.append(
+                {"url": value, "status": "error", "error": "Некоректна URL-адреса"}
+            )
+        elif url not in urls:
+            urls.append(url)
+    return urls, errors
+
+
+def _error_status(url: str, result: dict) -> dict:
+    status = {"url": url, "status": "error"}
+    if "errors" in result:
+        status["errors"] = result["errors"]
+    else:
+        status["error"] = result["error"]
+    return status
+
+
+def import_links(
+    urls: list[str], *, on_result: Callable[[dict], None] | None = None
+) -> list[dict]:
+    """
+    Імпортує сторінки за посиланнями; повертає статуси в порядку ``urls``.
+
+    ``on_result`` отримує статус кожного посилання, щойно він відомий.
+    """
+
+    def report(status: dict) -> None:
+        statuses[status["url"]] = status
+        if on_result:
+            on_result(status)
+
+    statuses: dict[str, dict] = {}
+    pages, validators = [], {}
+    for result in PageFetcher().fetch(urls):
+        if "error" in result:
+            report(_error_status(result["url"], result))
+        else:
+            pages.append((result["url"], result["html"].encode("utf-8")))
+            validators[result["url"]] = result["validators"]
+
+    # Назва "файлу" - це URL: за ним parse_property_html обирає профіль розбору.
+    results = parse_files(pages)
+    known = set(
+        Property.objects.filter(
+            source_url__in=[result["file"] for result in results if "data" in result]
+        ).values_list("source_url", flat=True)
+    )
+
+    fresh, followup = [], []
+    for result in results:
+        url = result["file"]
+        if "data" not in result:
+            report(_error_status(url, result))
+        elif url not in known:
+            fresh.append({**result, "source_url": url, "validators": validators[url]})
+        else:
+            # Уже імпортоване посилання: оновлюються лише змінені поля й фото.
+            outcome = import_parsed_property(
+                result["data"],
+                source_url=url,
+                with_images=False,
+                validators=validators[url],
+            )
+            report(
+                {
+                    "url": url,
+                    "status": outcome.status,
+                    "id": outcome.property.id,
+                    "title": outcome.property.title,
+                    "changed": outcome.changed,
+                }
+            )
+            images = images_payload(result["data"])
+            if outcome.status == IMPORT_UPDATED and images:
+                followup.append(ImportEntry(instance=outcome.property, images=images))
+    if followup:
+        schedule_followup(followup, geocode=False)
+
+    created, _ = save_parsed(fresh)
+    for item in created:
+        status = {
+            "url": item["file"],
+            "status": IMPORT_CREATED,
+            "id": item["id"],
+            "title": item["title"],
+        }
+        if item["warnings"]:
+            status["warnings"] = item["warnings"]
+        report(status)
+    return [statuses[url] for url in urls]
+
+
+def start_link_import_job(urls: list[str]) -> BackgroundJob:
+    return start_job("link_import", {"urls": urls}, total=len(urls))
+
+
+@job_handler("link_import")
+def run_link_import_job(job: BackgroundJob) -> dict:
+    done = []
+
+    def on_result(status):
+        ok = status["status"] != "error"
+        job.advance(processed=int(ok), failed=int(not ok))
+        # Статуси готових посилань видно в /api/jobs/<id>/ ще до завершення.
+        done.append(status)
+        BackgroundJob.objects.filter(pk=job.pk).update(result={"results": done})
+
+    return {"results": import_links(job.payload["urls"], on_result=on_result)}
@@ -0,0 +1,183 @@
+"""
+Прибирання файлів фото, на які не посилається жоден PropertyImage.
+
+Каскадне видалення Property чи queryset.delete() видаляє записи, але не
+файли. Каталог фото обходиться потоково (os.scandir локально, посторінковий
+список об'єктів для S3, listdir для інших сховищ), а імена перевіряються
+в БД порціями одним запитом ``image__in``. Варіанти розмірів належать
+основному файлу з тим самим stem; якщо його не знайдено, варіант ще раз
+перевіряється пошуком у ``variants`` - видаляється лише те, на що справді
+ніхто не посилається. Файли, новіші за пільговий період, не чіпаються: їх
+може саме зберігати незавершене завантаження.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import time
+from dataclasses import dataclass, field
+from pathlib import PurePosixPath
+from typing import Iterator
+
+from django.conf import settings
+from django.core.files.storage import FileSystemStorage, default_storage
+from django.db.models import Q
+
+from house.models import PropertyImage
+from house.services.images import VARIANTS_DIR
+
+logger = logging.getLogger(__name__)
+
+IMAGES_DIR = PropertyImage._meta.get_field("image").upload_to.rstrip("/")
+
+
+@dataclass
+class MediaFile:
+    name: str  # ім'я у сховищі (як у PropertyImage.image, через "/")
+    size: int
+    mtime: float
+
+
+@dataclass
+class GCReport:
+    scanned: int = 0
+    skipped_recent: int = 0
+    orphans: list[MediaFile] = field(default_factory=list)
+    deleted: int = 0
+
+    @property
+    def orphan_bytes(self) -> int:
+        return sum(item.size for item in self.orphans)
+
+
+def iter_media_files(root: str, prefix: str) -> Iterator[MediaFile]:
+    """Рекурсивно обходить каталог без побудови повного списку файлів."""
+    try:
+        entries = os.scandir(root)
+    except FileNotFoundError:
+        return
+    with entries:
+        for entry in entries:
+            name = f"{prefix}/{entry.name}"
+            if entry.is_dir(follow_symlinks=False):
+                yield from iter_media_files(entry.path, name)
+            elif entry.is_file(follow_symlinks=False):
+                stat = entry.stat(follow_symlinks=False)
+                yield MediaFile(name, stat.st_size, stat.st_mtime)
+
+
+def iter_storage_files(storage, prefix: str) -> Iterator[MediaFile]:
+    """Файли сховища під ``prefix``: локальний каталог, бакет S3 або listdir."""
+    if isinstance(storage, FileSystemStorage):
+        yield from iter_media_files(storage.path(prefix), prefix)
+        return
+
+    bucket = getattr(storage, "bucket", None)
+    if bucket is not None:
+        location = getattr(storage, "location", "").strip("/")
+        key_prefix = f"{location}/{prefix}/" if location else f"{prefix}/"
+        # boto3 сам гортає сторінки по 1000 ключів.
+        for obj in bucket.objects.filter(Prefix=key_prefix):
+            name = obj.key[len(location) + 1 :] if location else obj.key
+            yield MediaFile(name, obj.size, obj.last_modified.timestamp())
+        return
+
+    try:
+        directories, files = storage.listdir(prefix)
+    except FileNotFoundError:
+        return
+    for file_name in files:
+        name = f"{prefix}/{file_name}"
+        yield MediaFile(
+            name, storage.size(name), storage.get_modified_time(name).timestamp()
+        )
+    for directory in directories:
+        yield from iter_storage_files(storage, f"{prefix}/{directory}")
+
+
+def _variant_owner(name: str) -> str:
+    """Ймовірний основний файл варіанту: variants/<stem>-<label>.<ext> -> <stem>.webp."""
+    stem = PurePosixPath(name).stem.rsplit("-", 1)[0]
+    return f"{IMAGES_DIR}/{stem}.webp"
+
+
+def _variant_names(variants: dict) -> set[str]:
+    return {
+        entry.get(fmt)
+        for entry in (variants or {}).values()
+        for fmt in ("webp", "avif")
+        if entry.get(fmt)
+    }
+
+
+def unreferenced(batch: list[MediaFile]) -> list[MediaFile]:
+    """Файли порції, на які немає посилань у БД (до трьох запитів на порцію)."""
+    variants_prefix = f"{VARIANTS_DIR}/"
+    mains = [item for item in batch if not item.name.startswith(variants_prefix)]
+    variants = [item for item in batch if item.name.startswith(variants_prefix)]
+
+    used = set(
+        PropertyImage.objects.filter(
+            image__in=[item.name for item in mains]
+        ).values_list("image", flat=True)
+    )
+    used_variants = set()
+    for owner_variants in PropertyImage.objects.filter(
+        image__in={_variant_owner(item.name) for item in variants}
+    ).values_list("variants", flat=True):
+        used_variants |= _variant_names(owner_variants)
+
+    orphans = [item for item in mains if item.name not in used]
+    unresolved = [item for item in variants if item.name not in used_variants]
+    if unresolved:
+        # Власника не вгадали за іменем - один пошук у JSON варіантів на порцію.
+        lookup = Q()
+        for item in unresolved:
+            lookup |= Q(variants__icontains=item.name)
+        for owner_variants in PropertyImage.objects.filter(lookup).values_list(
+            "variants", flat=True
+        ):
+            used_variants |= _variant_names(owner_variants)
+        orphans += [item for item in unresolved if item.name not in used_variants]
+    return orphans
+
+
+def collect_garbage(
+    *,
+    dry_run: bool = True,
+    grace_hours: int | None = None,
+    batch_size: int = 500,
+) -> GCReport:
+    """Знаходить (і без dry_run видаляє) файли фото без посилань у БД."""
+    storage = PropertyImage._meta.get_field("image").storage or default_storage
+    if grace_hours is None:
+        grace_hours = getattr(settings, "MEDIA_GC_GRACE_HOURS", 24)
+    cutoff = time.time() - grace_hours * 3600
+    report = GCReport()
+
+    def flush(batch):
+        orphans = unreferenced(batch)
+        report.orphans.extend(orphans)
+        if dry_run:
+            return
+        for item in orphans:
+            try:
+                storage.delete(item.name)
+                report.deleted += 1
+            except Exception as exc:
+                logger.warning("Не вдалося видалити файл %s: %s", item.name, exc)
+
+    batch = []
+    for item in iter_storage_files(storage, IMAGES_DIR):
+        report.scanned += 1
+        if item.mtime > cutoff:
+            report.skipped_recent += 1
+            continue
+        batch.append(item)
+        if len(batch) >= batch_size:
+            flush(batch)
+            batch = []
+    if batch:
+        flush(batch)
+    return report
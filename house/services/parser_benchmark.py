@@ -0,0 +1,140 @@
+"""
+Корпус HTML-презентацій для регресійних перевірок і бенчмарку парсера.
+
+Кожен ``<name>.html`` у корпусі має еталон ``<name>.json`` - результат
+``parse_property_html(...).as_dict()`` з фіксованими курсами CORPUS_RATES.
+Еталон однаковий для всіх рушіїв (lxml і BeautifulSoup).
+"""
+
+from __future__ import annotations
+
+import json
+import statistics
+import time
+import tracemalloc
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable
+
+from bs4 import BeautifulSoup
+
+from house.utils import html_fastparse
+from house.utils import html_parser as bs_engine
+from house.utils.html_parser import parse_property_html
+
+CORPUS_DIR = Path(__file__).resolve().parent.parent / "fixtures" / "parser_corpus"
+CORPUS_RATES = {"USD": 41.5, "EUR": 45.0}
+
+
+@dataclass
+class CorpusDocument:
+    name: str
+    html: str
+    golden_path: Path
+
+    @property
+    def golden(self) -> dict | None:
+        if not self.golden_path.exists():
+            return None
+        return json.loads(self.golden_path.read_text(encoding="utf-8"))
+
+    def write_golden(self, data: dict) -> None:
+        self.golden_path.write_text(
+            json.dumps(data, ensure_ascii=False, indent=2) + "\n", encoding="utf-8"
+        )
+
+
+@dataclass
+class Measurement:
+    seconds: float
+    peak_bytes: int
+
+    @property
+    def per_second(self) -> float:
+        return 1 / self.seconds if self.seconds else 0.0
+
+
+def engines() -> list[str]:
+    return ["bs4", "lxml"] if html_fastparse.AVAILABLE else ["bs4"]
+
+
+def load_corpus(directory: Path | str | None = None) -> list[CorpusDocument]:
+    directory = Path(directory or CORPUS_DIR)
+    return [
+        CorpusDocument(
+            name=path.name,
+            html=path.read_text(encoding="utf-8"),
+            golden_path=path.with_suffix(".json"),
+        )
+        for path in sorted(directory.glob("*.html"))
+    ]
+
+
+def parse_document(document: CorpusDocument, engine: str) -> dict:
+    return parse_property_html(
+        document.html, source=document.name, rates=CORPUS_RATES, engine=engine
+    ).as_dict()
+
+
+def golden_diff(expected: dict, actual: dict) -> dict[str, tuple]:
+    """Поля, що відрізняються від еталону: {поле: (еталон, факт)}."""
+    return {
+        key: (expected.get(key), actual.get(key))
+        for key in sorted(set(expected) | set(actual))
+        if expected.get(key) != actual.get(key)
+    }
+
+
+def measure(func: Callable[[], object], repeat: int) -> Measurement:
+    """
+    Медіанний час виклику та пікова пам'ять (окремий прогін під tracemalloc).
+
+    tracemalloc бачить лише Python-алокації: пам'ять дерева libxml2 (lxml) у пік
+    не потрапляє.
+    """
+    timings = []
+    for _ in range(max(repeat, 1)):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return Measurement(seconds=statistics.median(timings), peak_bytes=peak)
+
+
+def extraction_stages(html: str, engine: str) -> list[tuple[str, Callable]]:
+    """Етапи розбору окремо: побудова дерева/обхід і кожна функція витягання."""
+    if engine == "lxml":
+        root = html_fastparse.lxml_html.document_fromstring(html)
+        collector = html_fastparse._Collector()
+        collector.walk(root)
+        return [
+            ("tree", lambda: html_fastparse.lxml_html.document_fromstring(html)),
+            ("walk", lambda: html_fastparse._Collector().walk(root)),
+            ("title", lambda: html_fastparse._title(collector)),
+            ("address", lambda: html_fastparse._address(collector)),
+            ("price", lambda: html_fastparse._price_text(collector)),
+            ("rooms", lambda: html_fastparse._rooms(collector)),
+            ("area", lambda: html_fastparse._area(collector)),
+            ("description", lambda: html_fastparse._description(collector)),
+            ("images", lambda: html_fastparse._images(collector)),
+            ("coordinates", lambda: html_fastparse._coordinates(collector)),
+        ]
+
+    soup = BeautifulSoup(html, "html.parser")
+    return [
+        ("tree", lambda: BeautifulSoup(html, "html.parser")),
+        ("title", lambda: bs_engine._extract_title(soup)),
+        ("address", lambda: bs_engine._extract_address(soup)),
+        ("price", lambda: bs_engine._extract_price_text(soup)),
+        ("rooms", lambda: bs_engine._find_rooms(soup)),
+        ("area", lambda: bs_engine._extract_area(soup)),
+        ("description", lambda: bs_engine._extract_description(soup)),
+        ("images", lambda: bs_engine._extract_images(soup)),
+        ("coordinates", lambda: bs_engine._extract_coordinates(soup)),
+    ]
@@ -0,0 +1,134 @@
+"""
+Повторний обхід сторінок, з яких імпортовано об'єкти.
+
+Сторінки запитуються умовно (If-None-Match / If-Modified-Since зі
+збережених валідаторів), з тими самими лімітами на хост, що й імпорт за
+посиланнями. Відповідь 304 або тіло з тим самим хешем не розбираються;
+змінені сторінки оновлюють лише поля, що відрізняються (import_parsed_property).
+За один запуск обходиться не більше RECRAWL_BUDGET сторінок, найдавніше
+перевірені - першими.
+"""
+
+from __future__ import annotations
+
+import logging
+from datetime import timedelta
+from typing import Callable, Iterable
+
+from django.conf import settings
+from django.db.models import F
+from django.utils import timezone
+
+from house.models import Property
+from house.services.bulk_import import ImportEntry, images_payload, schedule_followup
+from house.services.html_import import parse_files
+from house.services.importer import IMPORT_UPDATED, import_parsed_property
+from house.services.link_import import PageFetcher
+
+logger = logging.getLogger(__name__)
+
+RECRAWL_NOT_MODIFIED = "not_modified"
+RECRAWL_UNCHANGED = "unchanged"
+RECRAWL_UPDATED = "updated"
+RECRAWL_FAILED = "failed"
+
+
+def due_properties(limit: int | None = None, max_age_hours: int | None = None):
+    """Об'єкти з джерелом, які не перевірялися довше за max_age_hours."""
+    if limit is None:
+        limit = getattr(settings, "RECRAWL_BUDGET", 200)
+    if max_age_hours is None:
+        max_age_hours = getattr(settings, "RECRAWL_MAX_AGE_HOURS", 24)
+    cutoff = timezone.now() - timedelta(hours=max_age_hours)
+    due = (
+        Property.objects.filter(is_archived=False)
+        .exclude(source_url="")
+        .exclude(source_checked_at__gt=cutoff)
+        .order_by(F("source_checked_at").asc(nulls_first=True), "pk")
+    )
+    return due[:limit]
+
+
+def conditional_headers(property_obj: Property) -> dict:
+    headers = {}
+    if property_obj.source_etag:
+        headers["If-None-Match"] = property_obj.source_etag
+    if property_obj.source_last_modified:
+        headers["If-Modified-Since"] = property_obj.source_last_modified
+    return headers
+
+
+def recrawl(
+    properties: Iterable[Property],
+    *,
+    on_result: Callable[[Property, str], None] | None = None,
+) -> dict[str, int]:
+    """Перевіряє джерела об'єктів; повертає кількість за кожним результатом."""
+    by_url = {
+        property_obj.source_url: property_obj
+        for property_obj in properties
+        if property_obj.source_url
+    }
+    counts = dict.fromkeys(
+        (RECRAWL_NOT_MODIFIED, RECRAWL_UNCHANGED, RECRAWL_UPDATED, RECRAWL_FAILED), 0
+    )
+    if not by_url:
+        return counts
+
+    def report(property_obj: Property, outcome: str) -> None:
+        counts[outcome] += 1
+        if on_result:
+            on_result(property_obj, outcome)
+
+    now = timezone.now()
+    fetched = PageFetcher().fetch(
+        list(by_url),
+        headers={url: conditional_headers(p) for url, p in by_url.items()},
+    )
+
+    pages, validators = [], {}
+    for result in fetched:
+        property_obj = by_url[result["url"]]
+        if "error" in result:
+            # Недоступна сторінка теж вважається перевіреною, щоб не блокувати чергу.
+            logger.info("Повторний обхід #%s: %s", property_obj.pk, result["error"])
+            Property.objects.filter(pk=property_obj.pk).update(source_checked_at=now)
+            report(property_obj, RECRAWL_FAILED)
+        elif result["status"] == 304:
+            Property.objects.filter(pk=property_obj.pk).update(source_checked_at=now)
+            report(property_obj, RECRAWL_NOT_MODIFIED)
+        elif (
+            property_obj.source_content_hash
+            == result["validators"]["source_content_hash"]
+        ):
+            Property.objects.filter(pk=property_obj.pk).update(**result["validators"])
+            report(property_obj, RECRAWL_UNCHANGED)
+        else:
+            pages.append((result["url"], result["html"].encode("utf-8")))
+            validators[result["url"]] = result["validators"]
+
+    followup = []
+    for result in parse_files(pages):
+        url = result["file"]
+        property_obj = by_url[url]
+        if "data" not in result:
+            logger.info("Повторний обхід #%s: сторінку не розібрано", property_obj.pk)
+            Property.objects.filter(pk=property_obj.pk).update(source_checked_at=now)
+            report(property_obj, RECRAWL_FAILED)
+            continue
+        outcome = import_parsed_property(
+            result["data"],
+            source_url=url,
+            with_images=False,
+            validators=validators[url],
+        )
+        images = images_payload(result["data"])
+        if outcome.status == IMPORT_UPDATED and images:
+            followup.append(ImportEntry(instance=outcome.property, images=images))
+        report(
+            outcome.property,
+            RECRAWL_UPDATED if outcome.status == IMPORT_UPDATED else RECRAWL_UNCHANGED,
+        )
+    if followup:
+        schedule_followup(followup, geocode=False)
+    return counts
@@ -0,0 +1,205 @@
+"""
+Довговічна черга задач у базі даних.
+
+Задачі реєструються декоратором ``@task`` у модулях ``<app>/tasks.py``
+(автоматично імпортуються при старті), ставляться в чергу через ``enqueue``
+і виконуються командою ``manage.py run_worker``. Якщо TASK_QUEUE_ENABLED
+вимкнено, ``enqueue`` передає задачу в пул потоків фонових задач (jobs.py),
+а з BACKGROUND_JOBS_EAGER виконує одразу; помилка задачі лише логується і
+не виходить назовні (наприклад, із save() через on_commit).
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import socket
+from datetime import timedelta
+from typing import Callable
+
+from django.conf import settings
+from django.db import close_old_connections, connection, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from house.models import Task
+
+logger = logging.getLogger(__name__)
+
+_REGISTRY: dict[str, tuple[Callable, int | None]] = {}
+
+
+def task(name: str, *, max_attempts: int | None = None):
+    """Реєструє функцію як задачу черги; payload передається як kwargs."""
+
+    def decorator(func: Callable) -> Callable:
+        _REGISTRY[name] = (func, max_attempts)
+        return func
+
+    return decorator
+
+
+def queue_enabled() -> bool:
+    return getattr(settings, "TASK_QUEUE_ENABLED", False)
+
+
+def enqueue(name: str, payload: dict | None = None, *, delay: int = 0) -> Task | None:
+    """Ставить задачу в чергу (або виконує одразу, якщо черга вимкнена)."""
+    if name not in _REGISTRY:
+        raise ValueError(f"Невідома задача: {name}")
+    payload = payload or {}
+    func, max_attempts = _REGISTRY[name]
+
+    if not queue_enabled():
+        if getattr(settings, "BACKGROUND_JOBS_EAGER", False):
+            _run_inline(name, func, payload)
+        else:
+            from house.services.jobs import _get_executor
+
+            _get_executor().submit(_run_in_thread, name, func, payload)
+        return None
+
+    return Task.objects.create(
+        name=name,
+        payload=payload,
+        run_at=timezone.now() + timedelta(seconds=delay),
+        max_attempts=max_attempts or getattr(settings, "TASK_MAX_ATTEMPTS", 5),
+    )
+
+
+def _run_inline(name: str, func: Callable, payload: dict) -> None:
+    try:
+        func(**payload)
+    except Exception:
+        logger.exception("Задача %s завершилась помилкою", name)
+
+
+def _run_in_thread(name: str, func: Callable, payload: dict) -> None:
+    close_old_connections()
+    try:
+        _run_inline(name, func, payload)
+    finally:
+        connection.close()
+
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def heartbeat(worker_id: str) -> int:
+    """Оновлює locked_at задач, які воркер ще виконує, щоб їх не вважали завислими."""
+    return Task.objects.filter(status=Task.STATUS_RUNNING, locked_by=worker_id).update(
+        locked_at=timezone.now()
+    )
+
+
+def _requeue_stale(now) -> None:
+    """
+    Повертає в чергу задачі, чий воркер завис або впав (без heartbeat довше
+    за TASK_LOCK_TIMEOUT). Задачі без спроб, що лишилися, позначаються
+    помилкою, а не запускаються вдруге.
+    """
+    lock_timeout = getattr(settings, "TASK_LOCK_TIMEOUT", 900)
+    stale = Task.objects.filter(
+        status=Task.STATUS_RUNNING,
+        locked_at__lt=now - timedelta(seconds=lock_timeout),
+    )
+    stale.filter(attempts__gte=F("max_attempts")).update(
+        status=Task.STATUS_FAILED,
+        locked_at=None,
+        locked_by="",
+        finished_at=now,
+        last_error="Воркер не відповідав довше за TASK_LOCK_TIMEOUT.",
+    )
+    stale.update(status=Task.STATUS_QUEUED, locked_at=None, locked_by="")
+
+
+def claim_tasks(limit: int, worker_id: str | None = None) -> list[int]:
+    """
+    Атомарно забирає до ``limit`` готових задач і позначає їх як running.
+
+    На PostgreSQL використовується SELECT ... FOR UPDATE SKIP LOCKED, тож
+    кілька воркерів не чекають один на одного. На SQLite записи й так
+    серіалізуються, тому достатньо умовного UPDATE по status.
+    """
+    if limit <= 0:
+        return []
+    worker_id = worker_id or default_worker_id()
+    now = timezone.now()
+    _requeue_stale(now)
+
+    ready = Task.objects.filter(status=Task.STATUS_QUEUED, run_at__lte=now).order_by(
+        "run_at", "id"
+    )
+    claim_fields = {
+        "status": Task.STATUS_RUNNING,
+        "locked_at": now,
+        "locked_by": worker_id,
+        "attempts": F("attempts") + 1,
+    }
+
+    with transaction.atomic():
+        if connection.features.has_select_for_update_skip_locked:
+            ids = list(
+                ready.select_for_update(skip_locked=True).values_list("id", flat=True)[
+                    :limit
+                ]
+            )
+            Task.objects.filter(id__in=ids).update(**claim_fields)
+            return ids
+
+        claimed = []
+        for task_id in ready.values_list("id", flat=True)[:limit]:
+            if Task.objects.filter(id=task_id, status=Task.STATUS_QUEUED).update(
+                **claim_fields
+            ):
+                claimed.append(task_id)
+        return claimed
+
+
+def _retry_delay(attempts: int) -> int:
+    base = getattr(settings, "TASK_RETRY_BACKOFF", 30)
+    cap = getattr(settings, "TASK_RETRY_MAX_DELAY", 3600)
+    return min(base * 2 ** max(attempts - 1, 0), cap)
+
+
+def run_task(task_id: int) -> Task | None:
+    """Виконує заклеймлену задачу й фіксує результат або планує повтор."""
+    task_obj = Task.objects.filter(pk=task_id, status=Task.STATUS_RUNNING).first()
+    if task_obj is None:
+        return None
+
+    entry = _REGISTRY.get(task_obj.name)
+    try:
+        if entry is None:
+            raise LookupError(f"Задача {task_obj.name} не зареєстрована.")
+        entry[0](**task_obj.payload)
+    except Exception as exc:
+        logger.exception("Задача %s #%s завершилась помилкою", task_obj.name, task_id)
+        task_obj.last_error = f"{type(exc).__name__}: {exc}"
+        if entry is not None and task_obj.attempts < task_obj.max_attempts:
+            task_obj.status = Task.STATUS_QUEUED
+            task_obj.run_at = timezone.now() + timedelta(
+                seconds=_retry_delay(task_obj.attempts)
+            )
+        else:
+            task_obj.status = Task.STATUS_FAILED
+            task_obj.finished_at = timezone.now()
+    else:
+        task_obj.status = Task.STATUS_DONE
+        task_obj.last_error = ""
+        task_obj.finished_at = timezone.now()
+
+    task_obj.locked_at = None
+    task_obj.locked_by = ""
+    task_obj.save(
+        update_fields=[
+            "status",
+            "run_at",
+            "last_error",
+            "finished_at",
+            "locked_at",
+            "locked_by",
+        ]
+    )
+    return task_obj
@@ -0,0 +1,182 @@
+"""
+Імпорт об'єктів із ZIP-архіву HTML-сторінок разом з їхніми фото.
+
+Архів зберігається у сховище потоком і читається з нього по одному файлу
+(без розпакування на диск). Сторінки розбираються порціями через
+html_import.parse_files (пул процесів для великих порцій) і записуються
+пакетом; фото, на які сторінка посилається відносним шляхом усередині
+архіву, прикріплюються прямо з архіву, без HTTP-запитів.
+"""
+
+from __future__ import annotations
+
+import posixpath
+import uuid
+import zipfile
+from urllib.parse import unquote, urlparse
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+
+from house.models import BackgroundJob, Property
+from house.services.html_import import parse_files, save_parsed
+from house.services.images import ingest_images
+from house.services.jobs import job_handler, start_job
+from house.utils.currency import get_exchange_rates
+
+UPLOAD_DIR = "imports/zip"
+HTML_SUFFIXES = (".html", ".htm")
+
+
+def _html_members(archive: zipfile.ZipFile) -> list[zipfile.ZipInfo]:
+    return [
+        info
+        for info in archive.infolist()
+        if not info.is_dir()
+        and info.filename.lower().endswith(HTML_SUFFIXES)
+        and not posixpath.basename(info.filename).startswith(".")
+        and not info.filename.startswith("__MACOSX/")
+    ]
+
+
+def start_zip_import_job(uploaded) -> BackgroundJob:
+    """
+    Зберігає завантажений архів у сховище й ставить імпорт у фон.
+
+    ValueError - якщо це не ZIP або в ньому немає HTML-сторінок.
+    """
+    try:
+        with zipfile.ZipFile(uploaded) as archive:
+            total = len(_html_members(archive))
+    except zipfile.BadZipFile:
+        raise ValueError("Файл не є ZIP-архівом.") from None
+    if not total:
+        raise ValueError("В архіві немає HTML-сторінок.")
+    uploaded.seek(0)
+    path = default_storage.save(f"{UPLOAD_DIR}/{uuid.uuid4().hex}.zip", uploaded)
+    return start_job(
+        "zip_import",
+        {"path": path, "name": getattr(uploaded, "name", "archive.zip")},
+        total=total,
+    )
+
+
+def local_image(page: str, ref: str | None, names: set[str]) -> str | None:
+    """Ім'я файлу в архіві, на який посилається ``ref`` зі сторінки ``page``."""
+    if not ref:
+        return None
+    parsed = urlparse(ref)
+    if parsed.scheme or parsed.netloc:
+        return None
+    path = posixpath.normpath(
+        posixpath.join(posixpath.dirname(page), unquote(parsed.path))
+    )
+    return path if path in names else None
+
+
+def _split_images(page: str, data: dict, names: set[str]) -> list[tuple[str, bool]]:
+    """
+    Відокремлює фото з архіву від зовнішніх URL.
+
+    Повертає [(ім'я в архіві, головне?)]; у ``data`` лишаються тільки зовнішні
+    URL, які завантажить звичайна фонова задача імпорту.
+    """
+    local = []
+    main = local_image(page, data.get("main_image"), names)
+    if main:
+        local.append((main, True))
+        data["main_image"] = None
+    gallery = []
+    for ref in data.get("gallery") or []:
+        name = local_image(page, ref, names)
+        if name is None:
+            gallery.append(ref)
+        elif name not in {item for item, _ in local}:
+            local.append((name, False))
+    data["gallery"] = gallery
+    return local
+
+
+def _read_member(archive: zipfile.ZipFile, info: zipfile.ZipInfo, limit: int):
+    if info.file_size > limit:
+        raise ValueError(f"Файл більший за {limit} байт.")
+    with archive.open(info) as fh:
+        raw = fh.read(limit + 1)
+    if len(raw) > limit:  # розмір у заголовку архіву не збігся з вмістом
+        raise ValueError(f"Файл більший за {limit} байт.")
+    return raw
+
+
+def attach_local_images(
+    archive: zipfile.ZipFile, property_obj, images: list[tuple[str, bool]]
+) -> tuple[int, list[str]]:
+    """Додає фото з архіву одним пакетом; повертає (кількість, попередження)."""
+    limit = getattr(settings, "IMAGE_FETCH_MAX_BYTES", 15 * 1024 * 1024)
+    files, warnings, main_index = [], [], None
+    for name, is_main in images:
+        try:
+            raw = _read_member(archive, archive.getinfo(name), limit)
+        except ValueError as exc:
+            warnings.append(f"{name}: {exc}")
+            continue
+        if is_main:
+            main_index = len(files)
+        files.append(ContentFile(raw, name=posixpath.basename(name)))
+    if not files:
+        return 0, warnings
+    created, errors = ingest_images(property_obj, files, main_index=main_index)
+    warnings.extend(f"{error['file']}: {error['error']}" for error in errors)
+    return len(created), warnings
+
+
+@job_handler("zip_import")
+def run_zip_import_job(job: BackgroundJob) -> dict:
+    batch_size = getattr(settings, "ZIP_IMPORT_BATCH_SIZE", 50)
+    max_html = getattr(settings, "ZIP_IMPORT_MAX_HTML_BYTES", 5 * 1024 * 1024)
+    rates = get_exchange_rates()
+    created, errors = [], []
+
+    def on_result(result):
+        ok = "data" in result
+        job.advance(processed=int(ok), failed=int(not ok))
+
+    try:
+        with default_storage.open(job.payload["path"], "rb") as fh:
+            archive = zipfile.ZipFile(fh)
+            names = set(archive.namelist())
+            members = _html_members(archive)
+            for start in range(0, len(members), batch_size):
+                pages = []
+                for info in members[start : start + batch_size]:
+                    try:
+                        pages.append(
+                            (info.filename, _read_member(archive, info, max_html))
+                        )
+                    except ValueError as exc:
+                        errors.append({"file": info.filename, "error": str(exc)})
+                        job.advance(failed=1)
+
+                results = parse_files(pages, rates=rates, on_result=on_result)
+                local = {
+                    result["file"]: _split_images(result["file"], result["data"], names)
+                    for result in results
+                    if "data" in result
+                }
+                batch_created, batch_errors = save_parsed(results)
+                errors.extend(batch_errors)
+                properties = Property.objects.in_bulk(
+                    [item["id"] for item in batch_created]
+                )
+                for item in batch_created:
+                    attached, warnings = attach_local_images(
+                        archive,
+                        properties[item["id"]],
+                        local.get(item["file"], []),
+                    )
+                    item["images"] = attached
+                    item["warnings"] += warnings
+                created.extend(batch_created)
+    finally:
+        default_storage.delete(job.payload["path"])
+    return {"created": created, "errors": errors}
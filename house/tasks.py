@@ -0,0 +1,99 @@
+"""Задачі черги для об'єктів нерухомості (див. house/services/tasks.py)."""
+
+import logging
+
+from django.conf import settings
+
+from house.models import Property, PropertyImage, Task
+from house.services.duplicates import index_properties
+from house.services.images import process_image
+from house.services.importer import import_images
+from house.services.jobs import run_job
+from house.services.media_gc import collect_garbage
+from house.services.recrawl import due_properties, recrawl
+from house.services.tasks import enqueue, queue_enabled, task
+
+logger = logging.getLogger(__name__)
+
+
+@task("jobs.run", max_attempts=1)
+def run_background_job(job_id):
+    run_job(job_id)
+
+
+@task("property.geocode")
+def geocode_property(property_id):
+    property_obj = Property.objects.filter(pk=property_id).first()
+    if property_obj is None or not property_obj.address:
+        return
+    if property_obj.fetch_coordinates():
+        Property.objects.filter(pk=property_id).update(
+            latitude=property_obj.latitude, longitude=property_obj.longitude
+        )
+    else:
+        logger.info("Координати для об'єкта #%s не знайдено", property_id)
+
+
+@task("property.import_images")
+def import_property_images(property_id, data):
+    property_obj = Property.objects.filter(pk=property_id).first()
+    if property_obj is None:
+        return
+    timeout = getattr(settings, "REQUESTS_TIMEOUT", 10)
+    for warning in import_images(property_obj, data, timeout=timeout):
+        logger.warning("Імпорт фото для об'єкта #%s: %s", property_id, warning)
+
+
+@task("property.signature")
+def update_property_signatures(property_ids):
+    index_properties(
+        Property.objects.filter(pk__in=property_ids).only("address", "description")
+    )
+
+
+@task("images.process")
+def process_property_image(image_id):
+    image_obj = PropertyImage.objects.filter(pk=image_id).first()
+    if image_obj is None or not image_obj.image or image_obj.variants:
+        return
+    process_image(image_obj)
+
+
+@task("property.recrawl", max_attempts=1)
+def recrawl_sources(schedule=False):
+    counts = recrawl(due_properties())
+    logger.info("Повторний обхід джерел: %s", counts)
+    # Періодичний запуск: наступний обхід ставиться в чергу, якщо його ще немає.
+    if (
+        schedule
+        and queue_enabled()
+        and not Task.objects.filter(
+            name="property.recrawl", status=Task.STATUS_QUEUED
+        ).exists()
+    ):
+        enqueue(
+            "property.recrawl",
+            {"schedule": True},
+            delay=getattr(settings, "RECRAWL_INTERVAL_MINUTES", 60) * 60,
+        )
+
+
+@task("media.gc", max_attempts=1)
+def collect_media_garbage(schedule=False):
+    report = collect_garbage(dry_run=False)
+    logger.info(
+        "Прибирання медіа: перевірено %s, видалено %s файлів (%s байт)",
+        report.scanned,
+        report.deleted,
+        report.orphan_bytes,
+    )
+    if (
+        schedule
+        and queue_enabled()
+        and not Task.objects.filter(name="media.gc", status=Task.STATUS_QUEUED).exists()
+    ):
+        enqueue(
+            "media.gc",
+            {"schedule": True},
+            delay=getattr(settings, "MEDIA_GC_INTERVAL_HOURS", 24) * 3600,
+        )
@@ -0,0 +1,45 @@
+from django import template
+
+from house.services.images import srcset, variant_url
+
+register = template.Library()
+
+CARD_SIZES = "(min-width: 1024px) 33vw, (min-width: 640px) 50vw, 100vw"
+
+
+@register.filter
+def image_variant(image_obj, label):
+    """URL варіанту фото (thumb/card/gallery/full) або оригіналу, якщо варіантів ще немає."""
+    if not image_obj or not image_obj.image:
+        return ""
+    return variant_url(image_obj.variants, label) or image_obj.image.url
+
+
+@register.filter
+def placeholder_style(image_obj):
+    """Inline-стиль заглушки: основний колір і розмитий крихітний WebP під фото."""
+    if not image_obj:
+        return ""
+    rules = []
+    if image_obj.dominant_color:
+        rules.append(f"background-color: {image_obj.dominant_color}")
+    if image_obj.placeholder:
+        rules.append(
+            f"background-image: url('{image_obj.placeholder}'); "
+            "background-size: cover; background-position: center"
+        )
+    return "; ".join(rules)
+
+
+@register.inclusion_tag("partials/responsive_image.html")
+def responsive_image(image_obj, label="card", css_class="", alt="", sizes=CARD_SIZES):
+    variants = image_obj.variants if image_obj else None
+    return {
+        "src": image_variant(image_obj, label),
+        "srcset": srcset(variants),
+        "avif_srcset": srcset(variants, "avif"),
+        "style": placeholder_style(image_obj),
+        "sizes": sizes,
+        "css_class": css_class,
+        "alt": alt,
+    }
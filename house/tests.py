@@ -1,14 +1,82 @@
 import json
-from unittest.mock import Mock, patch
+import os
+import shutil
+import tempfile
+import time
+import zipfile
+from datetime import timedelta
+from io import BytesIO, StringIO
+from unittest.mock import MagicMock, Mock, patch
 
-from django.test import Client, SimpleTestCase, TestCase
+import requests
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import InMemoryStorage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.template import Context, Template
+from django.test import Client, SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from django.utils import timezone
+from PIL import Image
 
-from house.models import DealType, Property, PropertyType
-from house.services.importer import import_property_from_url
+from accounts.models import CustomUser
+from house.models import (
+    BackgroundJob,
+    DealType,
+    Feature,
+    GeocodeCache,
+    Property,
+    PropertyImage,
+    PropertyType,
+    Task,
+)
+from house.services import recrawl as recrawl_service
+from house.services.bulk_import import bulk_import_properties
+from house.services.duplicates import (
+    index_properties,
+    parsed_duplicate_warnings,
+    possible_duplicates,
+)
+from house.services.geocoding import geocode_address
+from house.services.images import ingest_images, release_image_files, srcset
+from house.services.importer import (
+    IMPORT_CREATED,
+    IMPORT_UNCHANGED,
+    IMPORT_UPDATED,
+    import_images,
+    import_parsed_property,
+    import_property_from_url,
+)
+from house.services.link_import import import_links
+from house.services.media_gc import iter_storage_files
+from house.services.parser_benchmark import (
+    CORPUS_RATES,
+    engines,
+    golden_diff,
+    load_corpus,
+    parse_document,
+)
+from house.services.tasks import claim_tasks, enqueue, heartbeat, run_task
+from house.utils import html_fastparse
+from house.utils.extraction_profiles import profile_for_source
 from house.utils.html_parser import parse_property_html
 
 
+class StaffClientMixin:
+    """API імпорту й керування фото доступне лише співробітникам."""
+
+    def login_staff(self) -> Client:
+        self.client.force_login(
+            CustomUser.objects.create_user(
+                username="staff", password="pass12345", is_staff=True
+            )
+        )
+        return self.client
+
+
 class PropertyApiSmokeTest(TestCase):
     def setUp(self):
         self.client = Client()
@@ -60,8 +128,86 @@ class PropertyApiSmokeTest(TestCase):
         self.assertEqual(created.property_type, self.property_type)
         self.assertEqual(created.deal_type, self.deal_type)
 
+    def test_batch_preserves_order_and_reports_missing(self):
+        first, second = [
+            Property.objects.create(
+                title=title,
+                address="Київ",
+                latitude=50.45,
+                longitude=30.52,
+                price=100000,
+                area=50,
+                rooms=2,
+                property_type=self.property_type,
+                deal_type=self.deal_type,
+            )
+            for title in ("Перша", "Друга")
+        ]
+
+        url = reverse("house_api:property_batch")
+        with self.assertNumQueries(3):
+            response = self.client.get(
+                url, {"ids": f"{second.id},999999,{first.id}", "slugs": "missing"}
+            )
+
+        self.assertEqual(response.status_code, 200)
+        payload = response.json()
+        self.assertEqual(
+            [item["id"] for item in payload["results"]], [second.id, first.id]
+        )
+        self.assertEqual(payload["missing"], {"ids": [999999], "slugs": ["missing"]})
+
+        by_slug = self.client.get(url, {"slugs": first.slug}).json()
+        self.assertEqual([item["id"] for item in by_slug["results"]], [first.id])
+
+        with override_settings(PROPERTY_BATCH_MAX_ITEMS=2):
+            too_many = self.client.get(url, {"ids": "1,2,2", "slugs": "a"})
+            self.assertEqual(too_many.status_code, 400)
+            deduplicated = self.client.get(url, {"ids": "1,1,1", "slugs": "a"})
+            self.assertEqual(deduplicated.status_code, 200)
+
 
 class HtmlParserTest(SimpleTestCase):
+    PRESENTATION = """
+    <!DOCTYPE html>
+    <html>
+      <head>
+        <title>Запасний заголовок</title>
+        <meta name="geo.position" content="50.1; 30.2" />
+      </head>
+      <body>
+        <h1> Продаж  квартири </h1>
+        <div class="pdf-header-contacts"><strong>100 000 <b>$</b></strong></div>
+        <p>Адреса: <span>вул. Хрещатик, 1</span></p>
+        <div class="pdf-block">Шапка</div>
+        <div class="pdf-block  wide" data-note='a "b"'>Опис &amp; деталі<br>
+          <!-- примітка --><a href="/x?a=1&b=2" rel="nofollow  noopener">Лінк</a>
+        </div>
+        <div class="pdf-img"><img src="main.jpg" /></div>
+        <div id="estate-images">
+          <a href="g1.jpg"><img src="t1.jpg" /></a><a href="g2.jpg"><img src="g1.jpg" /></a>
+        </div>
+        <span><img src="/i/_room-icon.svg" /> 3 кімнати</span>
+        <table><tr><th>Площа</th><td>72,5 м²</td></tr></table>
+      </body>
+    </html>
+    """
+
+    def test_engines_return_identical_result(self):
+        if not html_fastparse.AVAILABLE:
+            self.skipTest("lxml не встановлено")
+        rates = {"USD": 40}
+        soup = parse_property_html(self.PRESENTATION, rates=rates, engine="bs4")
+        fast = parse_property_html(self.PRESENTATION, rates=rates, engine="lxml")
+
+        self.assertEqual(fast, soup)
+        self.assertEqual(fast.title, "Продаж квартири")
+        self.assertEqual(fast.address, "Адреса: вул. Хрещатик, 1")
+        self.assertEqual((fast.price, fast.rooms, fast.area), (100000.0, 3, 72.5))
+        self.assertEqual((fast.latitude, fast.longitude), (50.1, 30.2))
+        self.assertEqual(fast.gallery, ["g1.jpg", "g2.jpg", "t1.jpg"])
+        self.assertTrue(fast.description_html.startswith('<div class="pdf-block wide"'))
+
     def test_parse_minimal_document(self):
         html = """
         <html>
@@ -109,6 +255,53 @@ class HtmlParserTest(SimpleTestCase):
         self.assertIsNone(parsed.longitude)
 
 
+class ParserCorpusTest(SimpleTestCase):
+    def test_corpus_matches_golden_output(self):
+        documents = load_corpus()
+        self.assertGreaterEqual(len(documents), 5)
+        for document in documents:
+            for engine in engines():
+                with self.subTest(document=document.name, engine=engine):
+                    self.assertIsNotNone(document.golden)
+                    self.assertEqual(
+                        golden_diff(document.golden, parse_document(document, engine)),
+                        {},
+                    )
+
+    def test_benchmark_command_reports_each_document(self):
+        out = StringIO()
+        call_command(
+            "benchmark_parser", repeat=1, functions=True, check=True, stdout=out
+        )
+        report = out.getvalue()
+        for document in load_corpus():
+            self.assertIn(document.name, report)
+        self.assertIn("док/с", report)
+
+    @override_settings(HTML_EXTRACTION_PROFILES={"partner.test": "pdf_export"})
+    def test_domain_profile_skips_generic_cascade(self):
+        self.assertIsNone(profile_for_source("pdf_export.html"))
+        self.assertIsNone(profile_for_source("https://other.test/objects/1"))
+        self.assertEqual(
+            profile_for_source("https://www.crm.partner.test/objects/1").name,
+            "pdf_export",
+        )
+
+        document = next(doc for doc in load_corpus() if doc.name == "pdf_export.html")
+        source = "https://crm.partner.test/objects/1021"
+        with patch.object(
+            html_fastparse._Collector, "walk", side_effect=AssertionError
+        ), patch(
+            "house.utils.html_parser._extract_coordinates", side_effect=AssertionError
+        ):
+            for engine in engines():
+                with self.subTest(engine=engine):
+                    parsed = parse_property_html(
+                        document.html, source=source, rates=CORPUS_RATES, engine=engine
+                    )
+                    self.assertEqual(golden_diff(document.golden, parsed.as_dict()), {})
+
+
 class ImporterServiceTest(TestCase):
     @patch("house.utils.html_parser.get_exchange_rates", return_value={"USD": 40})
     @patch("house.services.importer.requests.get")
@@ -131,6 +324,7 @@ class ImporterServiceTest(TestCase):
         response = Mock()
         response.text = html
         response.content = html.encode("utf-8")
+        response.headers = {}
         response.raise_for_status = Mock()
         mock_get.return_value = response
 
@@ -146,3 +340,1111 @@ class ImporterServiceTest(TestCase):
 
         self.assertEqual(PropertyType.objects.count(), 1)
         self.assertEqual(DealType.objects.count(), 1)
+
+    @patch("house.services.image_fetcher.requests.Session.get")
+    def test_import_images_fetches_each_url_once(self, mock_get):
+        def fake_get(url, **kwargs):
+            response = MagicMock()
+            response.__enter__.return_value = response
+            response.headers = {
+                "Content-Type": "text/html" if url.endswith(".html") else "image/jpeg"
+            }
+            response.iter_content.return_value = [b"\xff\xd8", url.encode()]
+            return response
+
+        mock_get.side_effect = fake_get
+        property_obj = Property.objects.create(
+            title="Будинок",
+            address="Київ",
+            latitude=50.4,
+            longitude=30.5,
+            price=1000,
+            area=40,
+            rooms=1,
+        )
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+
+        with override_settings(MEDIA_ROOT=media_root):
+            warnings = import_images(
+                property_obj,
+                {
+                    "main_image": "https://cdn.example.com/a.jpg",
+                    "gallery": [
+                        "https://cdn.example.com/a.jpg",
+                        "https://cdn.example.com/b",
+                        "https://cdn.example.com/page.html",
+                    ],
+                },
+                timeout=5,
+            )
+
+        self.assertEqual(mock_get.call_count, 3)
+        self.assertEqual(len(warnings), 1)
+        self.assertIn("page.html", warnings[0])
+        images = list(property_obj.images.order_by("id"))
+        self.assertEqual(len(images), 2)
+        self.assertTrue(images[0].is_main)
+        self.assertTrue(images[1].image.name.endswith(".jpg"))
+
+    @patch("house.services.image_fetcher.requests.Session.get")
+    def test_reimport_is_noop_or_updates_only_differences(self, mock_get):
+        def fake_get(url, **kwargs):
+            response = MagicMock()
+            response.__enter__.return_value = response
+            response.headers = {"Content-Type": "image/jpeg"}
+            response.iter_content.return_value = [b"\xff\xd8", url.encode()]
+            return response
+
+        mock_get.side_effect = fake_get
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        url = "https://partner.example.com/objects/7"
+        parsed = {
+            "title": "Продаж квартири",
+            "address": "Київ, вул. Прикладна, 7",
+            "price": 70000.0,
+            "area": 50.0,
+            "rooms": 2,
+            "description_html": "<p>Опис</p>",
+            "main_image": "https://cdn.example.com/7/a.jpg",
+            "gallery": ["https://cdn.example.com/7/b.jpg"],
+            "property_type": "Квартира",
+            "deal_type": "Продаж",
+            "latitude": 50.4,
+            "longitude": 30.5,
+        }
+
+        with override_settings(MEDIA_ROOT=media_root):
+            created = import_parsed_property(parsed, source_url=url)
+            self.assertEqual(created.status, IMPORT_CREATED)
+            self.assertEqual(mock_get.call_count, 2)
+
+            with self.assertNumQueries(1):
+                again = import_parsed_property(dict(parsed), source_url=url)
+            self.assertEqual(again.status, IMPORT_UNCHANGED)
+
+            changed = dict(
+                parsed,
+                price=72000.0,
+                title="  Продаж  квартири ",
+                gallery=["https://cdn.example.com/7/c.jpg"],
+            )
+            updated = import_parsed_property(changed, source_url=url)
+
+        self.assertEqual(updated.status, IMPORT_UPDATED)
+        self.assertEqual(updated.property.pk, created.property.pk)
+        self.assertEqual(updated.changed, ["title", "price"])
+        self.assertEqual(mock_get.call_count, 3)
+        self.assertEqual(Property.objects.count(), 1)
+        self.assertEqual(
+            sorted(created.property.images.values_list("source_url", flat=True)),
+            ["https://cdn.example.com/7/a.jpg", "https://cdn.example.com/7/c.jpg"],
+        )
+
+
+class PropertyBulkUpdateApiTest(StaffClientMixin, TestCase):
+    def setUp(self):
+        self.login_staff()
+        self.property_type = PropertyType.objects.create(name="Квартира", slug="flat")
+        self.deal_type = DealType.objects.create(name="Продаж")
+        self.balcony = Feature.objects.create(name="Балкон")
+        self.parking = Feature.objects.create(name="Паркінг")
+        self.first, self.second = [
+            Property.objects.create(
+                title=title,
+                address="Київ",
+                latitude=50.45,
+                longitude=30.52,
+                price=100000,
+                area=50,
+                rooms=2,
+                property_type=self.property_type,
+                deal_type=self.deal_type,
+            )
+            for title in ("Перша", "Друга")
+        ]
+        self.first.features.set([self.balcony])
+
+    def test_bulk_update_applies_valid_items_and_reports_errors(self):
+        payload = {
+            "items": [
+                {
+                    "id": self.first.id,
+                    "price": 95000,
+                    "add_feature_ids": [self.parking.id],
+                },
+                {"id": self.second.id, "feature_ids": [self.balcony.id], "rooms": 2},
+                {"id": 999999, "price": 1},
+                {"id": self.second.id, "price": 1},
+                {"id": self.first.id + 1000, "property_type_id": 123},
+            ]
+        }
+        response = self.client.post(
+            reverse("house_api:property_bulk_update"),
+            data=json.dumps(payload),
+            content_type="application/json",
+        )
+
+        self.assertEqual(response.status_code, 207)
+        body = response.json()
+        statuses = [item["status"] for item in body["results"]]
+        self.assertEqual(statuses, ["updated", "updated", "error", "error", "error"])
+        self.assertEqual(body["results"][0]["fields"], ["features", "price"])
+        self.assertEqual(body["results"][1]["fields"], ["features"])
+
+        self.first.refresh_from_db()
+        self.second.refresh_from_db()
+        self.assertEqual(self.first.price, 95000)
+        self.assertEqual(self.second.price, 100000)
+        self.assertEqual(
+            set(self.first.features.values_list("id", flat=True)),
+            {self.balcony.id, self.parking.id},
+        )
+        self.assertEqual(
+            list(self.second.features.values_list("id", flat=True)), [self.balcony.id]
+        )
+
+    def test_address_change_geocodes_in_background_job(self):
+        with patch("house.services.bulk_import.start_job") as start_job, patch.object(
+            Property, "fetch_coordinates"
+        ) as fetch:
+            with self.captureOnCommitCallbacks(execute=True):
+                response = self.client.post(
+                    reverse("house_api:property_bulk_update"),
+                    data=json.dumps([{"id": self.first.id, "address": "Львів"}]),
+                    content_type="application/json",
+                )
+
+        self.assertEqual(response.status_code, 200)
+        fetch.assert_not_called()
+        start_job.assert_called_once_with(
+            "import_followup",
+            {"geocode_ids": [self.first.id], "images": {}},
+            total=1,
+        )
+
+    def test_bulk_update_requires_staff(self):
+        self.client.logout()
+        response = self.client.post(
+            reverse("house_api:property_bulk_update"),
+            data=json.dumps([{"id": self.first.id, "price": 1}]),
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 302)
+
+
+class PropertyBulkImportTest(StaffClientMixin, TestCase):
+    def setUp(self):
+        self.login_staff()
+        self.property_type = PropertyType.objects.create(name="Квартира", slug="flat")
+        self.balcony = Feature.objects.create(name="Балкон")
+
+    def test_import_inserts_in_bulk_and_defers_geocoding(self):
+        items = [
+            {
+                "title": f"Квартира {index}",
+                "address": "Київ",
+                "latitude": 50.45,
+                "longitude": 30.52,
+                "price": 50000 + index,
+                "area": 40,
+                "rooms": 1,
+                "property_type_id": self.property_type.id,
+                "feature_ids": [self.balcony.id],
+            }
+            for index in range(5)
+        ]
+        items.append(
+            {
+                "title": "Без координат",
+                "address": "Львів",
+                "price": 1,
+                "area": 1,
+                "rooms": 1,
+            }
+        )
+        items.append({"title": "Без ціни", "area": 10, "rooms": 1})
+        items.append(
+            {
+                "title": "Чужий тип",
+                "price": 1,
+                "area": 1,
+                "rooms": 1,
+                "property_type_id": 999,
+            }
+        )
+
+        response = self.client.post(
+            reverse("house_api:property_import"),
+            data=json.dumps({"items": items}),
+            content_type="application/json",
+        )
+
+        self.assertEqual(response.status_code, 207)
+        data = response.json()
+        self.assertEqual(len(data["created"]), 6)
+        self.assertEqual([error["index"] for error in data["errors"]], [7, 8])
+        created = Property.objects.filter(id__in=data["created"])
+        self.assertEqual(len({prop.slug for prop in created}), 6)
+        self.assertTrue(all(prop.slug for prop in created))
+        self.assertEqual(
+            Property.features.through.objects.filter(
+                property_id__in=data["created"]
+            ).count(),
+            5,
+        )
+        job = BackgroundJob.objects.get(kind="import_followup")
+        self.assertEqual(len(job.payload["geocode_ids"]), 1)
+        self.assertEqual(job.status, BackgroundJob.STATUS_PENDING)
+
+    @override_settings(PROPERTY_IMPORT_CHUNK_SIZE=2)
+    def test_ndjson_import_streams_chunks_and_reports_lines(self):
+        row = {"address": "Київ", "latitude": 50.45, "longitude": 30.52, "area": 40}
+        lines = [
+            json.dumps({**row, "title": "Квартира 1", "price": 1, "rooms": 1}),
+            "",
+            "{не json",
+            json.dumps({**row, "title": "Квартира 2", "price": 2, "rooms": 2}),
+            json.dumps({**row, "title": "Без ціни", "rooms": 1}),
+            json.dumps([1, 2]),
+            json.dumps({**row, "title": "Квартира 3", "price": 3, "rooms": 3}),
+        ]
+
+        with patch(
+            "house.api.views.bulk_import_properties", wraps=bulk_import_properties
+        ) as bulk:
+            response = self.client.post(
+                reverse("house_api:property_import"),
+                data="\n".join(lines).encode("utf-8"),
+                content_type="application/x-ndjson",
+            )
+
+        self.assertEqual(response.status_code, 207)
+        data = response.json()
+        self.assertEqual((data["lines"], data["created"], data["failed"]), (7, 3, 3))
+        self.assertEqual([error["line"] for error in data["errors"]], [3, 5, 6])
+        self.assertIn("price", data["errors"][1]["errors"])
+        # Порції по 2 непорожні рядки (разом із помилковими) пишуться окремо.
+        self.assertEqual([len(call.args[0]) for call in bulk.call_args_list], [1, 1, 1])
+        self.assertEqual(
+            sorted(Property.objects.values_list("title", flat=True)),
+            ["Квартира 1", "Квартира 2", "Квартира 3"],
+        )
+
+
+@patch("house.services.html_import.get_exchange_rates", return_value={"USD": 40})
+class HtmlImportTest(StaffClientMixin, TestCase):
+    HTML = """
+    <html><body>
+      <h1>Продаж квартири {index}</h1>
+      <div class="address">Київ, вул. Прикладна, {index}</div>
+      <meta itemprop="price" content="{price} $" />
+      <div class="pdf-area">45 м²</div>
+      <div class="pdf-rooms">2</div>
+    </body></html>
+    """
+
+    def setUp(self):
+        self.login_staff()
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        override = override_settings(MEDIA_ROOT=media_root)
+        override.enable()
+        self.addCleanup(override.disable)
+
+    def _files(self, count):
+        files = [
+            SimpleUploadedFile(
+                f"listing-{index}.html",
+                self.HTML.format(index=index, price=50000 + index).encode("utf-8"),
+                "text/html",
+            )
+            for index in range(count)
+        ]
+        files.append(SimpleUploadedFile("broken.html", b"\xff\xfe", "text/html"))
+        return files
+
+    @override_settings(HTML_IMPORT_PARALLEL_MIN=2, HTML_IMPORT_WORKERS=2)
+    def test_files_are_parsed_in_pool_and_saved_in_bulk(self, _mock_rates):
+        response = self.client.post(
+            reverse("house_api:property_import_html"), {"files": self._files(3)}
+        )
+
+        self.assertEqual(response.status_code, 207)
+        data = response.json()
+        self.assertEqual(
+            [item["title"] for item in data["created"]],
+            [f"Продаж квартири {index}" for index in range(3)],
+        )
+        self.assertEqual([error["file"] for error in data["errors"]], ["broken.html"])
+        self.assertEqual(Property.objects.count(), 3)
+        self.assertEqual(DealType.objects.count(), 1)
+
+    @override_settings(HTML_IMPORT_ASYNC_THRESHOLD=2, BACKGROUND_JOBS_EAGER=True)
+    def test_large_batch_runs_as_job(self, _mock_rates):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                reverse("house_api:property_import_html"), {"files": self._files(2)}
+            )
+
+        self.assertEqual(response.status_code, 202)
+        job = self.client.get(response.json()["progress_url"]).json()["result"]
+        self.assertEqual(job["status"], BackgroundJob.STATUS_COMPLETED)
+        self.assertEqual((job["processed"], job["failed"]), (2, 1))
+        self.assertEqual(len(job["result"]["created"]), 2)
+        self.assertEqual(Property.objects.count(), 2)
+
+    @override_settings(
+        BACKGROUND_JOBS_EAGER=True, ZIP_IMPORT_BATCH_SIZE=2, GEOCODE_MIN_INTERVAL=0
+    )
+    @patch("house.services.zip_import.get_exchange_rates", return_value={"USD": 40})
+    @patch("house.services.image_fetcher.requests.Session.get")
+    def test_admin_zip_import_attaches_archive_images(
+        self, http_get, _zip_rates, _mock_rates
+    ):
+        photo = BytesIO()
+        Image.new("RGB", (64, 48), "red").save(photo, "JPEG")
+        archive = BytesIO()
+        with zipfile.ZipFile(archive, "w") as zf:
+            for index in range(3):
+                html = self.HTML.format(index=index, price=50000).replace(
+                    "<body>",
+                    '<body><div class="pdf-img"><img src="../photos/%d.jpg"></div>'
+                    % index,
+                )
+                zf.writestr(f"pages/listing-{index}.html", html)
+                zf.writestr(f"photos/{index}.jpg", photo.getvalue())
+            zf.writestr("pages/broken.html", b"\xff\xfe")
+        admin_client = Client()
+        admin_client.force_login(
+            CustomUser.objects.create_superuser(
+                username="root", password="pass12345", email="root@example.com"
+            )
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = admin_client.post(
+                reverse("admin:house_property_import_zip"),
+                {"archive": SimpleUploadedFile("batch.zip", archive.getvalue())},
+            )
+
+        job = BackgroundJob.objects.get(kind="zip_import")
+        self.assertRedirects(
+            response,
+            reverse("admin:house_property_import_zip_job", args=[job.pk]),
+            fetch_redirect_response=False,
+        )
+        self.assertEqual(job.status, BackgroundJob.STATUS_COMPLETED)
+        self.assertEqual((job.total, job.processed, job.failed), (4, 3, 1))
+        self.assertEqual(Property.objects.count(), 3)
+        self.assertEqual(PropertyImage.objects.filter(is_main=True).count(), 3)
+        # Фото однакові за вмістом - зберігаються одним файлом, без HTTP.
+        self.assertEqual(
+            len(set(PropertyImage.objects.values_list("image", flat=True))), 1
+        )
+        self.assertFalse(
+            [c for c in http_get.call_args_list if c.args and ".jpg" in c.args[0]]
+        )
+
+        page = admin_client.get(response.url)
+        self.assertContains(page, "Створено об'єктів: 3")
+        self.assertContains(page, "pages/broken.html")
+
+
+@patch("house.services.html_import.get_exchange_rates", return_value={"USD": 40})
+@override_settings(LINK_IMPORT_HOST_DELAY_MS=0)
+class LinkImportTest(StaffClientMixin, TestCase):
+    def setUp(self):
+        cache.clear()  # ліміт імпортів рахується в кеші між тестами
+        self.login_staff()
+        session_get = patch(
+            "house.services.link_import.requests.Session.get",
+            side_effect=self._fake_get,
+        )
+        self.session_get = session_get.start()
+        self.addCleanup(session_get.stop)
+
+    @staticmethod
+    def _fake_get(url, timeout=None, headers=None):
+        if "offline" in url:
+            raise requests.ConnectionError("offline")
+        index = url.rsplit("/", 1)[-1]
+        response = Mock(status_code=200, headers={})
+        response.text = HtmlImportTest.HTML.format(index=index, price=60000)
+        if index == "empty":
+            response.text = "<html><body><p>Нічого</p></body></html>"
+        response.content = response.text.encode("utf-8")
+        return response
+
+    def _post(self, urls):
+        return self.client.post(
+            reverse("house_api:property_import_links"),
+            data=json.dumps({"urls": urls}),
+            content_type="application/json",
+        )
+
+    def test_links_report_status_per_url(self, _mock_rates):
+        response = self._post(
+            [
+                "https://a.test/1",
+                "https://b.test/2",
+                "https://a.test/1",
+                "https://offline.test/3",
+                "https://a.test/empty",
+                "not-a-url",
+            ]
+        )
+
+        self.assertEqual(response.status_code, 207)
+        results = response.json()["results"]
+        self.assertEqual(
+            [(item["url"], item["status"]) for item in results],
+            [
+                ("not-a-url", "error"),
+                ("https://a.test/1", "created"),
+                ("https://b.test/2", "created"),
+                ("https://offline.test/3", "error"),
+                ("https://a.test/empty", "error"),
+            ],
+        )
+        self.assertIn("address", results[-1]["errors"])
+        self.assertEqual(self.session_get.call_count, 4)
+        self.assertEqual(
+            sorted(Property.objects.values_list("title", flat=True)),
+            ["Продаж квартири 1", "Продаж квартири 2"],
+        )
+
+    def test_repeated_links_update_existing_objects(self, _mock_rates):
+        first = self._post(["https://a.test/1"]).json()["results"][0]
+        again = self._post(["https://a.test/1", "https://a.test/2"]).json()["results"]
+
+        self.assertEqual(first["status"], "created")
+        self.assertEqual(
+            [(item["status"], item["id"]) for item in again][0],
+            ("unchanged", first["id"]),
+        )
+        self.assertEqual(again[1]["status"], "created")
+        self.assertEqual(Property.objects.count(), 2)
+        self.assertEqual(
+            Property.objects.get(pk=first["id"]).source_url, "https://a.test/1"
+        )
+
+    @override_settings(LINK_IMPORT_ASYNC_THRESHOLD=1, BACKGROUND_JOBS_EAGER=True)
+    def test_large_batch_is_pollable_job(self, _mock_rates):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self._post(["https://a.test/1", "https://offline.test/2"])
+
+        self.assertEqual(response.status_code, 202)
+        job = self.client.get(response.json()["progress_url"]).json()["result"]
+        self.assertEqual(job["status"], BackgroundJob.STATUS_COMPLETED)
+        self.assertEqual((job["processed"], job["failed"]), (1, 1))
+        self.assertEqual(
+            [item["status"] for item in job["result"]["results"]],
+            ["created", "error"],
+        )
+
+
+@patch("house.services.html_import.get_exchange_rates", return_value={"USD": 40})
+@override_settings(LINK_IMPORT_HOST_DELAY_MS=0)
+class RecrawlTest(TestCase):
+    def setUp(self):
+        self.pages = {}
+        self.requests = []
+        session_get = patch(
+            "house.services.link_import.requests.Session.get",
+            side_effect=self._fake_get,
+        )
+        session_get.start()
+        self.addCleanup(session_get.stop)
+
+    def _fake_get(self, url, timeout=None, headers=None):
+        self.requests.append((url, headers or {}))
+        etag, html = self.pages[url]
+        if headers and headers.get("If-None-Match") == etag:
+            return Mock(status_code=304, headers={})
+        response = Mock(status_code=200, headers={"ETag": etag})
+        response.text = html
+        response.content = html.encode("utf-8")
+        return response
+
+    def _page(self, index, price, etag):
+        url = f"https://a.test/{index}"
+        self.pages[url] = (etag, HtmlImportTest.HTML.format(index=index, price=price))
+        return url
+
+    def test_conditional_recrawl_parses_only_changed_pages(self, _mock_rates):
+        urls = [self._page(index, 60000, f'"v{index}"') for index in range(1, 4)]
+        import_links(urls)
+        self.requests.clear()
+
+        # 1 - 304, 2 - новий ETag з тим самим тілом, 3 - змінена ціна.
+        self._page(2, 60000, '"v2b"')
+        self._page(3, 65000, '"v3b"')
+        with patch(
+            "house.services.recrawl.parse_files", wraps=recrawl_service.parse_files
+        ) as parse:
+            counts = recrawl_service.recrawl(
+                recrawl_service.due_properties(max_age_hours=0)
+            )
+
+        self.assertEqual(
+            counts, {"not_modified": 1, "unchanged": 1, "updated": 1, "failed": 0}
+        )
+        self.assertEqual(
+            [headers.get("If-None-Match") for _, headers in self.requests],
+            ['"v1"', '"v2"', '"v3"'],
+        )
+        self.assertEqual([url for url, _ in parse.call_args.args[0]], [urls[2]])
+        self.assertEqual(
+            list(Property.objects.order_by("pk").values_list("price", "source_etag")),
+            [(60000, '"v1"'), (60000, '"v2b"'), (65000, '"v3b"')],
+        )
+        self.assertFalse(
+            Property.objects.filter(source_checked_at__isnull=True).exists()
+        )
+
+    def test_budget_limits_run_and_fresh_pages_wait(self, _mock_rates):
+        import_links([self._page(index, 60000, f'"v{index}"') for index in range(3)])
+
+        self.assertEqual(
+            len(recrawl_service.due_properties(limit=2, max_age_hours=0)), 2
+        )
+        self.assertEqual(len(recrawl_service.due_properties()), 0)
+
+    def test_schedule_needs_queue_and_enqueues_once(self, _mock_rates):
+        with patch("house.tasks.recrawl") as run_now:
+            with self.assertRaises(CommandError):
+                call_command("recrawl_sources", "--schedule", stdout=StringIO())
+            run_now.assert_not_called()
+        self.assertFalse(Task.objects.exists())
+
+        with override_settings(TASK_QUEUE_ENABLED=True):
+            call_command("recrawl_sources", "--schedule", stdout=StringIO())
+            Task.objects.update(status=Task.STATUS_RUNNING)
+            call_command("recrawl_sources", "--schedule", stdout=StringIO())
+        self.assertEqual(Task.objects.filter(name="property.recrawl").count(), 1)
+
+
+@override_settings(BACKGROUND_JOBS_EAGER=True)
+class DuplicateDetectionTest(StaffClientMixin, TestCase):
+    DESCRIPTION = (
+        "Простора двокімнатна квартира з ремонтом у новому будинку біля парку. "
+        "Панорамні вікна, тепла підлога, кухня-вітальня, окрема гардеробна, "
+        "два балкони, підземний паркінг і закрита територія з дитячим майданчиком."
+    )
+
+    def _create(self, title, address, description):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Property.objects.create(
+                title=title,
+                address=address,
+                description=description,
+                latitude=50.45,
+                longitude=30.52,
+                price=100000,
+                area=60,
+                rooms=2,
+            )
+
+    def test_similar_listings_are_found_through_lsh_buckets(self):
+        original = self._create("Квартира", "Київ, вул. Паркова, 5", self.DESCRIPTION)
+        copy = self._create(
+            "Продаж 2к квартири",
+            "Київ, вул. Паркова, 5",
+            self.DESCRIPTION.replace("два балкони", "два великі балкони"),
+        )
+        other = self._create(
+            "Будинок", "Ірпінь, вул. Лісова, 1", "Будинок із садом і гаражем."
+        )
+
+        matches = possible_duplicates(original)
+        self.assertEqual([match.property_id for match in matches], [copy.pk])
+        self.assertGreaterEqual(matches[0].similarity, 0.6)
+        self.assertEqual(possible_duplicates(other), [])
+
+        # Незмінений текст не перераховується.
+        self.assertEqual(index_properties([original, copy]), 0)
+
+        warnings = parsed_duplicate_warnings(
+            {
+                "address": original.address,
+                "description_html": f"<p>{self.DESCRIPTION}</p>",
+            }
+        )
+        self.assertEqual(len(warnings), 2)
+        self.assertIn(f"#{original.pk}", warnings[0])
+
+    def test_admin_endpoint_lists_duplicates(self):
+        original = self._create("Квартира", "Київ, вул. Паркова, 5", self.DESCRIPTION)
+        copy = self._create("Копія", "Київ, вул. Паркова, 5", self.DESCRIPTION)
+        client = self.login_staff()
+
+        response = client.get(
+            reverse("house_api:property_duplicates", args=[original.pk])
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.json()["results"],
+            [
+                {
+                    "id": copy.pk,
+                    "title": "Копія",
+                    "address": copy.address,
+                    "similarity": 1.0,
+                }
+            ],
+        )
+
+
+@override_settings(
+    BULK_ACTION_ASYNC_THRESHOLD=2,
+    BULK_ACTION_CHUNK_SIZE=2,
+    BACKGROUND_JOBS_EAGER=True,
+)
+class PropertyBulkActionJobTest(StaffClientMixin, TestCase):
+    def setUp(self):
+        self.login_staff()
+        self.ids = [
+            Property.objects.create(
+                title=f"Об'єкт {index}",
+                address="Київ",
+                latitude=50.45,
+                longitude=30.52,
+                price=100000,
+                area=50,
+                rooms=2,
+            ).id
+            for index in range(5)
+        ]
+
+    def test_small_selection_runs_inline(self):
+        response = self.client.post(
+            reverse("house_api:property_bulk_action"),
+            data=json.dumps({"action": "archive", "ids": self.ids[:2]}),
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["processed"], 2)
+        self.assertEqual(Property.objects.filter(is_archived=True).count(), 2)
+
+    def test_large_delete_runs_as_job_with_progress(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                reverse("house_api:property_bulk_action"),
+                data=json.dumps({"action": "delete", "ids": self.ids + [999999]}),
+                content_type="application/json",
+            )
+
+        self.assertEqual(response.status_code, 202)
+        body = response.json()
+        self.assertFalse(Property.objects.exists())
+
+        progress = self.client.get(body["progress_url"]).json()["result"]
+        self.assertEqual(progress["id"], body["job_id"])
+        self.assertEqual(progress["status"], BackgroundJob.STATUS_COMPLETED)
+        self.assertEqual(progress["processed"], 5)
+        self.assertEqual(progress["failed"], 0)
+        self.assertEqual(progress["progress"], 100)
+
+
+@override_settings(TASK_QUEUE_ENABLED=True, TASK_RETRY_BACKOFF=60)
+class TaskQueueTest(TestCase):
+    @patch("landing_doominium_real_state.tasks.requests.post")
+    def test_failed_task_is_retried_with_backoff(self, mock_post):
+        mock_post.side_effect = [
+            requests.ConnectionError("offline"),
+            Mock(raise_for_status=Mock()),
+        ]
+        task = enqueue("consultation.telegram", {"chat_id": 1, "text": "Привіт"})
+        mock_post.assert_not_called()
+
+        self.assertEqual(claim_tasks(5, "test"), [task.id])
+        self.assertEqual(claim_tasks(5, "test"), [])
+        run_task(task.id)
+        task.refresh_from_db()
+        self.assertEqual(task.status, Task.STATUS_QUEUED)
+        self.assertEqual(task.attempts, 1)
+        self.assertIn("offline", task.last_error)
+        self.assertEqual(claim_tasks(5, "test"), [])
+
+        Task.objects.filter(pk=task.pk).update(run_at=task.created_at)
+        self.assertEqual(claim_tasks(5, "test"), [task.id])
+        run_task(task.id)
+        task.refresh_from_db()
+        self.assertEqual(task.status, Task.STATUS_DONE)
+        self.assertEqual(task.attempts, 2)
+        self.assertEqual(mock_post.call_count, 2)
+
+    @override_settings(TASK_LOCK_TIMEOUT=60)
+    def test_stale_tasks_without_attempts_left_are_failed_not_rerun(self):
+        long_ago = timezone.now() - timedelta(minutes=5)
+        single, retryable, alive = [
+            Task.objects.create(
+                name="jobs.run",
+                status=Task.STATUS_RUNNING,
+                attempts=1,
+                max_attempts=max_attempts,
+                locked_at=long_ago,
+                locked_by=worker,
+            )
+            for max_attempts, worker in ((1, "w1"), (5, "w1"), (1, "w2"))
+        ]
+        heartbeat("w2")
+
+        self.assertEqual(claim_tasks(5, "test"), [retryable.id])
+        single.refresh_from_db()
+        alive.refresh_from_db()
+        self.assertEqual(single.status, Task.STATUS_FAILED)
+        self.assertEqual(alive.status, Task.STATUS_RUNNING)
+
+    @override_settings(TASK_QUEUE_ENABLED=False, BACKGROUND_JOBS_EAGER=True)
+    @patch("landing_doominium_real_state.tasks.requests.post")
+    def test_inline_task_errors_are_logged_not_raised(self, mock_post):
+        mock_post.side_effect = requests.ConnectionError("offline")
+        with self.assertLogs("house.services.tasks", "ERROR"):
+            self.assertIsNone(
+                enqueue("consultation.telegram", {"chat_id": 1, "text": "Привіт"})
+            )
+        mock_post.assert_called_once()
+
+
+@override_settings(GEOCODE_MIN_INTERVAL=0, BACKGROUND_JOBS_EAGER=True)
+class GeocodeCacheTest(TestCase):
+    def _property(self, **kwargs):
+        return Property.objects.create(
+            title="Квартира", price=1000, area=40, rooms=1, **kwargs
+        )
+
+    @patch("house.services.geocoding._get_geolocator")
+    def test_variants_are_cached_and_shared(self, mock_get_geolocator):
+        geolocator = mock_get_geolocator.return_value
+        geolocator.geocode.side_effect = [
+            None,
+            None,
+            Mock(latitude=50.45, longitude=30.52),
+        ]
+
+        address = "Печерський район, Київ, вул. Січових Стрільців 1"
+        self.assertEqual(geocode_address(address), (50.45, 30.52))
+        self.assertEqual(geolocator.geocode.call_count, 3)
+
+        # Повторно (і з іншим регістром/пробілами) - без мережі.
+        self.assertEqual(geocode_address(address.upper() + "  "), (50.45, 30.52))
+        self.assertEqual(geolocator.geocode.call_count, 3)
+        self.assertTrue(GeocodeCache.objects.filter(found=False).exists())
+
+    @patch("house.services.geocoding._get_geolocator")
+    def test_property_save_geocodes_after_commit(self, mock_get_geolocator):
+        geolocator = mock_get_geolocator.return_value
+        geolocator.geocode.return_value = Mock(latitude=49.84, longitude=24.03)
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            first = self._property(address="Львів, Україна")
+        geolocator.geocode.assert_not_called()
+        self.assertIsNone(first.latitude)
+
+        for callback in callbacks:
+            callback()
+        first.refresh_from_db()
+        self.assertEqual((first.latitude, first.longitude), (49.84, 24.03))
+
+        # Та сама адреса береться з кешу одразу при збереженні.
+        second = self._property(address="Львів, Україна")
+        self.assertEqual(second.latitude, 49.84)
+        self.assertEqual(geolocator.geocode.call_count, 1)
+
+    @patch("house.services.geocoding._get_geolocator")
+    def test_reimport_with_new_address_takes_cached_coordinates(
+        self, mock_get_geolocator
+    ):
+        mock_get_geolocator.return_value.geocode.return_value = Mock(
+            latitude=46.48, longitude=30.72
+        )
+        geocode_address("Одеса, Україна")
+        parsed = {
+            "title": "Квартира",
+            "address": "Київ, Україна",
+            "price": 1000.0,
+            "area": 40.0,
+            "rooms": 1,
+            "latitude": 50.45,
+            "longitude": 30.52,
+        }
+        url = "https://partner.example.com/objects/9"
+        created = import_parsed_property(parsed, source_url=url, with_images=False)
+
+        moved = {
+            key: value
+            for key, value in parsed.items()
+            if key not in ("latitude", "longitude")
+        }
+        moved["address"] = "Одеса, Україна"
+        import_parsed_property(moved, source_url=url, with_images=False)
+
+        created.property.refresh_from_db()
+        self.assertEqual(
+            (created.property.latitude, created.property.longitude), (46.48, 30.72)
+        )
+
+    @patch("house.services.geocoding._get_geolocator")
+    def test_backfill_deduplicates_addresses(self, mock_get_geolocator):
+        geolocator = mock_get_geolocator.return_value
+        geolocator.geocode.return_value = Mock(latitude=46.48, longitude=30.72)
+        for _ in range(3):
+            self._property(address="Одеса, Україна")
+
+        call_command("geocode_backfill", stdout=StringIO())
+
+        self.assertEqual(geolocator.geocode.call_count, 1)
+        self.assertFalse(Property.objects.filter(latitude__isnull=True).exists())
+
+
+@override_settings(BACKGROUND_JOBS_EAGER=True)
+class PropertyImageVariantsTest(StaffClientMixin, TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        override = override_settings(MEDIA_ROOT=self.media_root)
+        override.enable()
+        self.addCleanup(override.disable)
+        self.property = Property.objects.create(
+            title="Квартира",
+            address="Київ",
+            latitude=50.45,
+            longitude=30.52,
+            price=1000,
+            area=40,
+            rooms=1,
+        )
+
+    def _jpeg(self, width=2400, height=1600):
+        buffer = BytesIO()
+        Image.new("RGB", (width, height), (120, 160, 200)).save(buffer, "JPEG")
+        return SimpleUploadedFile("photo.jpg", buffer.getvalue(), "image/jpeg")
+
+    def test_variants_are_built_after_commit(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            image = PropertyImage.objects.create(
+                property=self.property, image=self._jpeg()
+            )
+        self.assertTrue(image.image.name.endswith(".jpg"))
+        self.assertEqual(image.variants, {})
+
+        for callback in callbacks:
+            callback()
+        image.refresh_from_db()
+
+        self.assertTrue(image.image.name.endswith(".webp"))
+        self.assertEqual(
+            {label: entry["width"] for label, entry in image.variants.items()},
+            {"thumb": 320, "card": 640, "gallery": 1024, "full": 1280},
+        )
+        self.assertEqual(image.variants["full"]["webp"], image.image.name)
+        storage = image.image.storage
+        self.assertFalse(storage.exists("property_images/photo.jpg"))
+        self.assertLess(
+            storage.size(image.variants["card"]["webp"]), storage.size(image.image.name)
+        )
+        self.assertIn("640w", srcset(image.variants))
+
+    def test_identical_uploads_share_one_file(self):
+        other = Property.objects.create(
+            title="Будинок",
+            address="Львів",
+            latitude=49.84,
+            longitude=24.03,
+            price=2000,
+            area=90,
+            rooms=3,
+        )
+        with self.captureOnCommitCallbacks() as callbacks:
+            first = PropertyImage.objects.create(
+                property=self.property, image=self._jpeg(800, 600)
+            )
+            second = PropertyImage.objects.create(
+                property=other, image=self._jpeg(800, 600)
+            )
+        self.assertEqual(len(callbacks), 1)
+        self.assertEqual(first.content_hash, second.content_hash)
+        self.assertEqual(first.image.name, second.image.name)
+
+        for callback in callbacks:
+            callback()
+        first.refresh_from_db()
+        second.refresh_from_db()
+        self.assertEqual(second.image.name, first.image.name)
+        self.assertEqual(second.variants, first.variants)
+
+        storage = first.image.storage
+        entry = (first.image.name, first.variants)
+        first.delete()
+        release_image_files([entry])
+        self.assertTrue(storage.exists(entry[0]))
+
+        second.delete()
+        release_image_files([entry])
+        self.assertFalse(storage.exists(entry[0]))
+        self.assertFalse(storage.exists(entry[1]["card"]["webp"]))
+
+    def _colored(self, color, name):
+        buffer = BytesIO()
+        Image.new("RGB", (900, 600), color).save(buffer, "JPEG")
+        return SimpleUploadedFile(name, buffer.getvalue(), "image/jpeg")
+
+    def test_batch_upload_and_reorder_use_set_based_writes(self):
+        existing = PropertyImage.objects.create(
+            property=self.property, image=self._jpeg(800, 600), is_main=True
+        )
+        client = self.login_staff()
+        files = [
+            self._colored("red", "a.jpg"),
+            self._colored("green", "b.jpg"),
+            self._colored("red", "c.jpg"),
+            SimpleUploadedFile("broken.jpg", b"not an image", "image/jpeg"),
+        ]
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            response = client.post(
+                reverse("house_api:property_images", args=[self.property.pk]),
+                {"images": files[:3] + [files[3]], "is_main": "1"},
+            )
+
+        self.assertEqual(response.status_code, 201)
+        data = response.json()
+        # Помилка конвертації і окремо - що головне фото не змінено.
+        self.assertEqual(
+            [error["file"] for error in data["errors"]], ["broken.jpg", "broken.jpg"]
+        )
+        # Фото вже сконвертовані, окремі задачі images.process не потрібні.
+        self.assertEqual(callbacks, [])
+        created = list(
+            PropertyImage.objects.filter(
+                pk__in=[item["id"] for item in data["created"]]
+            ).order_by("sort_order")
+        )
+        self.assertEqual(
+            [image.sort_order for image in created],
+            [existing.sort_order + 1, existing.sort_order + 2, existing.sort_order + 3],
+        )
+        self.assertTrue(all(image.image.name.endswith(".webp") for image in created))
+        self.assertEqual(created[0].image.name, created[2].image.name)
+        self.assertNotEqual(created[0].image.name, created[1].image.name)
+        self.assertEqual(set(created[0].variants), {"thumb", "card", "gallery", "full"})
+        # Обраний головним файл не зберігся - головне фото лишається попереднім.
+        self.assertEqual(
+            list(
+                PropertyImage.objects.filter(is_main=True).values_list("pk", flat=True)
+            ),
+            [existing.pk],
+        )
+
+        order = [created[2].pk, existing.pk, created[0].pk, created[1].pk, 999999]
+        with CaptureQueriesContext(connection) as queries:
+            response = client.post(
+                reverse("house_api:property_images_reorder", args=[self.property.pk]),
+                data=json.dumps({"order": order}),
+                content_type="application/json",
+            )
+        self.assertEqual(response.json(), {"status": "ok", "updated": 4})
+        self.assertEqual(sum(q["sql"].startswith("UPDATE") for q in queries), 1)
+        self.assertEqual(
+            list(
+                self.property.images.order_by("sort_order").values_list("pk", flat=True)
+            ),
+            order[:4],
+        )
+
+    def test_failed_batch_insert_removes_stored_files(self):
+        storage = PropertyImage._meta.get_field("image").storage
+        with patch.object(
+            PropertyImage.objects, "bulk_create", side_effect=RuntimeError("db")
+        ):
+            with self.assertRaises(RuntimeError):
+                ingest_images(
+                    self.property,
+                    [self._colored("red", "a.jpg"), self._colored("blue", "b.jpg")],
+                )
+        self.assertEqual(list(iter_storage_files(storage, "property_images")), [])
+
+    def test_gc_media_removes_only_old_unreferenced_files(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            image = PropertyImage.objects.create(
+                property=self.property, image=self._jpeg(800, 600)
+            )
+        image.refresh_from_db()
+        storage = image.image.storage
+        stale = [
+            storage.save("property_images/stale.jpg", ContentFile(b"x")),
+            storage.save(
+                "property_images/variants/stale-thumb.webp", ContentFile(b"x")
+            ),
+        ]
+        fresh = storage.save("property_images/fresh.jpg", ContentFile(b"x"))
+        kept = [image.image.name] + [entry["webp"] for entry in image.variants.values()]
+        old = time.time() - 3 * 24 * 3600
+        for name in stale + kept:
+            os.utime(storage.path(name), (old, old))
+
+        out = StringIO()
+        call_command("gc_media", "--dry-run", "--batch-size", "2", stdout=out)
+        self.assertIn("без посилань: 2", out.getvalue())
+        self.assertTrue(all(storage.exists(name) for name in stale))
+
+        with self.assertRaises(CommandError):
+            call_command("gc_media", "--schedule", stdout=StringIO())
+        self.assertTrue(all(storage.exists(name) for name in stale))
+
+        call_command("gc_media", "--batch-size", "2", stdout=StringIO())
+        self.assertFalse(any(storage.exists(name) for name in stale))
+        self.assertTrue(all(storage.exists(name) for name in kept + [fresh]))
+
+    def test_placeholder_is_computed_and_backfilled(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            image = PropertyImage.objects.create(
+                property=self.property, image=self._jpeg(800, 600)
+            )
+        image.refresh_from_db()
+        self.assertTrue(image.placeholder.startswith("data:image/webp;base64,"))
+        self.assertLess(len(image.placeholder), 1000)
+        self.assertRegex(image.dominant_color, r"^#[0-9a-f]{6}$")
+        red, green, blue = (int(image.dominant_color[i : i + 2], 16) for i in (1, 3, 5))
+        self.assertTrue(
+            abs(red - 120) < 8 and abs(green - 160) < 8 and abs(blue - 200) < 8
+        )
+
+        client = self.login_staff()
+        response = client.get(
+            reverse("house_api:property_images", args=[self.property.pk])
+        )
+        item = response.json()["results"][0]
+        self.assertEqual(item["placeholder"], image.placeholder)
+        self.assertEqual(item["dominant_color"], image.dominant_color)
+        html = Template(
+            "{% load property_images %}{% responsive_image image 'card' %}"
+        ).render(Context({"image": image}))
+        self.assertIn(f"background-color: {image.dominant_color}", html)
+
+        PropertyImage.objects.update(placeholder="", dominant_color="")
+        call_command("build_image_placeholders", stdout=StringIO())
+        image.refresh_from_db()
+        self.assertTrue(image.placeholder.startswith("data:image/webp;base64,"))
+        self.assertTrue(image.dominant_color)
+
+    def test_gc_media_lists_storages_without_local_paths(self):
+        storage = InMemoryStorage()
+        storage.save("property_images/a.webp", ContentFile(b"abc"))
+        storage.save("property_images/variants/a-thumb.webp", ContentFile(b"x"))
+
+        files = list(iter_storage_files(storage, "property_images"))
+
+        self.assertEqual(
+            sorted((item.name, item.size) for item in files),
+            [
+                ("property_images/a.webp", 3),
+                ("property_images/variants/a-thumb.webp", 1),
+            ],
+        )
+        self.assertTrue(all(item.mtime > time.time() - 60 for item in files))
+        self.assertEqual(list(iter_storage_files(storage, "missing")), [])
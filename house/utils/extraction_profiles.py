@@ -0,0 +1,268 @@
+"""
+Профілі розбору презентацій для відомих сайтів-джерел.
+
+Профіль містить лише селектори, які працюють на конкретному сайті, тож для
+нього не потрібен загальний каскад із html_parser (ADDRESS_SELECTORS,
+LATITUDE_META тощо). Селектори компілюються один раз під час імпорту модуля:
+soupsieve для BeautifulSoup і cssselect (XPath) для lxml. Поле, якого профіль
+не задає або не знайшов, береться із загального каскаду.
+
+Домени прив'язуються до профілів налаштуванням HTML_EXTRACTION_PROFILES
+({"crm.partner.ua": "pdf_export"}); піддомени успадковують профіль домену.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, fields
+from typing import Callable, Optional
+from urllib.parse import urlparse
+
+import soupsieve
+
+from house.utils.html_parser import (
+    LATITUDE_ATTRS,
+    LONGITUDE_ATTRS,
+    _extract_float,
+    _extract_int,
+    _normalize_text,
+    _parse_geo_position,
+    _safe_float,
+)
+
+try:  # cssselect потрібен лише lxml-рушію; без нього профіль працює через bs4
+    from lxml.cssselect import CSSSelector
+except ImportError:  # pragma: no cover - залежить від оточення
+    CSSSelector = None
+
+
+@dataclass(frozen=True)
+class ExtractionProfile:
+    """Селектори полів; кожне поле - кортеж селекторів, що пробуються по черзі."""
+
+    name: str
+    title: tuple[str, ...] = ()
+    address: tuple[str, ...] = ()
+    price: tuple[str, ...] = ()
+    rooms: tuple[str, ...] = ()
+    area: tuple[str, ...] = ()
+    description: tuple[str, ...] = ()
+    main_image: tuple[str, ...] = ()
+    # Усі збіги всіх селекторів, без повторів.
+    gallery: tuple[str, ...] = ()
+    # Елемент з атрибутами data-lat/data-lng або meta geo.position.
+    coordinates: tuple[str, ...] = ()
+
+
+FIELDS = tuple(
+    field.name for field in fields(ExtractionProfile) if field.name != "name"
+)
+
+BUILTIN_PROFILES = (
+    # Експорт презентацій із CRM (сторінка для друку в PDF).
+    ExtractionProfile(
+        name="pdf_export",
+        title=("h1",),
+        address=(".pdf-address",),
+        price=(".pdf-header-contacts strong",),
+        rooms=(".pdf-params span:nth-of-type(1)",),
+        area=(".pdf-params span:nth-of-type(2)",),
+        description=(".pdf-block + .pdf-block",),
+        main_image=(".pdf-img img",),
+        gallery=("#estate-images a", "#estate-images img"),
+        coordinates=(".pdf-address",),
+    ),
+    # Каталоги з мікророзміткою schema.org.
+    ExtractionProfile(
+        name="schema_org",
+        title=("h1[itemprop='name']", "meta[property='og:title']"),
+        address=("[itemprop='streetAddress']",),
+        price=("meta[itemprop='price']",),
+        rooms=("[itemprop='numberOfRooms']",),
+        area=("[itemprop='floorSize']",),
+        description=("[itemprop='description']",),
+        main_image=("img.main-image", "meta[property='og:image']"),
+        gallery=(".gallery a", ".gallery img"),
+        coordinates=("meta[name='geo.position']",),
+    ),
+)
+
+
+@dataclass(frozen=True)
+class NodeAccess:
+    """Операції над вузлами дерева конкретного рушія."""
+
+    engine: str
+    text: Callable[..., str]
+    html: Callable[[object], str]
+    tag: Callable[[object], str]
+
+
+SOUP_ACCESS = NodeAccess(
+    engine="bs4",
+    text=lambda node, separator="", strip=False: node.get_text(separator, strip=strip),
+    html=str,
+    tag=lambda node: node.name,
+)
+
+
+class CompiledProfile:
+    def __init__(self, profile: ExtractionProfile):
+        self.profile = profile
+        self.selectors = {
+            "bs4": self._compile(lambda css: soupsieve.compile(css).iselect)
+        }
+        if CSSSelector is not None:
+            self.selectors["lxml"] = self._compile(
+                lambda css: CSSSelector(css, translator="html")
+            )
+
+    def __repr__(self) -> str:
+        return f"<CompiledProfile {self.name}>"
+
+    @property
+    def name(self) -> str:
+        return self.profile.name
+
+    def _compile(self, compile_one: Callable) -> dict[str, tuple]:
+        return {
+            field: tuple(compile_one(css) for css in getattr(self.profile, field))
+            for field in FIELDS
+            if getattr(self.profile, field)
+        }
+
+    def supports(self, engine: str) -> bool:
+        return engine in self.selectors
+
+    def extract(self, root, access: NodeAccess) -> dict:
+        """
+        Поля, знайдені селекторами профілю, у форматі html_parser._extract_fields.
+
+        Відсутні ключі означають, що поле треба брати із загального каскаду.
+        """
+        selectors = self.selectors[access.engine]
+        found: dict = {}
+
+        def first(field):
+            for select in selectors.get(field, ()):
+                for node in select(root):
+                    return node
+            return None
+
+        def content(node) -> Optional[str]:
+            if access.tag(node) == "meta":
+                return node.get("content") or node.get("value") or ""
+            return None
+
+        node = first("title")
+        if node is not None:
+            text = content(node)
+            text = _normalize_text(access.text(node) if text is None else text)
+            if text:
+                found["title"] = text
+
+        node = first("address")
+        if node is not None:
+            text = content(node)
+            if text is None:
+                text = access.text(node, " ", True)
+            if text:
+                found["address"] = _normalize_text(text)
+
+        node = first("price")
+        if node is not None:
+            text = content(node)
+            text = access.text(node, " ", True) if text is None else text
+            if text:
+                found["price_text"] = text
+
+        node = first("rooms")
+        if node is not None:
+            text = content(node)
+            rooms = _extract_int(access.text(node) if text is None else text)
+            if rooms:
+                found["rooms"] = rooms
+
+        node = first("area")
+        if node is not None:
+            text = content(node)
+            area = _extract_float(access.text(node) if text is None else text)
+            if area is not None:
+                found["area"] = area
+
+        node = first("description")
+        if node is not None:
+            found["description_html"] = access.html(node)
+
+        gallery = []
+        for select in selectors.get("gallery", ()):
+            for node in select(root):
+                url = node.get("href") or node.get("src") or content(node)
+                if url:
+                    gallery.append(url)
+        if gallery:
+            found["gallery"] = list(dict.fromkeys(gallery))
+
+        node = first("main_image")
+        if node is not None:
+            url = node.get("src") or node.get("href") or content(node)
+            if url:
+                found["main_image"] = url
+        if "main_image" not in found and gallery:
+            found["main_image"] = gallery[0]
+
+        node = first("coordinates")
+        if node is not None:
+            text = content(node)
+            if text is None:
+                latitude = _first_float_attr(node, LATITUDE_ATTRS)
+                longitude = _first_float_attr(node, LONGITUDE_ATTRS)
+            else:
+                latitude, longitude = _parse_geo_position(text)
+            if latitude is not None and longitude is not None:
+                found["latitude"], found["longitude"] = latitude, longitude
+
+        return found
+
+
+def _first_float_attr(node, attrs) -> Optional[float]:
+    for attr in attrs:
+        value = _safe_float(node.get(attr))
+        if value is not None:
+            return value
+    return None
+
+
+PROFILES: dict[str, CompiledProfile] = {
+    profile.name: CompiledProfile(profile) for profile in BUILTIN_PROFILES
+}
+
+
+def register_profile(profile: ExtractionProfile) -> CompiledProfile:
+    """Додає (або замінює) профіль; селектори компілюються одразу."""
+    PROFILES[profile.name] = compiled = CompiledProfile(profile)
+    return compiled
+
+
+def get_profile(name: str) -> CompiledProfile:
+    try:
+        return PROFILES[name]
+    except KeyError:
+        raise ValueError(f"Невідомий профіль розбору: {name}") from None
+
+
+def profile_for_source(source: Optional[str]) -> Optional[CompiledProfile]:
+    """Профіль для URL джерела за HTML_EXTRACTION_PROFILES; None - загальний каскад."""
+    from django.conf import settings
+
+    host = urlparse(source or "").hostname
+    domains = getattr(settings, "HTML_EXTRACTION_PROFILES", None)
+    if not host or not domains:
+        return None
+    if host.startswith("www."):
+        host = host[4:]
+    parts = host.split(".")
+    for index in range(len(parts) - 1):
+        name = domains.get(".".join(parts[index:]))
+        if name:
+            return PROFILES.get(name)
+    return None
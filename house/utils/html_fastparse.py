@@ -0,0 +1,582 @@
+"""
+Однопрохідний розбір презентацій через lxml.
+
+Дерево будує libxml2, а всі поля (заголовок, ціна, адреса, координати,
+кімнати, площа, опис, фото) збираються за один обхід документа. Правила
+відбору ті самі, що й у BeautifulSoup-версії з ``html_parser``: перший збіг
+у порядку документа, ті самі пріоритети селекторів і запасні варіанти.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Callable, Optional
+
+from house.utils.extraction_profiles import NodeAccess
+from house.utils.html_parser import (
+    ADDRESS_SELECTORS,
+    AREA_TEXT_RE,
+    LATITUDE_ATTRS,
+    LATITUDE_SCRIPT_PATTERN,
+    LATITUDE_TEXT_RE,
+    LONGITUDE_ATTRS,
+    LONGITUDE_SCRIPT_PATTERN,
+    ROOMS_TEXT_RE,
+    _extract_float,
+    _extract_int,
+    _normalize_text,
+    _parse_geo_position,
+    _safe_float,
+)
+
+try:  # lxml - необовʼязкова залежність; без неї працює BeautifulSoup
+    from lxml import etree
+    from lxml import html as lxml_html
+except ImportError:  # pragma: no cover - залежить від оточення
+    etree = lxml_html = None
+
+AVAILABLE = lxml_html is not None
+
+# Рядки всередині цих тегів BeautifulSoup не включає в get_text() предка.
+_SKIP_TEXT_TAGS = frozenset({"script", "style", "template", "rt", "rp"})
+_RAW_TEXT_TAGS = frozenset({"script", "style"})
+_PRESERVE_WHITESPACE_TAGS = frozenset({"pre", "textarea"})
+_ASCII_SPACES = " \n\t\x0c\r"
+_VOID_TAGS = frozenset(
+    {
+        "area",
+        "base",
+        "br",
+        "col",
+        "embed",
+        "hr",
+        "img",
+        "input",
+        "keygen",
+        "link",
+        "menuitem",
+        "meta",
+        "param",
+        "source",
+        "track",
+        "wbr",
+        "basefont",
+        "bgsound",
+        "command",
+        "frame",
+        "image",
+        "isindex",
+        "nextid",
+        "spacer",
+    }
+)
+_LIST_ATTRS = {
+    "*": {"class", "accesskey", "dropzone"},
+    "a": {"rel", "rev"},
+    "link": {"rel", "rev"},
+    "td": {"headers"},
+    "th": {"headers"},
+    "form": {"accept-charset"},
+    "object": {"archive"},
+    "area": {"rel"},
+    "icon": {"sizes"},
+    "iframe": {"sandbox"},
+    "output": {"for"},
+}
+# Класи (і id estate-images), всередині яких шукаються ціна, фото й опис.
+_CLASS_MARKERS = ("pdf-header-contacts", "pdf-img", "gallery", "pdf-description")
+_SIMPLE_SELECTOR_RE = re.compile(
+    r"^(?P<tag>[a-z0-9]+)?(?:\.(?P<cls>[\w-]+))?"
+    r"(?:\[(?P<attr>[\w:-]+)(?:='(?P<value>[^']*)')?\])?$"
+)
+
+
+def _classes(element) -> list[str]:
+    return (element.get("class") or "").split()
+
+
+def _compile(selector: str) -> Callable:
+    """Простий CSS-селектор (tag, .class, [attr], [attr='v']) у предикат."""
+    match = _SIMPLE_SELECTOR_RE.match(selector)
+    if match is None:
+        raise ValueError(f"Непідтримуваний селектор: {selector}")
+    tag, cls, attr, value = match.group("tag", "cls", "attr", "value")
+
+    def predicate(element) -> bool:
+        if tag and element.tag != tag:
+            return False
+        if cls and cls not in _classes(element):
+            return False
+        if attr:
+            if attr not in element.attrib:
+                return False
+            if value is not None and element.get(attr) != value:
+                return False
+        return True
+
+    return predicate
+
+
+_ADDRESS_MATCHERS = tuple(_compile(selector) for selector in ADDRESS_SELECTORS)
+
+
+def _bs_data(text: str) -> str:
+    """BeautifulSoup зводить рядок із самих пробілів до переводу рядка або пробілу."""
+    if text and not text.strip(_ASCII_SPACES):
+        return "\n" if "\n" in text else " "
+    return text
+
+
+def _get_text(element, separator: str = "", strip: bool = False) -> str:
+    """Аналог Tag.get_text() з BeautifulSoup."""
+    parts: list[str] = []
+
+    def add(text):
+        if not text:
+            return
+        text = _bs_data(text)
+        if strip:
+            text = text.strip()
+            if not text:
+                return
+        parts.append(text)
+
+    if element.tag not in _SKIP_TEXT_TAGS:
+        add(element.text)
+    # (ітератор дітей, елемент, чий хвіст іде після його вмісту)
+    stack = [(iter(element), None)]
+    while stack:
+        children, owner = stack[-1]
+        child = next(children, None)
+        if child is None:
+            stack.pop()
+            if owner is not None:
+                add(owner.tail)
+            continue
+        if isinstance(child.tag, str) and child.tag not in _SKIP_TEXT_TAGS:
+            add(child.text)
+            stack.append((iter(child), child))
+        else:
+            add(child.tail)
+    return separator.join(parts)
+
+
+def _bs_string(element) -> Optional[str]:
+    """Аналог Tag.string: єдиний рядок-нащадок або None."""
+    children = list(element)
+    if element.text:
+        if children:
+            return None
+        return _bs_data(element.text)
+    if len(children) != 1 or children[0].tail:
+        return None
+    child = children[0]
+    if not isinstance(child.tag, str):
+        return child.text or ""
+    return _bs_string(child)
+
+
+def _escape(text: str) -> str:
+    return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+
+
+def _attr_value(tag: str, name: str, value: str) -> str:
+    if name in _LIST_ATTRS["*"] or name in _LIST_ATTRS.get(tag, ()):
+        value = " ".join(value.split())
+    value = _escape(value)
+    if '"' in value:
+        if "'" in value:
+            return '"' + value.replace('"', "&quot;") + '"'
+        return "'" + value + "'"
+    return '"' + value + '"'
+
+
+def _to_html(element) -> str:
+    """Серіалізує елемент так само, як str(tag) у BeautifulSoup."""
+    out: list[str] = []
+
+    def text(value: str, raw: bool, preserve: bool) -> str:
+        if not preserve:
+            value = _bs_data(value)
+        return value if raw else _escape(value)
+
+    def write(node, raw: bool, preserve: bool) -> None:
+        if not isinstance(node.tag, str):
+            if node.tag is etree.Comment:
+                out.append(f"<!--{node.text or ''}-->")
+            return
+        attrs = "".join(
+            f" {name}={_attr_value(node.tag, name, value)}"
+            for name, value in sorted(node.attrib.items())
+        )
+        if node.tag in _VOID_TAGS:
+            out.append(f"<{node.tag}{attrs}/>")
+            return
+        out.append(f"<{node.tag}{attrs}>")
+        child_raw = node.tag in _RAW_TEXT_TAGS
+        child_preserve = preserve or node.tag in _PRESERVE_WHITESPACE_TAGS
+        if node.text:
+            out.append(text(node.text, child_raw, child_preserve))
+        for child in node:
+            write(child, child_raw, child_preserve)
+            if child.tail:
+                out.append(text(child.tail, child_raw, child_preserve))
+        out.append(f"</{node.tag}>")
+
+    preserve = any(
+        ancestor.tag in _PRESERVE_WHITESPACE_TAGS
+        for ancestor in element.iterancestors()
+    )
+    write(element, False, preserve)
+    return "".join(out)
+
+
+def _first_float_attr(element, attrs) -> Optional[float]:
+    for attr in attrs:
+        if attr in element.attrib:
+            value = _safe_float(element.get(attr))
+            if value is not None:
+                return value
+    return None
+
+
+class _Collector:
+    """Стан одного обходу: перші збіги для кожного правила."""
+
+    def __init__(self):
+        self.first: dict[str, object] = {}
+        self.address = [None] * len(_ADDRESS_MATCHERS)
+        self.text_nodes = []
+        self.pdf_blocks = []
+        self.description_paragraphs = []
+        self.gallery_links: list[str] = []
+        self.gallery_images: list[str] = []
+        self.strings: dict[str, str] = {}
+        self.room_span = self.area_span = None
+        self.coordinates = None
+        # Кількість відкритих предків із потрібним класом/id.
+        self.inside = {
+            "pdf-header-contacts": 0,
+            "pdf-img": 0,
+            "estate-images": 0,
+            "gallery": 0,
+            "pdf-description": 0,
+        }
+        self.spans = []
+
+    def keep_first(self, key: str, element) -> None:
+        if key not in self.first:
+            self.first[key] = element
+
+    def string(self, text: Optional[str]) -> None:
+        if not text:
+            return
+        for key, pattern in (
+            ("rooms", ROOMS_TEXT_RE),
+            ("area", AREA_TEXT_RE),
+            ("latitude", LATITUDE_TEXT_RE),
+        ):
+            if key not in self.strings and pattern.search(text):
+                self.strings[key] = text
+
+    def markers(self, element) -> list[str]:
+        classes = _classes(element)
+        found = [name for name in _CLASS_MARKERS if name in classes]
+        if element.get("id") == "estate-images":
+            found.append("estate-images")
+        return found
+
+    def start(self, element) -> None:
+        tag = element.tag
+        attrib = element.attrib
+        inside = self.inside
+
+        for index, matcher in enumerate(_ADDRESS_MATCHERS):
+            if self.address[index] is None and matcher(element):
+                self.address[index] = element
+        if tag in ("h1", "h2", "title"):
+            self.keep_first(tag, element)
+        elif tag in ("p", "span", "li"):
+            self.text_nodes.append(element)
+        elif tag == "meta":
+            prop, name = attrib.get("property"), attrib.get("name")
+            if prop == "og:title":
+                self.keep_first("og_title", element)
+            elif prop == "product:price:amount":
+                self.keep_first("meta_price_amount", element)
+            elif prop == "place:location:latitude":
+                self.keep_first("geo_latitude", element)
+            elif prop == "place:location:longitude":
+                self.keep_first("geo_longitude", element)
+            if name == "geo.position":
+                self.keep_first("geo_position", element)
+            if attrib.get("itemprop") == "price":
+                self.keep_first("meta_price", element)
+        elif tag == "strong" and inside["pdf-header-contacts"]:
+            self.keep_first("price_strong", element)
+        elif tag == "th" and (
+            "th_rooms" not in self.first or "th_area" not in self.first
+        ):
+            string = _bs_string(element)
+            if string and "Кіл. кімнат" in string:
+                self.keep_first("th_rooms", element)
+            if string and "Площа" in string:
+                self.keep_first("th_area", element)
+        elif tag == "div" and "pdf-block" in _classes(element):
+            self.pdf_blocks.append(element)
+        elif tag == "img":
+            src = attrib.get("src") or ""
+            if "_room-icon" in src and "room_icon" not in self.first:
+                self.first["room_icon"] = element
+                self.room_span = self.spans[-1] if self.spans else None
+            if "_area-icon" in src and "area_icon" not in self.first:
+                self.first["area_icon"] = element
+                self.area_span = self.spans[-1] if self.spans else None
+            if inside["pdf-img"]:
+                self.keep_first("pdf_img", element)
+            if "main-image" in _classes(element):
+                self.keep_first("main_image", element)
+            if (inside["estate-images"] or inside["gallery"]) and src:
+                self.gallery_images.append(src)
+        elif tag == "a" and (inside["estate-images"] or inside["gallery"]):
+            href = attrib.get("href")
+            if href:
+                self.gallery_links.append(href)
+
+        if tag == "p" and inside["pdf-description"]:
+            self.description_paragraphs.append(element)
+        if "data-price" in attrib:
+            self.keep_first("data_price", element)
+        if attrib.get("itemprop") == "description":
+            self.keep_first("itemprop_description", element)
+        if "description" in _classes(element):
+            self.keep_first("description", element)
+        if "data-address" in attrib and "data-location" in attrib:
+            self.keep_first("data_address", element)
+        if self.coordinates is None and attrib:
+            lat = _first_float_attr(element, LATITUDE_ATTRS)
+            lon = _first_float_attr(element, LONGITUDE_ATTRS)
+            if lat is not None and lon is not None:
+                self.coordinates = (lat, lon)
+
+    def walk(self, root) -> None:
+        """Обхід у порядку документа: відкриття, текст, вміст, закриття, хвіст."""
+        stack = []
+        node = root
+        while True:
+            if isinstance(node.tag, str):
+                self.start(node)
+                self.string(node.text)
+                markers = self.markers(node)
+                for marker in markers:
+                    self.inside[marker] += 1
+                if node.tag == "span":
+                    self.spans.append(node)
+                stack.append((node, iter(node), markers))
+            else:
+                # коментар: у BeautifulSoup це теж рядок документа
+                if node.tag is etree.Comment:
+                    self.string(node.text)
+                self.string(node.tail)
+
+            while stack:
+                parent, children, markers = stack[-1]
+                child = next(children, None)
+                if child is not None:
+                    node = child
+                    break
+                stack.pop()
+                for marker in markers:
+                    self.inside[marker] -= 1
+                if parent.tag == "span":
+                    self.spans.pop()
+                if stack:
+                    self.string(parent.tail)
+            else:
+                return
+
+
+def _title(c: _Collector) -> str:
+    # Не через "or": елемент lxml без дочірніх вузлів хибний у булевому контексті.
+    for key in ("h1", "h2", "title"):
+        tag = c.first.get(key)
+        if tag is not None:
+            return _normalize_text(_get_text(tag))
+    meta = c.first.get("og_title")
+    if meta is not None:
+        return _normalize_text(meta.get("content", ""))
+    return "Об'єкт DOMINIUM"
+
+
+def _address(c: _Collector) -> str:
+    for candidate in c.address:
+        if candidate is None:
+            continue
+        if candidate.tag == "meta":
+            text = candidate.get("content") or candidate.get("value")
+        else:
+            text = _get_text(candidate, " ", strip=True)
+        if text:
+            return _normalize_text(text)
+
+    holder = c.first.get("data_address")
+    if holder is not None:
+        for attr in ("data-address", "data-location"):
+            text = holder.get(attr)
+            if text:
+                return _normalize_text(text)
+
+    for node in c.text_nodes:
+        text = _get_text(node, " ", strip=True)
+        if not text:
+            continue
+        lower = text.lower()
+        if "вул" in lower or "м." in lower or "район" in lower:
+            return _normalize_text(text)
+    return ""
+
+
+def _price_text(c: _Collector) -> str:
+    node = c.first.get("price_strong")
+    if node is None:
+        node = c.first.get("data_price")
+    if node is not None:
+        return _get_text(node, " ", strip=True)
+    meta = c.first.get("meta_price")
+    if meta is None:
+        meta = c.first.get("meta_price_amount")
+    return meta.get("content", "") if meta is not None else ""
+
+
+def _next_td(element):
+    sibling = element.getnext()
+    while sibling is not None:
+        if sibling.tag == "td":
+            return sibling
+        sibling = sibling.getnext()
+    return None
+
+
+def _rooms(c: _Collector) -> Optional[int]:
+    if c.room_span is not None:
+        value = _extract_int(_get_text(c.room_span))
+        if value:
+            return value
+    cell = c.first.get("th_rooms")
+    if cell is not None:
+        td = _next_td(cell)
+        value = _extract_int(_get_text(td) if td is not None else "")
+        if value:
+            return value
+    text = c.strings.get("rooms")
+    if text:
+        value = _extract_int(text)
+        if value:
+            return value
+    return None
+
+
+def _area(c: _Collector) -> float:
+    if c.area_span is not None:
+        value = _extract_float(_get_text(c.area_span))
+        if value is not None:
+            return value
+    cell = c.first.get("th_area")
+    if cell is not None:
+        td = _next_td(cell)
+        value = _extract_float(_get_text(td) if td is not None else "")
+        if value is not None:
+            return value
+    text = c.strings.get("area")
+    value = _extract_float(text) if text else None
+    return value if value is not None else 0.0
+
+
+def _description(c: _Collector) -> str:
+    if len(c.pdf_blocks) > 1:
+        return _to_html(c.pdf_blocks[1])
+    node = c.first.get("itemprop_description")
+    if node is None:
+        node = c.first.get("description")
+    if node is not None:
+        return _to_html(node)
+    if c.description_paragraphs:
+        return "".join(_to_html(p) for p in c.description_paragraphs)
+    return ""
+
+
+def _images(c: _Collector) -> tuple[str, list[str]]:
+    tag = c.first.get("pdf_img")
+    if tag is None:
+        tag = c.first.get("main_image")
+    main_image = tag.get("src", "") if tag is not None else ""
+    gallery = list(dict.fromkeys(c.gallery_links + c.gallery_images))
+    if not main_image and gallery:
+        main_image = gallery[0]
+    return main_image, gallery
+
+
+def _coordinates(c: _Collector) -> tuple[Optional[float], Optional[float]]:
+    if c.coordinates is not None:
+        return c.coordinates
+    for key in ("geo_position", "geo_latitude", "geo_position", "geo_longitude"):
+        tag = c.first.get(key)
+        if tag is not None:
+            lat, lon = _parse_geo_position(tag.get("content") or tag.get("value"))
+            if lat is not None and lon is not None:
+                return lat, lon
+    text = c.strings.get("latitude")
+    if text:
+        lat = _extract_float(text, default=None, pattern=LATITUDE_SCRIPT_PATTERN)
+        lon = _extract_float(text, default=None, pattern=LONGITUDE_SCRIPT_PATTERN)
+        if lat is not None and lon is not None:
+            return lat, lon
+    return None, None
+
+
+LXML_ACCESS = NodeAccess(
+    engine="lxml",
+    text=_get_text,
+    html=_to_html,
+    tag=lambda node: node.tag,
+)
+
+_FIELD_EXTRACTORS = {
+    "title": _title,
+    "address": _address,
+    "price_text": _price_text,
+    "rooms": _rooms,
+    "area": _area,
+    "description_html": _description,
+}
+_ALL_FIELDS = (*_FIELD_EXTRACTORS, "main_image", "gallery", "latitude", "longitude")
+
+
+def extract_fields(html: str, profile=None) -> dict:
+    """
+    Поля презентації за один обхід; формат як у html_parser._extract_fields_soup.
+
+    Якщо заданий профіль, обхід документа виконується лише тоді, коли профіль
+    знайшов не всі поля.
+    """
+    if not AVAILABLE:
+        raise RuntimeError("lxml не встановлено")
+    root = lxml_html.document_fromstring(html)
+    fields = {}
+    if profile is not None and profile.supports("lxml"):
+        fields = profile.extract(root, LXML_ACCESS)
+    if all(key in fields for key in _ALL_FIELDS):
+        return fields
+
+    collector = _Collector()
+    collector.walk(root)
+    for key, extract in _FIELD_EXTRACTORS.items():
+        if key not in fields:
+            fields[key] = extract(collector)
+    if "main_image" not in fields or "gallery" not in fields:
+        main_image, gallery = _images(collector)
+        fields.setdefault("main_image", main_image)
+        fields.setdefault("gallery", gallery)
+    if "latitude" not in fields:
+        fields["latitude"], fields["longitude"] = _coordinates(collector)
+    return fields
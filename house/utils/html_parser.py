@@ -4,7 +4,6 @@ import logging
 import re
 from dataclasses import asdict, dataclass
 from decimal import Decimal, InvalidOperation
-from functools import lru_cache
 from math import ceil
 from pathlib import Path
 from typing import Iterable, List, Optional, Tuple
@@ -84,6 +83,12 @@ LONGITUDE_META = (
     "meta[property='place:location:longitude']",
 )
 
+ROOMS_TEXT_RE = re.compile(r"\d+\s*(кімнат|кімн|кімн\.)", re.IGNORECASE)
+AREA_TEXT_RE = re.compile(r"\d+[.,]?\d*\s*(м2|м²)", re.IGNORECASE)
+LATITUDE_TEXT_RE = re.compile(r"latitude", re.IGNORECASE)
+LATITUDE_SCRIPT_PATTERN = r"latitude\s*[:=]\s*([0-9.\-]+)"
+LONGITUDE_SCRIPT_PATTERN = r"longitude\s*[:=]\s*([0-9.\-]+)"
+
 
 @dataclass
 class ParsedProperty:
@@ -190,26 +195,42 @@ def parse_property_html(
     rates: Optional[dict] = None,
     geocode_missing: bool = False,
     geocoder_user_agent: str = "dominium-parser",
+    engine: Optional[str] = None,
+    profile: Optional[str] = None,
 ) -> ParsedProperty:
-    soup = BeautifulSoup(html, "html.parser")
+    """
+    Розбирає HTML презентації.
+
+    ``engine``: "lxml" - однопрохідний розбір (house/utils/html_fastparse.py),
+    "bs4" - BeautifulSoup; за замовчуванням HTML_PARSER_ENGINE ("auto" - lxml,
+    якщо встановлений, із запасним BeautifulSoup).
+
+    ``profile``: назва профілю розбору (house/utils/extraction_profiles.py);
+    за замовчуванням обирається за доменом ``source``.
+    """
+    from house.utils import extraction_profiles
+
     location = f" ({source})" if source else ""
+    compiled = (
+        extraction_profiles.get_profile(profile)
+        if profile
+        else extraction_profiles.profile_for_source(source)
+    )
+    fields = _extract_fields(html, engine, location, compiled)
 
-    title = _extract_title(soup)
+    title = fields["title"]
     if not title:
         logger.warning("Не вдалося визначити заголовок%s", location)
 
-    address = _extract_address(soup)
+    address = fields["address"]
     if not address:
         logger.warning("Не вдалося визначити адресу%s", location)
 
-    price_usd = _extract_price_usd(soup, rates)
-    rooms = _extract_rooms(soup)
-    area = _extract_area(soup)
-    description_html = _extract_description(soup)
-    main_image, gallery = _extract_images(soup)
+    price_usd = _price_to_usd(fields["price_text"], rates)
+    rooms = _rooms_or_default(fields["rooms"])
     property_type = get_property_type(title)
     deal_type = get_deal_type(title)
-    latitude, longitude = _extract_coordinates(soup)
+    latitude, longitude = fields["latitude"], fields["longitude"]
 
     if geocode_missing and address and (latitude is None or longitude is None):
         g_lat, g_lon = geocode_address(address, user_agent=geocoder_user_agent)
@@ -220,11 +241,11 @@ def parse_property_html(
         title=title,
         address=address,
         price=price_usd,
-        area=area,
+        area=fields["area"],
         rooms=rooms,
-        description_html=description_html,
-        main_image=main_image,
-        gallery=gallery,
+        description_html=fields["description_html"],
+        main_image=fields["main_image"],
+        gallery=fields["gallery"],
         property_type=property_type,
         deal_type=deal_type,
         latitude=latitude,
@@ -232,6 +253,51 @@ def parse_property_html(
     )
 
 
+def _extract_fields(
+    html: str, engine: Optional[str], location: str, profile=None
+) -> dict:
+    from house.utils import html_fastparse
+
+    engine = engine or _default_engine()
+    if engine != "bs4" and html_fastparse.AVAILABLE:
+        try:
+            return html_fastparse.extract_fields(html, profile=profile)
+        except Exception as exc:
+            if engine == "lxml":
+                raise
+            logger.info("lxml не розібрав документ%s, BeautifulSoup: %s", location, exc)
+    return _extract_fields_soup(html, profile=profile)
+
+
+def _default_engine() -> str:
+    from django.conf import settings
+
+    return getattr(settings, "HTML_PARSER_ENGINE", "auto")
+
+
+def _extract_fields_soup(html: str, profile=None) -> dict:
+    """
+    Поля презентації через BeautifulSoup.
+
+    Якщо заданий профіль, загальний каскад запускається лише для полів,
+    яких профіль не знайшов.
+    """
+    from house.utils.extraction_profiles import SOUP_ACCESS
+
+    soup = BeautifulSoup(html, "html.parser")
+    fields = profile.extract(soup, SOUP_ACCESS) if profile is not None else {}
+    for key, extract in _SOUP_EXTRACTORS.items():
+        if key not in fields:
+            fields[key] = extract(soup)
+    if "main_image" not in fields or "gallery" not in fields:
+        main_image, gallery = _extract_images(soup)
+        fields.setdefault("main_image", main_image)
+        fields.setdefault("gallery", gallery)
+    if "latitude" not in fields:
+        fields["latitude"], fields["longitude"] = _extract_coordinates(soup)
+    return fields
+
+
 def _extract_title(soup: BeautifulSoup) -> str:
     title_tag = (
         soup.select_one("h1") or soup.select_one("h2") or soup.select_one("title")
@@ -284,6 +350,10 @@ def _extract_address(soup: BeautifulSoup) -> str:
 
 
 def _extract_price_usd(soup: BeautifulSoup, rates: Optional[dict]) -> float:
+    return _price_to_usd(_extract_price_text(soup), rates)
+
+
+def _extract_price_text(soup: BeautifulSoup) -> str:
     price_node = soup.select_one(".pdf-header-contacts strong") or soup.select_one(
         "[data-price]"
     )
@@ -300,7 +370,10 @@ def _extract_price_usd(soup: BeautifulSoup, rates: Optional[dict]) -> float:
         )
         if meta_price:
             price_raw = meta_price.get("content", "")
+    return price_raw
 
+
+def _price_to_usd(price_raw: str, rates: Optional[dict]) -> float:
     if not price_raw:
         logger.warning("Не знайдено ціну у вихідному документі.")
         return 0.0
@@ -319,6 +392,17 @@ def _extract_price_usd(soup: BeautifulSoup, rates: Optional[dict]) -> float:
 
 
 def _extract_rooms(soup: BeautifulSoup) -> int:
+    return _rooms_or_default(_find_rooms(soup))
+
+
+def _rooms_or_default(value: Optional[int]) -> int:
+    if value:
+        return value
+    logger.warning("❌ Не вдалося визначити кількість кімнат, ставимо 1")
+    return 1
+
+
+def _find_rooms(soup: BeautifulSoup) -> Optional[int]:
     icon = soup.select_one("img[src*='_room-icon']")
     if icon:
         parent = icon.find_parent("span")
@@ -334,16 +418,13 @@ def _extract_rooms(soup: BeautifulSoup) -> int:
         if value:
             return value
 
-    text_candidate = soup.find(
-        string=re.compile(r"\d+\s*(кімнат|кімн|кімн\.)", re.IGNORECASE)
-    )
+    text_candidate = soup.find(string=ROOMS_TEXT_RE)
     if text_candidate:
         value = _extract_int(str(text_candidate))
         if value:
             return value
 
-    logger.warning("❌ Не вдалося визначити кількість кімнат, ставимо 1")
-    return 1
+    return None
 
 
 def _extract_area(soup: BeautifulSoup) -> float:
@@ -362,9 +443,7 @@ def _extract_area(soup: BeautifulSoup) -> float:
         if value is not None:
             return value
 
-    text_candidate = soup.find(
-        string=re.compile(r"\d+[.,]?\d*\s*(м2|м²)", re.IGNORECASE)
-    )
+    text_candidate = soup.find(string=AREA_TEXT_RE)
     value = _extract_float(str(text_candidate)) if text_candidate else None
     return value if value is not None else 0.0
 
@@ -446,66 +525,35 @@ def _extract_coordinates(
             if lat is not None and lon is not None:
                 return lat, lon
 
-    script_tag = soup.find(string=re.compile(r"latitude", re.IGNORECASE))
+    script_tag = soup.find(string=LATITUDE_TEXT_RE)
     if script_tag:
-        lat = _extract_float(
-            script_tag, default=None, pattern=r"latitude\s*[:=]\s*([0-9.\-]+)"
-        )
-        lon = _extract_float(
-            script_tag, default=None, pattern=r"longitude\s*[:=]\s*([0-9.\-]+)"
-        )
+        lat = _extract_float(script_tag, default=None, pattern=LATITUDE_SCRIPT_PATTERN)
+        lon = _extract_float(script_tag, default=None, pattern=LONGITUDE_SCRIPT_PATTERN)
         if lat is not None and lon is not None:
             return lat, lon
 
     return None, None
 
 
+# Загальний каскад по полях (фото й координати витягуються парами окремо).
+_SOUP_EXTRACTORS = {
+    "title": _extract_title,
+    "address": _extract_address,
+    "price_text": _extract_price_text,
+    "rooms": _find_rooms,
+    "area": _extract_area,
+    "description_html": _extract_description,
+}
+
+
 def geocode_address(
     address: str, *, user_agent: str = "dominium-parser"
 ) -> Tuple[Optional[float], Optional[float]]:
     if not address:
         return None, None
-    return _geocode_cached(address, user_agent)
+    from house.services.geocoding import geocode_address as cached_geocode
 
-
-@lru_cache(maxsize=256)
-def _geocode_cached(
-    address: str, user_agent: str
-) -> Tuple[Optional[float], Optional[float]]:
-    try:
-        geolocator = _get_geolocator(user_agent)
-    except Exception as exc:  # geopy might be missing or misconfigured
-        logger.warning("Geocoder недоступний: %s", exc)
-        return None, None
-
-    variants = _address_variants(address)
-    for candidate in variants:
-        try:
-            location = geolocator.geocode(candidate)
-        except Exception as exc:
-            logger.warning("Не вдалося геокодувати адресу '%s': %s", candidate, exc)
-            continue
-        if location:
-            return location.latitude, location.longitude
-
-    logger.info("Геокодер не знайшов координати для '%s'", address)
-    return None, None
-
-
-_GEOCODERS: dict[str, object] = {}
-
-
-def _get_geolocator(user_agent: str):
-    geolocator = _GEOCODERS.get(user_agent)
-    if geolocator:
-        return geolocator
-    try:
-        from geopy.geocoders import Nominatim  # type: ignore
-    except ImportError as exc:
-        raise RuntimeError("geopy не встановлено, геокодування неможливе.") from exc
-    geolocator = Nominatim(user_agent=user_agent, timeout=10)
-    _GEOCODERS[user_agent] = geolocator
-    return geolocator
+    return cached_geocode(address, user_agent=user_agent)
 
 
 def _first_float_attr(element: Tag, attrs: Iterable[str]) -> Optional[float]:
@@ -561,31 +609,3 @@ def _safe_float(
 
 def _normalize_text(text: str) -> str:
     return re.sub(r"\s+", " ", text).strip()
-
-
-def _address_variants(address: str) -> List[str]:
-    variants: List[str] = []
-    parts = [part.strip() for part in address.split(",") if part.strip()]
-
-    def add(candidate: str):
-        candidate = candidate.strip(", ")
-        if not candidate:
-            return
-        if candidate not in variants:
-            variants.append(candidate)
-        if "україн" not in candidate.lower():
-            with_country = f"{candidate}, Україна"
-            if with_country not in variants:
-                variants.append(with_country)
-
-    add(", ".join(parts) if parts else address)
-
-    no_district = [part for part in parts if "район" not in part.lower()]
-    if no_district and no_district != parts:
-        add(", ".join(no_district))
-
-    for idx, part in enumerate(parts):
-        if "район" in part.lower() and idx + 1 < len(parts):
-            add(", ".join(parts[idx + 1 :]))
-
-    return variants or [address]
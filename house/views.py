@@ -4,9 +4,10 @@ from django.http import JsonResponse
 from django.views.decorators.csrf import csrf_exempt
 
 from house.services.importer import (
+    IMPORT_CREATED,
     InvalidImportURL,
     PropertyImportError,
-    import_property_from_url,
+    sync_property_from_url,
 )
 
 
@@ -21,7 +22,7 @@ def import_property_by_url(request):
     timeout = getattr(settings, "REQUESTS_TIMEOUT", 10)
 
     try:
-        property_obj, warnings = import_property_from_url(url, timeout=timeout)
+        result = sync_property_from_url(url, timeout=timeout)
     except InvalidImportURL as exc:
         return JsonResponse({"status": "error", "message": str(exc)}, status=400)
     except requests.RequestException as exc:
@@ -38,8 +39,14 @@ def import_property_by_url(request):
     except Exception as exc:
         return JsonResponse({"status": "error", "message": str(exc)}, status=500)
 
-    response_data = {"status": "ok", "id": property_obj.id}
-    if warnings:
-        response_data["warnings"] = warnings
+    response_data = {
+        "status": "ok",
+        "id": result.property.id,
+        "import_status": result.status,
+    }
+    if result.changed and result.status != IMPORT_CREATED:
+        response_data["changed"] = result.changed
+    if result.warnings:
+        response_data["warnings"] = result.warnings
 
     return JsonResponse(response_data)
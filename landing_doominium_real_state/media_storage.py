@@ -0,0 +1,35 @@
+"""
+S3-сумісне сховище медіа (AWS S3, MinIO) для MEDIA_STORAGE=s3.
+
+Файли завантажуються через upload_fileobj: великі - multipart-частинами
+потоком, без читання всього файлу в пам'ять. URL публічні (без підпису) і
+ведуть прямо в сховище або на S3_PUBLIC_DOMAIN, тож Django не віддає байти фото.
+"""
+
+from django.core.exceptions import ImproperlyConfigured
+
+try:
+    from boto3.s3.transfer import TransferConfig
+    from storages.backends.s3 import S3Storage
+except ImportError as exc:  # pragma: no cover - залежить від оточення
+    raise ImproperlyConfigured(
+        "MEDIA_STORAGE=s3 потребує пакета django-storages[s3]."
+    ) from exc
+
+
+class MediaStorage(S3Storage):
+    def get_default_settings(self):
+        defaults = super().get_default_settings()
+        defaults.update(
+            multipart_threshold=8 * 1024 * 1024,
+            multipart_chunksize=8 * 1024 * 1024,
+        )
+        return defaults
+
+    def __init__(self, **settings):
+        super().__init__(**settings)
+        if self.transfer_config is None:
+            self.transfer_config = TransferConfig(
+                multipart_threshold=self.multipart_threshold,
+                multipart_chunksize=self.multipart_chunksize,
+            )
@@ -0,0 +1,172 @@
+"""
+HTTP middleware проєкту.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.cache import get_max_age, patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+from django.utils.text import compress_sequence, compress_string
+
+try:  # brotli - необовʼязкова залежність
+    import brotli
+except ImportError:  # pragma: no cover - залежить від оточення
+    brotli = None
+
+COMPRESSIBLE_TYPES = (
+    "text/",
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "application/manifest+json",
+    "image/svg+xml",
+)
+
+_ACCEPT_ENCODING_RE = re.compile(r"([a-z*]+)\s*(?:;\s*q\s*=\s*([0-9.]+))?", re.I)
+
+
+def _accepted_encodings(header: str) -> dict[str, float]:
+    accepted = {}
+    for token in header.lower().split(","):
+        match = _ACCEPT_ENCODING_RE.match(token.strip())
+        if not match:
+            continue
+        try:
+            quality = float(match.group(2)) if match.group(2) else 1.0
+        except ValueError:
+            quality = 0.0
+        accepted[match.group(1)] = quality
+    return accepted
+
+
+def choose_encoding(header: str) -> str | None:
+    """Обирає br або gzip з урахуванням q-значень Accept-Encoding."""
+    accepted = _accepted_encodings(header or "")
+    wildcard = accepted.get("*", 0.0)
+    candidates = ["br", "gzip"] if brotli is not None else ["gzip"]
+    best, best_quality = None, 0.0
+    for encoding in candidates:
+        quality = accepted.get(encoding, wildcard)
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def _brotli_sequence(sequence, quality: int):
+    compressor = brotli.Compressor(quality=quality)
+    for item in sequence:
+        data = compressor.process(item)
+        if data:
+            yield data
+    yield compressor.finish()
+
+
+class CompressionMiddleware(MiddlewareMixin):
+    """
+    Стискає відповіді gzip/brotli залежно від Accept-Encoding.
+
+    Для кешованих відповідей (Cache-Control max-age > 0, як після cache_page)
+    стиснута копія зберігається в кеші поруч із сирою, тож гарячі сторінки
+    стискаються один раз, а не на кожен запит.
+    """
+
+    max_random_bytes = 100
+
+    def process_response(self, request, response):
+        if response.has_header("Content-Encoding"):
+            return response
+
+        content_type = response.get("Content-Type", "").lower()
+        if not content_type.startswith(COMPRESSIBLE_TYPES):
+            return response
+
+        min_size = getattr(settings, "COMPRESSION_MIN_SIZE", 1024)
+        if not response.streaming and len(response.content) < min_size:
+            return response
+
+        patch_vary_headers(response, ("Accept-Encoding",))
+        encoding = choose_encoding(request.META.get("HTTP_ACCEPT_ENCODING", ""))
+        if encoding is None:
+            return response
+
+        if response.streaming:
+            encoding = self._compress_streaming(response, encoding)
+        else:
+            compressed = self._compress_content(response, encoding)
+            if compressed is None:
+                return response
+            response.content = compressed
+            response.headers["Content-Length"] = str(len(compressed))
+
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response.headers["ETag"] = "W/" + etag
+        response.headers["Content-Encoding"] = encoding
+        return response
+
+    def _compress_streaming(self, response, encoding) -> str:
+        if response.is_async:
+            original_iterator = response.streaming_content
+
+            # Для async-потоку лишаємо gzip: кожен фрагмент - окремий член архіву.
+            async def gzip_wrapper():
+                async for chunk in original_iterator:
+                    yield compress_string(chunk, max_random_bytes=self.max_random_bytes)
+
+            response.streaming_content = gzip_wrapper()
+            encoding = "gzip"
+        elif encoding == "br":
+            response.streaming_content = _brotli_sequence(
+                response.streaming_content,
+                getattr(settings, "COMPRESSION_BROTLI_QUALITY", 5),
+            )
+        else:
+            response.streaming_content = compress_sequence(
+                response.streaming_content, max_random_bytes=self.max_random_bytes
+            )
+        del response.headers["Content-Length"]
+        return encoding
+
+    def _compress_content(self, response, encoding) -> bytes | None:
+        content = response.content
+        cacheable = (get_max_age(response) or 0) > 0 and "private" not in response.get(
+            "Cache-Control", ""
+        )
+
+        cache_key = None
+        if cacheable:
+            digest = hashlib.sha1(content).hexdigest()
+            cache_key = f"compressed:{encoding}:{digest}"
+            cached = self._cache.get(cache_key)
+            if cached is not None:
+                return cached or None
+
+        if encoding == "br":
+            compressed = brotli.compress(
+                content, quality=getattr(settings, "COMPRESSION_BROTLI_QUALITY", 5)
+            )
+        else:
+            # Випадкові байти в заголовку gzip (захист від BREACH) лише для
+            # персональних відповідей; спільна кешована копія однакова для всіх.
+            compressed = compress_string(
+                content, max_random_bytes=None if cacheable else self.max_random_bytes
+            )
+
+        if len(compressed) >= len(content):
+            compressed = b""
+        if cache_key:
+            self._cache.set(
+                cache_key,
+                compressed,
+                timeout=getattr(settings, "COMPRESSION_CACHE_SECONDS", 600),
+            )
+        return compressed or None
+
+    @property
+    def _cache(self):
+        return caches[getattr(settings, "COMPRESSION_CACHE_ALIAS", "default")]
@@ -87,6 +87,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    "landing_doominium_real_state.middleware.CompressionMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -176,6 +177,41 @@ STATICFILES_STORAGE = "whitenoise.storage.CompressedManifestStaticFilesStorage"
 
 MEDIA_URL = "/media/"
 MEDIA_ROOT = BASE_DIR / "media"
+# Медіа: local - MEDIA_ROOT (віддає nginx), s3 - S3-сумісне сховище (AWS, MinIO),
+# фото віддаються прямо з нього. Для s3 потрібен django-storages[s3].
+MEDIA_STORAGE = os.getenv("MEDIA_STORAGE", "local").strip().lower()
+if MEDIA_STORAGE == "s3":
+    S3_PUBLIC_DOMAIN = os.getenv("S3_PUBLIC_DOMAIN", "")
+    STORAGES = {
+        "default": {
+            "BACKEND": "landing_doominium_real_state.media_storage.MediaStorage",
+            "OPTIONS": {
+                "bucket_name": os.getenv("S3_BUCKET", "dominium-media"),
+                "endpoint_url": os.getenv("S3_ENDPOINT_URL") or None,
+                "region_name": os.getenv("S3_REGION") or None,
+                "access_key": os.getenv("S3_ACCESS_KEY_ID", ""),
+                "secret_key": os.getenv("S3_SECRET_ACCESS_KEY", ""),
+                "custom_domain": S3_PUBLIC_DOMAIN or None,
+                "url_protocol": os.getenv("S3_PUBLIC_PROTOCOL", "https:"),
+                # Публічні URL без підпису; читання дозволяє політика бакета.
+                "querystring_auth": False,
+                "default_acl": None,
+                "file_overwrite": False,
+                "object_parameters": {"CacheControl": "public, max-age=604800"},
+                "multipart_threshold": (env_int("S3_MULTIPART_THRESHOLD_MB", 8) or 8)
+                * 1024
+                * 1024,
+                "multipart_chunksize": (env_int("S3_MULTIPART_CHUNK_MB", 8) or 8)
+                * 1024
+                * 1024,
+            },
+        },
+        "staticfiles": {
+            "BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"
+        },
+    }
+    if S3_PUBLIC_DOMAIN:
+        MEDIA_URL = f"{os.getenv('S3_PUBLIC_PROTOCOL', 'https:')}//{S3_PUBLIC_DOMAIN}/"
 
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
@@ -261,6 +297,83 @@ CONSULTATION_RATE_LIMIT = env_int("CONSULTATION_RATE_LIMIT", 5) or 5
 CONSULTATION_RATE_WINDOW = env_int("CONSULTATION_RATE_WINDOW", 600) or 600
 IMPORT_RATE_LIMIT = env_int("IMPORT_RATE_LIMIT", 5) or 5
 IMPORT_RATE_WINDOW = env_int("IMPORT_RATE_WINDOW", 60) or 60
+PROPERTY_BATCH_MAX_ITEMS = env_int("PROPERTY_BATCH_MAX_ITEMS", 300) or 300
+# Масові дії над більшою кількістю об'єктів виконуються у фоні порціями.
+BULK_ACTION_ASYNC_THRESHOLD = env_int("BULK_ACTION_ASYNC_THRESHOLD", 200) or 200
+PROPERTY_IMPORT_CHUNK_SIZE = env_int("PROPERTY_IMPORT_CHUNK_SIZE", 500) or 500
+# NDJSON-імпорт: максимальна довжина рядка (байт) і скільки помилок повертати.
+PROPERTY_IMPORT_MAX_LINE_BYTES = (
+    env_int("PROPERTY_IMPORT_MAX_LINE_BYTES", 1024 * 1024) or 1024 * 1024
+)
+PROPERTY_IMPORT_MAX_ERRORS = env_int("PROPERTY_IMPORT_MAX_ERRORS", 1000) or 1000
+# Рушій розбору HTML-презентацій: auto (lxml, якщо встановлено) | lxml | bs4.
+HTML_PARSER_ENGINE = os.getenv("HTML_PARSER_ENGINE", "auto")
+# Профілі розбору за доменом джерела: "crm.partner.ua=pdf_export,catalog.ua=schema_org"
+# (house/utils/extraction_profiles.py); решта сайтів - загальний каскад селекторів.
+HTML_EXTRACTION_PROFILES = dict(
+    item.split("=", 1) for item in env_list("HTML_EXTRACTION_PROFILES") if "=" in item
+)
+# Імпорт HTML-файлів: розбір у пулі процесів від HTML_IMPORT_PARALLEL_MIN файлів,
+# понад HTML_IMPORT_ASYNC_THRESHOLD - фоновою задачею з прогресом.
+HTML_IMPORT_WORKERS = env_int("HTML_IMPORT_WORKERS", 4) or 4
+HTML_IMPORT_PARALLEL_MIN = env_int("HTML_IMPORT_PARALLEL_MIN", 8) or 8
+HTML_IMPORT_ASYNC_THRESHOLD = env_int("HTML_IMPORT_ASYNC_THRESHOLD", 20) or 20
+# ZIP-імпорт в адмінці: сторінок за порцію розбору й максимальний розмір сторінки.
+ZIP_IMPORT_BATCH_SIZE = env_int("ZIP_IMPORT_BATCH_SIZE", 50) or 50
+ZIP_IMPORT_MAX_HTML_BYTES = (
+    env_int("ZIP_IMPORT_MAX_HTML_BYTES", 5 * 1024 * 1024) or 5 * 1024 * 1024
+)
+# Пакетний імпорт за посиланнями: паралельні завантаження, з'єднань на хост,
+# пауза між запитами до одного хоста (мс); понад поріг - фонова задача.
+LINK_IMPORT_WORKERS = env_int("LINK_IMPORT_WORKERS", 8) or 8
+LINK_IMPORT_PER_HOST = env_int("LINK_IMPORT_PER_HOST", 2) or 2
+LINK_IMPORT_HOST_DELAY_MS = env_int("LINK_IMPORT_HOST_DELAY_MS", 500)
+LINK_IMPORT_MAX_URLS = env_int("LINK_IMPORT_MAX_URLS", 100) or 100
+LINK_IMPORT_ASYNC_THRESHOLD = env_int("LINK_IMPORT_ASYNC_THRESHOLD", 5) or 5
+# Повторний обхід джерел імпорту: сторінок за запуск, вік перевірки (год),
+# інтервал періодичного запуску через чергу задач (хв).
+RECRAWL_BUDGET = env_int("RECRAWL_BUDGET", 200) or 200
+RECRAWL_MAX_AGE_HOURS = env_int("RECRAWL_MAX_AGE_HOURS", 24) or 24
+RECRAWL_INTERVAL_MINUTES = env_int("RECRAWL_INTERVAL_MINUTES", 60) or 60
+# Мінімальна схожість тексту (%), з якої об'єкти вважаються можливими дублікатами.
+DUPLICATE_SIMILARITY = env_int("DUPLICATE_SIMILARITY", 60) or 60
+BULK_ACTION_CHUNK_SIZE = env_int("BULK_ACTION_CHUNK_SIZE", 200) or 200
+BACKGROUND_JOBS_WORKERS = env_int("BACKGROUND_JOBS_WORKERS", 2) or 2
+# Виконувати фонові задачі синхронно (тести, налагодження).
+BACKGROUND_JOBS_EAGER = env_bool("BACKGROUND_JOBS_EAGER", False)
+# Завантаження фото при імпорті: паралельність, з'єднань на хост, ліміт розміру.
+IMAGE_FETCH_WORKERS = env_int("IMAGE_FETCH_WORKERS", 6) or 6
+IMAGE_FETCH_PER_HOST = env_int("IMAGE_FETCH_PER_HOST", 4) or 4
+IMAGE_FETCH_MAX_BYTES = (
+    env_int("IMAGE_FETCH_MAX_BYTES", 15 * 1024 * 1024) or 15 * 1024 * 1024
+)
+# Фото об'єктів: розміри варіантів для srcset (ширина, px); найбільший - основний файл.
+IMAGE_VARIANT_SIZES = {"thumb": 320, "card": 640, "gallery": 1024, "full": 1280}
+IMAGE_WEBP_QUALITY = env_int("IMAGE_WEBP_QUALITY", 70) or 70
+# Паралельна конвертація фото при пакетному завантаженні (ingest_images).
+IMAGE_PROCESS_WORKERS = env_int("IMAGE_PROCESS_WORKERS", 4) or 4
+IMAGE_WEBP_METHOD = env_int("IMAGE_WEBP_METHOD", 4) or 4
+IMAGE_VARIANTS_AVIF = env_bool("IMAGE_VARIANTS_AVIF", False)
+IMAGE_AVIF_QUALITY = env_int("IMAGE_AVIF_QUALITY", 50) or 50
+# Прибирання фото без посилань у БД (gc_media): файли, новіші за пільговий
+# період (год), не чіпаються; інтервал періодичного запуску через чергу (год).
+MEDIA_GC_GRACE_HOURS = env_int("MEDIA_GC_GRACE_HOURS", 24) or 24
+MEDIA_GC_INTERVAL_HOURS = env_int("MEDIA_GC_INTERVAL_HOURS", 24) or 24
+# Пауза між запитами до Nominatim, с (їхня політика - не частіше 1 запиту/с).
+GEOCODE_MIN_INTERVAL = env_int("GEOCODE_MIN_INTERVAL", 1) or 1
+# Черга задач у БД (manage.py run_worker). Вимкнено - задачі виконуються в пулі
+# потоків фонових задач (або одразу з BACKGROUND_JOBS_EAGER).
+TASK_QUEUE_ENABLED = env_bool("TASK_QUEUE_ENABLED", False)
+TASK_WORKER_CONCURRENCY = env_int("TASK_WORKER_CONCURRENCY", 4) or 4
+TASK_WORKER_POLL_INTERVAL = env_int("TASK_WORKER_POLL_INTERVAL", 2) or 2
+TASK_MAX_ATTEMPTS = env_int("TASK_MAX_ATTEMPTS", 5) or 5
+TASK_RETRY_BACKOFF = env_int("TASK_RETRY_BACKOFF", 30) or 30
+TASK_RETRY_MAX_DELAY = env_int("TASK_RETRY_MAX_DELAY", 3600) or 3600
+TASK_LOCK_TIMEOUT = env_int("TASK_LOCK_TIMEOUT", 900) or 900
+# Стиснення відповідей (gzip; brotli, якщо встановлено пакет Brotli).
+COMPRESSION_MIN_SIZE = env_int("COMPRESSION_MIN_SIZE", 1024) or 1024
+COMPRESSION_BROTLI_QUALITY = env_int("COMPRESSION_BROTLI_QUALITY", 5) or 5
+COMPRESSION_CACHE_SECONDS = env_int("COMPRESSION_CACHE_SECONDS", 600) or 600
 HOME_CACHE_SECONDS = env_int("HOME_CACHE_SECONDS", 60 * 5) or 60 * 5
 SEARCH_CACHE_SECONDS = env_int("SEARCH_CACHE_SECONDS", 60) or 60
 ALLOW_MANUAL_AUTH = env_bool("DJANGO_ALLOW_MANUAL_AUTH", False)
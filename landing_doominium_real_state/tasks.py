@@ -0,0 +1,18 @@
+"""Задачі черги для публічної частини сайту."""
+
+import requests
+from django.conf import settings
+
+from house.services.tasks import task
+
+
+@task("consultation.telegram")
+def send_telegram_message(chat_id, text):
+    token = getattr(settings, "TELEGRAM_BOT_TOKEN", "")
+    url = f"https://api.telegram.org/bot{token}/sendMessage"
+    response = requests.post(
+        url,
+        json={"chat_id": chat_id, "text": text, "parse_mode": "Markdown"},
+        timeout=getattr(settings, "REQUESTS_TIMEOUT", 10),
+    )
+    response.raise_for_status()
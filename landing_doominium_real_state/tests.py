@@ -1,6 +1,16 @@
-from django.test import SimpleTestCase
+import gzip
+import json
+from unittest.mock import patch
+
+from django.http import JsonResponse, StreamingHttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+from django.utils.cache import patch_cache_control
 
 from landing_doominium_real_state.forms.consultation import ConsultationForm
+from landing_doominium_real_state.middleware import (
+    CompressionMiddleware,
+    choose_encoding,
+)
 
 
 class ConsultationFormTest(SimpleTestCase):
@@ -27,3 +37,54 @@ class ConsultationFormTest(SimpleTestCase):
         )
         self.assertFalse(form.is_valid())
         self.assertIn("Введіть коректний номер телефону.", form.errors["phone"])
+
+
+@override_settings(
+    COMPRESSION_MIN_SIZE=100,
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}},
+)
+class CompressionMiddlewareTest(SimpleTestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.payload = {"cards": "<div class='card'>DOMINIUM</div>" * 200}
+
+    def _process(self, response, accept_encoding):
+        request = self.factory.get("/", HTTP_ACCEPT_ENCODING=accept_encoding)
+        middleware = CompressionMiddleware(lambda req: response)
+        return middleware(request)
+
+    def test_choose_encoding_respects_quality(self):
+        self.assertEqual(choose_encoding("gzip"), "gzip")
+        self.assertIsNone(choose_encoding("identity"))
+        self.assertEqual(choose_encoding("br;q=0, gzip;q=0.5"), "gzip")
+
+    def test_gzip_json_response(self):
+        response = self._process(JsonResponse(self.payload), "gzip")
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertIn("Accept-Encoding", response["Vary"])
+        self.assertEqual(json.loads(gzip.decompress(response.content)), self.payload)
+
+    def test_small_response_left_uncompressed(self):
+        response = self._process(JsonResponse({"status": "ok"}), "gzip, br")
+        self.assertFalse(response.has_header("Content-Encoding"))
+
+    def test_cached_response_reuses_compressed_payload(self):
+        first = JsonResponse(self.payload)
+        patch_cache_control(first, max_age=60)
+        first = self._process(first, "gzip")
+
+        second = JsonResponse(self.payload)
+        patch_cache_control(second, max_age=60)
+        with patch("landing_doominium_real_state.middleware.compress_string") as mock:
+            second = self._process(second, "gzip")
+        mock.assert_not_called()
+        self.assertEqual(first.content, second.content)
+
+    def test_streaming_response_is_compressed(self):
+        response = StreamingHttpResponse(
+            (b"line %d\n" % index for index in range(500)), content_type="text/plain"
+        )
+        response = self._process(response, "gzip")
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        body = gzip.decompress(b"".join(response.streaming_content))
+        self.assertTrue(body.startswith(b"line 0\n"))
@@ -7,7 +7,7 @@ from django.test import Client, TestCase, override_settings
 from django.urls import reverse
 
 from accounts.models import CustomUser
-from house.models import DealType, Property, PropertyType
+from house.models import DealType, Property, PropertyImage, PropertyType
 
 
 @override_settings(
@@ -116,6 +116,60 @@ class SearchPageSmokeTest(TestCase):
         self.assertIn("property-results", content)
         self.assertIn("property-sort-wrapper", content)
 
+    @patch(
+        "landing_doominium_real_state.views.search.fetch_exchange_rates",
+        return_value={"USD": 40, "EUR": 44, "UAH": 1},
+    )
+    def test_async_search_compact_json(self, _mock_rates):
+        deal = DealType.objects.create(name="Продаж")
+        prop = Property.objects.create(
+            title="Компактна",
+            address="Київ",
+            latitude=50.45,
+            longitude=30.52,
+            price=44_000,
+            area=50,
+            rooms=2,
+            deal_type=deal,
+        )
+
+        client = Client()
+        with self.assertNumQueries(2):
+            response = client.get(
+                reverse("property_search"),
+                {"currency": "EUR"},
+                HTTP_X_DOMINIUM_ASYNC="search-json",
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("X-Dominium-Async", response["Vary"])
+        data = response.json()
+        self.assertEqual(data["count"], 1)
+        self.assertEqual(data["total_pages"], 1)
+        self.assertEqual(data["currency"]["code"], "EUR")
+        card = data["results"][0]
+        self.assertEqual(card["id"], prop.id)
+        self.assertEqual(card["prices"], {"USD": 44000, "EUR": 40000, "UAH": 1760000})
+        self.assertIsNone(card["cover"])
+        self.assertFalse(card["liked"])
+        self.assertNotIn("cards", data)
+
+        # Без save(): фото не обробляється, потрібні лише поля заглушки.
+        PropertyImage.objects.bulk_create(
+            [
+                PropertyImage(
+                    property=prop,
+                    image="property_images/cover.webp",
+                    placeholder="data:image/webp;base64,AAAA",
+                    dominant_color="#78a0c8",
+                )
+            ]
+        )
+        card = client.get(
+            reverse("property_search"), HTTP_X_DOMINIUM_ASYNC="search-json"
+        ).json()["results"][0]
+        self.assertEqual(card["cover_placeholder"], "data:image/webp;base64,AAAA")
+        self.assertEqual(card["cover_color"], "#78a0c8")
+
     def test_api_filters_featured_true(self):
         pt = PropertyType.objects.create(name="Будинок", slug="house")
         deal = DealType.objects.create(name="Оренда")
@@ -12,7 +12,9 @@ from django.views.decorators.cache import cache_page
 from django.views.decorators.http import require_POST
 
 from house.models import HomepageHighlightSettings, Property
+from house.services.tasks import enqueue, queue_enabled
 from landing_doominium_real_state.forms.consultation import ConsultationForm
+from landing_doominium_real_state.tasks import send_telegram_message
 
 from .common import build_absolute_uri, get_client_ip, organization_schema
 
@@ -74,15 +76,13 @@ def consultation_view(request):
             status=500,
         )
 
-    url = f"https://api.telegram.org/bot{telegram_token}/sendMessage"
-    timeout = getattr(settings, "REQUESTS_TIMEOUT", 10)
     send_errors = []
-
     for chat_id in chat_ids:
-        payload = {"chat_id": chat_id, "text": text, "parse_mode": "Markdown"}
+        if queue_enabled():
+            enqueue("consultation.telegram", {"chat_id": chat_id, "text": text})
+            continue
         try:
-            response = requests.post(url, json=payload, timeout=timeout)
-            response.raise_for_status()
+            send_telegram_message(chat_id=chat_id, text=text)
         except requests.RequestException as exc:
             logger.warning("Telegram недоступний (%s): %s", chat_id, exc)
             send_errors.append({"chat_id": chat_id, "error": str(exc)})
@@ -3,15 +3,18 @@ from datetime import date
 
 from django.conf import settings
 from django.core.paginator import Paginator
+from django.db.models import JSONField, OuterRef, Subquery
 from django.http import JsonResponse
 from django.shortcuts import render
 from django.template.loader import render_to_string
 from django.templatetags.static import static
+from django.utils.cache import patch_vary_headers
 from django.views.decorators.cache import cache_page
 from django.views.decorators.http import require_GET
 from django.views.generic import ListView
 
-from house.models import Property, PropertyType
+from house.api.serializers import serialize_property_card
+from house.models import Property, PropertyImage, PropertyType
 from house.services.search import apply_currency_display, build_search_queryset
 from house.utils.currency import get_exchange_rates as fetch_exchange_rates
 
@@ -67,6 +70,15 @@ class SearchFiltersView(ListView):
         )
         return cached_dispatch(request, *args, **kwargs)
 
+    def get(self, request, *args, **kwargs):
+        if request.headers.get("x-dominium-async") == "search-json":
+            response = self.render_compact_response()
+        else:
+            response = super().get(request, *args, **kwargs)
+        # HTML, фрагменти та компактний JSON живуть за однією адресою.
+        patch_vary_headers(response, ("X-Dominium-Async",))
+        return response
+
     def get_paginate_by(self, queryset):
         per_page = self.request.GET.get("per_page")
         try:
@@ -192,6 +204,66 @@ class SearchFiltersView(ListView):
 
         return context
 
+    def render_compact_response(self):
+        """Картки з метаданими сторінки без рендерингу шаблонів."""
+        covers = PropertyImage.objects.filter(property=OuterRef("pk")).order_by(
+            "-is_main", "id"
+        )
+        queryset = (
+            self.get_queryset()
+            .select_related("property_type", "deal_type")
+            .annotate(
+                cover_image=Subquery(covers.values("image")[:1]),
+                cover_variants=Subquery(
+                    covers.values("variants")[:1], output_field=JSONField()
+                ),
+                cover_placeholder=Subquery(covers.values("placeholder")[:1]),
+                cover_color=Subquery(covers.values("dominant_color")[:1]),
+            )
+        )
+        page_size = self.get_paginate_by(queryset)
+        paginator, page, properties, _ = self.paginate_queryset(queryset, page_size)
+        properties = list(properties)
+
+        selected_currency = self.get_selected_currency()
+        rates_meta = apply_currency_display(
+            properties,
+            fetch_exchange_rates(),
+            self.CURRENCY_OPTIONS,
+            selected_currency,
+        )
+
+        liked_ids = frozenset()
+        if self.request.user.is_authenticated and properties:
+            liked_ids = frozenset(
+                self.request.user.favorites.filter(
+                    property_id__in=[prop.id for prop in properties]
+                ).values_list("property_id", flat=True)
+            )
+
+        return JsonResponse(
+            {
+                "results": [
+                    serialize_property_card(prop, liked_ids=liked_ids)
+                    for prop in properties
+                ],
+                "count": paginator.count,
+                "page": page.number,
+                "total_pages": paginator.num_pages,
+                "per_page": page_size,
+                "currency": {
+                    "code": selected_currency,
+                    **self.CURRENCY_OPTIONS[selected_currency],
+                },
+                "rates": {
+                    "USD": float(rates_meta["usd_rate"]),
+                    "EUR": float(rates_meta["eur_rate"]),
+                },
+                "url": self.request.get_full_path(),
+            },
+            json_dumps_params={"ensure_ascii": False},
+        )
+
     def render_to_response(self, context, **response_kwargs):
         is_async = self.request.headers.get("x-dominium-async") == "search" or (
             self.request.headers.get("x-requested-with") == "XMLHttpRequest"
@@ -8,7 +8,7 @@
     FEATURES_URL,
     HIGHLIGHT_SETTINGS_URL,
     IMPORT_HTML_URL,
-    IMPORT_LINK_URL,
+    IMPORT_LINKS_URL,
     PROPERTY_IMAGES_URL_TEMPLATE,
     PROPERTY_IMAGE_DETAIL_URL_TEMPLATE,
   } = cfg;
@@ -859,6 +859,21 @@ const tableBody = document.getElementById("properties-body");
       updateBulkToolbar();
     }
 
+    async function waitForJob(progressUrl, onProgress, intervalMs = 1500) {
+      for (;;) {
+        const payload = await fetchJSON(progressUrl);
+        const job = payload?.result || {};
+        onProgress?.(job);
+        if (job.status === "completed") {
+          return job;
+        }
+        if (job.status === "failed") {
+          throw new Error(job.error || "Фонова операція завершилась помилкою.");
+        }
+        await new Promise((resolve) => setTimeout(resolve, intervalMs));
+      }
+    }
+
     async function performBulkAction(action) {
       if (!selectionState.ids.size || bulkInProgress) {
         return;
@@ -872,10 +887,17 @@ const tableBody = document.getElementById("properties-body");
       const ids = Array.from(selectionState.ids);
 
       try {
-        await fetchJSON(BULK_ACTION_URL, {
+        const response = await fetchJSON(BULK_ACTION_URL, {
           method: "POST",
           body: JSON.stringify({ action, ids }),
         });
+        if (response?.progress_url) {
+          await waitForJob(response.progress_url, (job) => {
+            if (job.progress !== null) {
+              setTableStatus(`Обробка: ${job.progress}% (${job.processed}/${job.total})`, "info");
+            }
+          });
+        }
         clearSelection();
         await loadProperties();
         const messages = {
@@ -958,42 +980,52 @@ const tableBody = document.getElementById("properties-body");
 
       let completed = 0;
 
-      for (const url of urls) {
+      if (urls.length) {
+        // Усі посилання - одним запитом: сервер завантажує їх паралельно, а великий
+        // пакет обробляє у фоні й віддає progress_url зі статусом кожного посилання.
         try {
-          const response = await fetch(IMPORT_LINK_URL, {
+          const response = await fetch(IMPORT_LINKS_URL, {
             method: "POST",
             headers: { "Content-Type": "application/json" },
             credentials: "include",
-            body: JSON.stringify({ url, geocode: importGeocodeCheckbox?.checked || false }),
+            body: JSON.stringify({ urls }),
           });
           let data;
           try {
             data = await response.json();
           } catch (parseError) {
-            throw new Error(`Не вдалося прочитати відповідь для ${url}`);
+            throw new Error("Не вдалося прочитати відповідь сервера для посилань.");
           }
           if (!response.ok) {
-            throw new Error(data?.error || JSON.stringify(data?.errors || {}));
+            throw new Error(data?.error || `Не вдалося імпортувати посилання (статус ${response.status}).`);
           }
-          if (data.created) {
-            summary.created.push(data.created);
-          }
-          if (Array.isArray(data.errors)) {
-            data.errors.forEach((err) => {
-              const details = err.error || JSON.stringify(err.errors || {});
-              summary.errors.push({ item: url, error: details });
+          if (data?.progress_url) {
+            const job = await waitForJob(data.progress_url, (progress) => {
+              updateImportProgress(completed + progress.processed + progress.failed, totalTasks, "URL");
             });
+            data = job.result || {};
           }
+          (data.results || []).forEach((item) => {
+            if (item.status === "error") {
+              const details = item.error || JSON.stringify(item.errors || {});
+              summary.errors.push({ item: item.url, error: details });
+            } else {
+              // created | updated | unchanged: повторний імпорт оновлює наявний об’єкт.
+              summary.created.push(item);
+            }
+          });
         } catch (error) {
-          summary.errors.push({ item: url, error: error.message });
+          summary.errors.push({ item: "URL", error: error.message });
         }
-        completed += 1;
-        updateImportProgress(completed, totalTasks, `URL`);
+        completed += urls.length;
+        updateImportProgress(completed, totalTasks, "URL");
       }
 
-      for (const file of files) {
+      if (files.length) {
+        // Усі файли - одним запитом: сервер розбирає їх паралельно, а великий пакет
+        // обробляє у фоні й віддає progress_url.
         const formData = new FormData();
-        formData.append("files", file);
+        files.forEach((file) => formData.append("files", file));
         if (importGeocodeCheckbox?.checked) {
           formData.append("geocode", "1");
         }
@@ -1007,10 +1039,16 @@ const tableBody = document.getElementById("properties-body");
           try {
             data = await response.json();
           } catch (parseError) {
-            throw new Error(`Не вдалося прочитати відповідь для файлу ${file.name}`);
+            throw new Error("Не вдалося прочитати відповідь сервера для HTML-файлів.");
           }
           if (!response.ok) {
-            throw new Error(data?.error || `Не вдалося імпортувати ${file.name} (статус ${response.status}).`);
+            throw new Error(data?.error || `Не вдалося імпортувати файли (статус ${response.status}).`);
+          }
+          if (data?.progress_url) {
+            const job = await waitForJob(data.progress_url, (progress) => {
+              updateImportProgress(completed + progress.processed + progress.failed, totalTasks, "Файл");
+            });
+            data = job.result || {};
           }
           if (Array.isArray(data.created)) {
             summary.created.push(...data.created);
@@ -1019,16 +1057,15 @@ const tableBody = document.getElementById("properties-body");
           }
           if (Array.isArray(data.errors)) {
             data.errors.forEach((err) => {
-              const itemName = err.file || file.name;
               const details = err.error || JSON.stringify(err.errors || {});
-              summary.errors.push({ item: itemName, error: details });
+              summary.errors.push({ item: err.file || "HTML", error: details });
             });
           }
         } catch (error) {
-          summary.errors.push({ item: file.name, error: error.message });
+          summary.errors.push({ item: "HTML", error: error.message });
         }
-        completed += 1;
-        updateImportProgress(completed, totalTasks, `Файл`);
+        completed += files.length;
+        updateImportProgress(completed, totalTasks, "Файл");
       }
 
       const createdCount = summary.created.length;
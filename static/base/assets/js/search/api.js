@@ -25,9 +25,10 @@
     return query ? `${baseUrl}?${query}` : baseUrl;
   }
 
-  async function search(apiBaseUrl, params, signal) {
-    const url = buildSearchUrl(apiBaseUrl, params);
-    return fetchJson(url, { signal });
+  async function search(baseUrl, params, signal) {
+    const url = buildSearchUrl(baseUrl, params);
+    // Компактний режим: сервер віддає дані карток, розмітку будує card.js.
+    return fetchJson(url, { signal, headers: { "X-Dominium-Async": "search-json" } });
   }
 
   async function toggleLike(propertyId) {
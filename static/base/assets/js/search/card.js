@@ -0,0 +1,136 @@
+(() => {
+  const CURRENCY_SYMBOLS = { USD: "$", EUR: "€", UAH: "₴" };
+  const CARD_SIZES = "(min-width: 1024px) 33vw, (min-width: 640px) 50vw, 100vw";
+
+  const escapeHtml = (value) =>
+    String(value ?? "")
+      .replace(/&/g, "&amp;")
+      .replace(/</g, "&lt;")
+      .replace(/>/g, "&gt;")
+      .replace(/"/g, "&quot;")
+      .replace(/'/g, "&#39;");
+
+  const formatNumber = (value) =>
+    new Intl.NumberFormat("uk-UA", { maximumFractionDigits: 0 }).format(value);
+
+  const normalizeDeal = (name) => (name || "").toLowerCase().replace(/\s+/g, "");
+
+  const dealClass = (dealKey) =>
+    dealKey === "оренда" ? "bg-creamBeige" : dealKey === "продаж" ? "bg-coolSage" : "bg-red-200";
+
+  function priceLabel(card, currency) {
+    const value = card.prices ? card.prices[currency.code] : null;
+    if (value == null) return "Ціна за запитом";
+    return `${currency.symbol} ${formatNumber(value)}`;
+  }
+
+  function currencyTooltip(card, currency) {
+    const items = Object.entries(card.prices || {})
+      .filter(([code, value]) => code !== currency.code && value != null)
+      .map(
+        ([code, value]) =>
+          `<span class="whitespace-nowrap">${CURRENCY_SYMBOLS[code] || ""} ${formatNumber(value)} ${code}</span>`
+      );
+    if (!items.length) return "";
+    return `
+      <div class="currency-tooltip opacity-0 invisible group-hover:opacity-100 group-hover:visible absolute -top-11 left-7 bg-white shadow-xl rounded-[8px] px-4 py-2 transition-all duration-200 z-10 text-sm text-coolSage font-fixel">
+        <div class="flex flex-col text-left">${items.join("")}</div>
+        <div class="absolute -bottom-2 left-5 w-4 h-4 bg-white transform rotate-45 shadow-md"></div>
+      </div>`;
+  }
+
+  // Те саме, що фільтр placeholder_style: колір і розмита заглушка, поки вантажиться фото.
+  function placeholderStyle(card) {
+    const rules = [];
+    if (card.cover_color) rules.push(`background-color: ${card.cover_color}`);
+    if (card.cover_placeholder) {
+      rules.push(
+        `background-image: url('${card.cover_placeholder}'); background-size: cover; background-position: center`
+      );
+    }
+    return rules.join("; ");
+  }
+
+  // Клієнтська копія templates/partials/property_card.html для компактного JSON пошуку.
+  function renderCard(card, { currency, csrfToken, userIsStaff }) {
+    const absoluteUrl = `${window.location.origin}${card.url}`;
+    const dealKey = normalizeDeal(card.deal_type);
+    const likeIconClass = card.liked ? "ri-heart-fill text-red-500" : "ri-heart-line text-coolSage";
+    const coverStyle = card.cover ? placeholderStyle(card) : "";
+    const image = card.cover
+      ? `<img src="${escapeHtml(card.cover)}"${
+          card.cover_srcset
+            ? ` srcset="${escapeHtml(card.cover_srcset)}" sizes="${CARD_SIZES}"`
+            : ""
+        }${coverStyle ? ` style="${escapeHtml(coverStyle)}"` : ""} loading="lazy" decoding="async" class="w-full h-56 object-cover" alt="${escapeHtml(card.title)}" />`
+      : '<img src="https://via.placeholder.com/400x300" loading="lazy" decoding="async" class="w-full h-48 object-cover" alt="Зображення відсутнє" />';
+    const featuredButton = userIsStaff
+      ? `<button type="button" class="featured-toggle w-8 h-8 flex items-center justify-center bg-white bg-opacity-80 rounded-full hover:bg-opacity-100 transition" data-featured-toggle data-property-id="${card.id}" data-featured="${card.featured ? "true" : "false"}" title="Керування блоком Топ-3">
+          <i class="${card.featured ? "ri-star-fill text-yellow-500" : "ri-star-line text-coolSage"}"></i>
+        </button>`
+      : "";
+
+    return `
+      <div class="w-full max-w-[480px] mx-auto">
+        <div class="bg-white rounded-[8px] shadow-lg overflow-hidden flex flex-col h-full">
+          <div class="relative h-56">
+            <a href="${escapeHtml(card.url)}">${image}</a>
+            <div class="absolute top-3 right-3 flex gap-2 z-10">
+              <input type="hidden" id="csrf-token" value="${escapeHtml(csrfToken)}" />
+              <button class="like-button w-8 h-8 flex items-center justify-center bg-white bg-opacity-80 rounded-full transition" data-property-id="${card.id}">
+                <i class="${likeIconClass}"></i>
+              </button>
+              ${featuredButton}
+              <div class="relative" data-share-container>
+                <button type="button" class="w-8 h-8 flex items-center justify-center bg-white bg-opacity-80 rounded-full hover:bg-opacity-100 transition" data-share-toggle data-share-url="${escapeHtml(absoluteUrl)}" data-share-title="${escapeHtml(card.title)}">
+                  <i class="ri-share-forward-line text-coolSage"></i>
+                </button>
+                <div class="share-menu absolute right-0 mt-2 w-40 rounded-lg bg-white shadow-lg py-2 hidden z-20" data-share-menu>
+                  <button type="button" class="w-full text-left px-4 py-2 text-sm text-gray-700 hover:bg-gray-100 flex items-center gap-2" data-share-action="copy">
+                    <i class="ri-file-copy-line text-base"></i> Скопіювати
+                  </button>
+                  <button type="button" class="w-full text-left px-4 py-2 text-sm text-gray-700 hover:bg-gray-100 flex items-center gap-2" data-share-action="telegram">
+                    <i class="ri-send-plane-line text-base"></i> Telegram
+                  </button>
+                  <button type="button" class="w-full text-left px-4 py-2 text-sm text-gray-700 hover:bg-gray-100 flex items-center gap-2" data-share-action="viber">
+                    <i class="ri-message-2-line text-base"></i> Viber
+                  </button>
+                </div>
+              </div>
+            </div>
+          </div>
+          <div class="p-6 flex flex-col flex-grow group relative">
+            <h3 class="text-xl font-ermilov text-primary transition duration-200">
+              ${escapeHtml(priceLabel(card, currency))}${dealKey === "оренда" ? " /міс" : ""}
+            </h3>
+            ${dealKey !== "оренда" ? currencyTooltip(card, currency) : ""}
+            <p class="text-coolSage font-fixel">${escapeHtml(card.address)}</p>
+            <div class="flex items-center space-x-4 mt-3 text-gray-600">
+              <span class="flex text-coolSage font-fixel items-center">
+                <i class="ri-ruler-line mr-1"></i> ${escapeHtml(card.property_type)}
+              </span>
+              <span class="flex text-coolSage font-fixel items-center">
+                <i class="ri-ruler-line mr-1"></i> ${escapeHtml(card.area)} м²
+              </span>
+              ${
+                card.rooms
+                  ? `<span class="flex text-coolSage font-fixel items-center"><i class="ri-home-line mr-1"></i> ${escapeHtml(card.rooms)} кімнати</span>`
+                  : ""
+              }
+            </div>
+            <div class="mt-auto pt-4 flex items-center gap-x-3">
+              <a href="${escapeHtml(card.url)}" class="bg-white text-deepOcean font-fixel text-sm px-4 py-2 rounded-full h-10 shadow-[inset_0_0_0_1px] shadow-deepOcean flex items-center justify-center">
+                Докладніше
+              </a>
+              <span class="text-white px-8 py-2 rounded-full text-sm h-10 font-fixel ${dealClass(dealKey)}">
+                ${escapeHtml(card.deal_type || "Угода")}
+              </span>
+            </div>
+          </div>
+        </div>
+      </div>
+    `;
+  }
+
+  window.DominiumSearchCard = { renderCard };
+})();
@@ -1,5 +1,4 @@
 (() => {
-  const API_SEARCH_URL = window.SEARCH_API_URL || "/api/properties/";
   const AUTO_DELAY = 600;
 
   const { search } = window.DominiumSearchAPI;
@@ -31,17 +30,6 @@
     currentParams.set("sort", "date");
   }
 
-  const likedIds = (() => {
-    const node = document.getElementById("liked-ids-data");
-    if (!node) return [];
-    try {
-      return JSON.parse(node.textContent || "[]");
-    } catch (error) {
-      console.error("Не вдалося розпарсити лайки", error);
-      return [];
-    }
-  })();
-
   function collectFormParams() {
     const params = new URLSearchParams();
     const targetForm = mainForm || document.querySelector("form[data-search-form]");
@@ -72,8 +60,7 @@
   function buildSearchMeta(params, path = window.location.pathname) {
     const query = params.toString();
     const searchUrl = `${path}${query ? `?${query}` : ""}`;
-    const apiUrl = `${API_SEARCH_URL}${query ? `?${query}` : ""}`;
-    return { apiUrl, searchUrl, params };
+    return { path, searchUrl, params };
   }
 
   async function executeSearch(meta, { replaceHistory = true } = {}) {
@@ -87,12 +74,11 @@
       resultsSection.classList.add("opacity-50", "pointer-events-none");
       if (loader) loader.classList.remove("hidden");
 
-      const payload = await search(meta.apiUrl, meta.params, controller.signal);
+      const payload = await search(meta.path, meta.params, controller.signal);
 
       renderSummary(payload);
       renderResults(payload, meta.params, {
         resultsSection,
-        likedIds,
         csrfToken,
         userIsStaff,
       });
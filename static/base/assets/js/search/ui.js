@@ -21,11 +21,6 @@
       .replace(/"/g, "&quot;")
       .replace(/'/g, "&#39;");
 
-  const formatPrice = (value) =>
-    value == null
-      ? "Ціна за запитом"
-      : new Intl.NumberFormat("uk-UA", { maximumFractionDigits: 0 }).format(value);
-
   function closeAllDropdowns() {
     document
       .querySelectorAll("[data-dropdown] [data-dropdown-menu]")
@@ -127,97 +122,6 @@
     listButton.addEventListener("click", activateList);
   }
 
-  function buildPropertyCard(property, { likedIds, csrfToken, userIsStaff }) {
-    const absoluteUrl =
-      property.absolute_url || `${window.location.origin}/property/${property.slug}/`;
-    const imageUrl =
-      (property.main_image && property.main_image.url) ||
-      (property.images && property.images[0] && property.images[0].url) ||
-      "https://via.placeholder.com/400x300";
-    const priceText = formatPrice(property.price);
-    const dealName = (property.deal_type && property.deal_type.name) || "Угода";
-    const dealKey = (dealName || "").toLowerCase().replace(/\s+/g, "");
-    const dealClass =
-      dealKey === "оренда"
-        ? "bg-creamBeige"
-        : dealKey === "продаж"
-        ? "bg-coolSage"
-        : "bg-red-200";
-    const propertyTypeName =
-      (property.property_type && property.property_type.name) || "Тип не вказано";
-    const areaLabel = property.area ? `${property.area} м²` : "";
-    const roomsLabel = property.rooms ? `${property.rooms} кімнати` : "";
-    const liked = likedIds.includes(property.id);
-    const likeIconClass = liked ? "ri-heart-fill text-red-500" : "ri-heart-line text-coolSage";
-    const featuredButton = userIsStaff
-      ? `<button type="button" class="featured-toggle w-8 h-8 flex items-center justify-center bg-white bg-opacity-80 rounded-full hover:bg-opacity-100 transition" data-featured-toggle data-property-id="${property.id}" data-featured="${property.featured_homepage ? "true" : "false"}" title="Керування блоком Топ-3">
-          <i class="${property.featured_homepage ? "ri-star-fill text-yellow-500" : "ri-star-line text-coolSage"}"></i>
-        </button>`
-      : "";
-
-    return `
-      <div class="w-full max-w-[480px] mx-auto">
-        <div class="bg-white rounded-[8px] shadow-lg overflow-hidden flex flex-col h-full">
-          <div class="relative h-56">
-            <a href="${escapeHtml(absoluteUrl)}">
-              <img src="${escapeHtml(imageUrl)}" loading="lazy" decoding="async" class="w-full h-56 object-cover" alt="${escapeHtml(property.title)}" />
-            </a>
-            <div class="absolute top-3 right-3 flex gap-2 z-10">
-              <input type="hidden" id="csrf-token" value="${escapeHtml(csrfToken)}" />
-              <button class="like-button w-8 h-8 flex items-center justify-center bg-white bg-opacity-80 rounded-full transition" data-property-id="${property.id}">
-                <i class="${likeIconClass}"></i>
-              </button>
-              ${featuredButton}
-              <div class="relative" data-share-container>
-                <button type="button" class="w-8 h-8 flex items-center justify-center bg-white bg-opacity-80 rounded-full hover:bg-opacity-100 transition" data-share-toggle data-share-url="${escapeHtml(absoluteUrl)}" data-share-title="${escapeHtml(property.title)}">
-                  <i class="ri-share-forward-line text-coolSage"></i>
-                </button>
-                <div class="share-menu absolute right-0 mt-2 w-40 rounded-lg bg-white shadow-lg py-2 hidden z-20" data-share-menu>
-                  <button type="button" class="w-full text-left px-4 py-2 text-sm text-gray-700 hover:bg-gray-100 flex items-center gap-2" data-share-action="copy">
-                    <i class="ri-file-copy-line text-base"></i> Скопіювати
-                  </button>
-                  <button type="button" class="w-full text-left px-4 py-2 text-sm text-gray-700 hover:bg-gray-100 flex items-center gap-2" data-share-action="telegram">
-                    <i class="ri-send-plane-line text-base"></i> Telegram
-                  </button>
-                  <button type="button" class="w-full text-left px-4 py-2 text-sm text-gray-700 hover:bg-gray-100 flex items-center gap-2" data-share-action="viber">
-                    <i class="ri-message-2-line text-base"></i> Viber
-                  </button>
-                </div>
-              </div>
-            </div>
-          </div>
-          <div class="p-6 flex flex-col flex-grow group relative">
-            <h3 class="text-xl font-ermilov text-primary transition duration-200">
-              ${escapeHtml(priceText)}${dealKey === "оренда" ? " /міс" : ""}
-            </h3>
-            <p class="text-coolSage font-fixel">${escapeHtml(property.address)}</p>
-            <div class="flex items-center space-x-4 mt-3 text-gray-600">
-              <span class="flex text-coolSage font-fixel items-center">
-                <i class="ri-ruler-line mr-1"></i> ${escapeHtml(propertyTypeName)}
-              </span>
-              <span class="flex text-coolSage font-fixel items-center">
-                <i class="ri-ruler-line mr-1"></i> ${escapeHtml(areaLabel)}
-              </span>
-              ${
-                roomsLabel
-                  ? `<span class="flex text-coolSage font-fixel items-center"><i class="ri-home-line mr-1"></i> ${escapeHtml(roomsLabel)}</span>`
-                  : ""
-              }
-            </div>
-            <div class="mt-auto pt-4 flex items-center gap-x-3">
-              <a href="${escapeHtml(absoluteUrl)}" class="bg-white text-deepOcean font-fixel text-sm px-4 py-2 rounded-full h-10 shadow-[inset_0_0_0_1px] shadow-deepOcean/20 flex items-center justify-center">
-                Докладніше
-              </a>
-              <span class="text-white px-8 py-2 rounded-full text-sm h-10 font-fixel ${dealClass}">
-                ${escapeHtml(dealName)}
-              </span>
-            </div>
-          </div>
-        </div>
-      </div>
-    `;
-  }
-
   function renderPagination(payload, params) {
     if (!payload.total_pages || payload.total_pages <= 1) return "";
     const baseParams = new URLSearchParams(params.toString());
@@ -311,7 +215,9 @@
   }
 
   function renderResults(payload, params, opts) {
-    const { resultsSection, likedIds, csrfToken, userIsStaff } = opts;
+    const { resultsSection, csrfToken, userIsStaff } = opts;
+    const { renderCard } = window.DominiumSearchCard;
+    const currency = payload.currency || { code: "USD", symbol: "$" };
     if (!resultsSection) return;
 
     if (!payload.results || !payload.results.length) {
@@ -324,7 +230,7 @@
     }
 
     const cardsHtml = payload.results
-      .map((property) => buildPropertyCard(property, { likedIds, csrfToken, userIsStaff }))
+      .map((card) => renderCard(card, { currency, csrfToken, userIsStaff }))
       .join("");
     const gridHtml = `
       <div class="container mx-auto px-4 py-6">